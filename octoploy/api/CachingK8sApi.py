@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Iterator, Set, Tuple
+
+from octoploy.api.Kubectl import K8sApi
+from octoploy.api.Model import PodData
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.utils.DictUtils import DictUtils
+
+
+class CachingK8sApi(K8sApi):
+    """
+    Keeps the live objects returned by another api in memory.
+    Objects are cached (including "not found" results) until they get modified via this api
+    or the cache gets invalidated explicitly.
+    """
+
+    def __init__(self, api: K8sApi):
+        super().__init__()
+        self._api = api
+        self._objects: Dict[Tuple[str, Optional[str]], Optional[BaseObj]] = {}
+        self._recorded: Optional[Set[Tuple[str, Optional[str]]]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, name: Optional[str] = None, namespace: Optional[str] = None):
+        """
+        Drops cached objects
+        :param name: Name of the object, None if all objects should be dropped
+        :param namespace: Namespace of the object
+        """
+        if name is None:
+            self._objects.clear()
+            return
+        self._objects.pop((name, namespace), None)
+
+    @contextmanager
+    def record(self) -> Iterator[Set[Tuple[str, Optional[str]]]]:
+        """
+        Records the objects requested inside the block
+        :return: Keys (name, namespace) of the requested objects, filled while the block runs
+        """
+        keys: Set[Tuple[str, Optional[str]]] = set()
+        previous = self._recorded
+        self._recorded = keys
+        try:
+            yield keys
+        finally:
+            self._recorded = previous
+
+    def get_size(self) -> int:
+        """
+        Returns the number of cached objects
+        """
+        return len(self._objects)
+
+    def get(self, name: str, namespace: Optional[str] = None) -> Optional[BaseObj]:
+        key = (name, namespace)
+        if self._recorded is not None:
+            self._recorded.add(key)
+        if key in self._objects:
+            self.hits += 1
+            k8s_object = self._objects[key]
+        else:
+            self.misses += 1
+            k8s_object = self._api.get(name, namespace=namespace)
+            self._objects[key] = k8s_object
+        if k8s_object is None:
+            return None
+        # The callers might modify the object
+        return BaseObj(DictUtils.copy_tree(k8s_object.data))
+
+    def tag(self, source: str, dest: str, namespace: Optional[str] = None):
+        self._api.tag(source, dest, namespace=namespace)
+
+    def get_namespaces(self) -> List[str]:
+        return self._api.get_namespaces()
+
+    def dry_run(self, yml: str, namespace: Optional[str] = None) -> BaseObj:
+        return self._api.dry_run(yml, namespace=namespace)
+
+    def apply(self, yml: str, namespace: Optional[str] = None, extra_flags: Optional[List[str]] = None) -> str:
+        self.invalidate()
+        return self._api.apply(yml, namespace=namespace, extra_flags=extra_flags)
+
+    def replace(self, yml: str, namespace: Optional[str] = None, extra_flags: Optional[List[str]] = None) -> str:
+        self.invalidate()
+        return self._api.replace(yml, namespace=namespace, extra_flags=extra_flags)
+
+    def create(self, yml: str, namespace: Optional[str] = None) -> str:
+        self.invalidate()
+        return self._api.create(yml, namespace=namespace)
+
+    def get_pod(self, dc_name: str = None, pod_name: str = None,
+                namespace: Optional[str] = None) -> Optional[PodData]:
+        return self._api.get_pod(dc_name=dc_name, pod_name=pod_name, namespace=namespace)
+
+    def get_pods(self, dc_name: str = None, pod_name: str = None,
+                 namespace: Optional[str] = None) -> List[PodData]:
+        return self._api.get_pods(dc_name=dc_name, pod_name=pod_name, namespace=namespace)
+
+    def rollout(self, kind: str, name: str, namespace: Optional[str] = None):
+        self.invalidate(f'{kind}/{name}', namespace)
+        self._api.rollout(kind, name, namespace=namespace)
+
+    def exec(self, pod_name: str, cmd: str, args: List[str], namespace: Optional[str] = None):
+        self._api.exec(pod_name, cmd, args, namespace=namespace)
+
+    def switch_context(self, context: str):
+        self.invalidate()
+        self._api.switch_context(context)
+
+    def annotate(self, name: str, key: str, value: Optional[str], namespace: Optional[str] = None):
+        self.invalidate(name, namespace)
+        self._api.annotate(name, key, value, namespace=namespace)
+
+    def delete(self, name: str, namespace: str):
+        self.invalidate(name, namespace)
+        self._api.delete(name, namespace=namespace)
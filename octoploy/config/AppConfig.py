@@ -117,6 +117,14 @@ class AppConfig(BaseConfig):
         """
         return self.data.get('postApplyTemplates', [])
 
+    def get_dependencies(self) -> List[str]:
+        """
+        Returns the apps (folder names) which have to be deployed before this app
+
+        :return: App names
+        """
+        return self.data.get('dependsOn', [])
+
     def get_reload_actions(self) -> List[DeploymentActionConfig]:
         """
         Returns all actions that should be executed after a configuration change of the app
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+from typing import List, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from octoploy.config.Config import RootConfig
+
+from octoploy.config.AppConfig import AppConfig
+
+
+class AppDependencies:
+    """
+    Maps files to the apps which depend on them.
+    An app depends on its folder, included k8s files, configmap sources, loader files and
+    the same files of all templates it references. Every app depends on the root files of
+    the project and its libraries.
+    """
+
+    def __init__(self, root: RootConfig):
+        self._root = root
+
+    def get_global_files(self) -> List[str]:
+        """
+        Returns all files every app depends on
+        :return: Absolute paths
+        """
+        files = []
+        self._add_root_files(self._root, files)
+        return files
+
+    def get_files(self, app_config: AppConfig) -> List[str]:
+        """
+        Returns all files and folders the given app depends on (not including the global files)
+        :param app_config: App
+        :return: Absolute paths
+        """
+        files = []
+        self._add_app_files(app_config, files)
+        graph = self._root.get_template_graph()
+        refs = app_config.get_pre_template_refs() + app_config.get_post_template_refs()
+        for template in graph.get_order(refs):
+            if template.enabled:
+                self._add_app_files(template.config, files)
+        return files
+
+    def get_affected(self, app_configs: List[AppConfig], changed_files: Set[str]) -> List[AppConfig]:
+        """
+        Returns all apps which are affected by the given changes
+        :param app_configs: Apps
+        :param changed_files: Real paths of all changed files
+        :return: Affected apps, in the order of app_configs
+        """
+        if self._matches(self.get_global_files(), changed_files):
+            return app_configs
+        return [x for x in app_configs if self._matches(self.get_files(x), changed_files)]
+
+    def _add_root_files(self, root: RootConfig, files: List[str]):
+        files.append(os.path.realpath(root.get_path()))
+        files.extend(os.path.realpath(x) for x in root.get_loader_files())
+        for library in root.get_libraries():
+            self._add_root_files(library, files)
+
+    @staticmethod
+    def _add_app_files(app_config: AppConfig, files: List[str]):
+        config_root = app_config.get_config_root()
+        files.append(os.path.realpath(config_root))
+        files.extend(os.path.realpath(x) for x in app_config.get_includes())
+        for config_map in app_config.get_config_maps():
+            files.extend(os.path.realpath(x) for x in config_map.get_files(config_root))
+        files.extend(os.path.realpath(x) for x in app_config.get_loader_files())
+
+    @staticmethod
+    def _matches(files: List[str], changed_files: Set[str]) -> bool:
+        for file in files:
+            if file in changed_files:
+                return True
+            prefix = file + os.sep
+            for changed in changed_files:
+                if changed.startswith(prefix):
+                    return True
+        return False
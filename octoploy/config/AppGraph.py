@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from octoploy.config.Config import RootConfig
+
+from octoploy.config.AppConfig import AppConfig
+from octoploy.utils.Errors import ConfigError
+
+
+class AppGraph:
+    """
+    Dependency graph of apps, declared via the dependsOn field of the apps.
+    """
+
+    def __init__(self, root: RootConfig, app_configs: List[AppConfig]):
+        """
+        :param root: Project
+        :param app_configs: Apps of the project, dependencies to other apps are treated as satisfied
+        """
+        self._root = root
+        self._app_configs = app_configs
+        self._dirs = [self.get_dir_name(x) for x in app_configs]
+
+    @staticmethod
+    def get_dir_name(app_config: AppConfig) -> str:
+        """
+        Returns the name of the folder of the given app, which is used to reference the app
+        """
+        return os.path.basename(os.path.normpath(app_config.get_config_root()))
+
+    def get_dependencies(self) -> Dict[str, List[str]]:
+        """
+        Returns the dependencies of every app (folder names), limited to the apps of this graph
+        :raise ConfigError: Gets raised if an app depends on an app which doesn't exist
+        """
+        known = set(self._dirs)
+        dependencies = {}
+        for name, app_config in zip(self._dirs, self._app_configs):
+            deps = []
+            for dep in app_config.get_dependencies():
+                if dep not in known:
+                    try:
+                        self._root.load_app_config(dep)
+                    except FileNotFoundError:
+                        raise ConfigError(f'App {name} depends on unknown app {dep}')
+                    continue
+                if dep not in deps:
+                    deps.append(dep)
+            dependencies[name] = deps
+        return dependencies
+
+    def get_waves(self) -> List[List[AppConfig]]:
+        """
+        Returns the apps grouped into waves, every app comes after the apps it depends on.
+        The apps of a wave don't depend on each other, the order of the apps is kept within a wave.
+        :raise ConfigError: Gets raised if the apps depend on each other
+        """
+        dependencies = self.get_dependencies()
+        by_name = dict(zip(self._dirs, self._app_configs))
+        done = set()
+        remaining = list(self._dirs)
+        waves = []
+        while len(remaining) > 0:
+            wave = [x for x in remaining if all(dep in done for dep in dependencies[x])]
+            if len(wave) == 0:
+                raise ConfigError('Cyclic app dependency between: ' + ', '.join(remaining))
+            waves.append([by_name[x] for x in wave])
+            done.update(wave)
+            remaining = [x for x in remaining if x not in done]
+        return waves
@@ -2,7 +2,7 @@ import os
 from typing import Dict, List, Optional
 
 from octoploy.config.YmlConfig import YmlConfig
-from octoploy.processing.ValueLoader import ValueLoaderFactory
+from octoploy.processing.ValueLoader import ValueLoaderFactory, LazyLoad, LazyValue, LoaderScope
 from octoploy.processing.YmlTemplateProcessor import YmlTemplateProcessor
 
 
@@ -16,11 +16,6 @@ class BaseConfig(YmlConfig):
         if external_vars is not None:
             self._external_vars = external_vars
 
-        self._replacements = {}  # type: Dict[str, str]
-        """
-        Caching field
-        """
-
     def get_file(self, path: str) -> str:
         """
         Returns the path to a file inside the dir of the app/project
@@ -39,10 +34,7 @@ class BaseConfig(YmlConfig):
 
         :return: Key, value map
         """
-        if len(self._replacements) > 0:
-            return self._replacements
-
-        items = self.data.get('vars', {})
+        items = LoaderScope(self.data.get('vars', {}))
         new_items = {}
         for key, value in items.items():
             # Value can be a primitive or object
@@ -50,17 +42,35 @@ class BaseConfig(YmlConfig):
                 # Is an object, use a loader to load the value
                 loader_name = value.get('loader')
                 if loader_name is not None:
+                    # The values are only loaded once they are referenced
                     loader = ValueLoaderFactory.create(self, value['loader'])
-                    new_values = loader.load(value)
+                    load = LazyLoad(loader, value)
                     new_items[key] = 'viaLoader'
-                    for new_key, new_val in new_values.items():
-                        new_items[key + new_key] = new_val
+                    keys = loader.get_keys(value)
+                    if keys is None:
+                        items.add_prefix(key, load)
+                        continue
+                    for new_key in keys:
+                        new_items[key + new_key] = LazyValue(load, new_key)
                     continue
 
         items.update(new_items)
         items.update(self._external_vars)
         return items
 
+    def get_loader_files(self) -> List[str]:
+        """
+        Returns all files referenced by value loaders
+        :return: Absolute paths
+        """
+        if self._path is None:
+            return []
+        files = []
+        for value in self.data.get('vars', {}).values():
+            if isinstance(value, dict) and value.get('loader') is not None and 'file' in value:
+                files.append(self.get_file(value['file']))
+        return files
+
     def get_params(self) -> List[str]:
         """
         Returns all required parameters
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple, TYPE_CHECKING
 
 from octoploy.api.Kubectl import Oc, K8s, K8sApi
 from octoploy.config.AppConfig import AppConfig
 from octoploy.config.BaseConfig import BaseConfig
+from octoploy.config.LibraryRegistry import LibraryRegistry
+from octoploy.config.TemplateGraph import TemplateGraph
+from octoploy.deploy.ObjectWriter import ObjectWriter
 from octoploy.processing import Constants
 from octoploy.processing.DataPreProcessor import DataPreProcessor, OcToK8PreProcessor
 from octoploy.processing.DecryptionProcessor import DecryptionProcessor
@@ -13,9 +16,11 @@ from octoploy.processing.NamespaceProcessor import NamespaceProcessor
 from octoploy.processing.TreeWalker import TreeProcessor
 from octoploy.processing.YmlTemplateProcessor import YmlTemplateProcessor
 from octoploy.state.StateTracking import StateTracking
-from octoploy.utils.Errors import ConfigError
 from octoploy.utils.Log import Log
 
+if TYPE_CHECKING:
+    from octoploy.k8s.ChangeSet import ChangeSet
+
 
 class RunMode:
     def __init__(self):
@@ -24,6 +29,13 @@ class RunMode:
         Yml output file
         """
 
+        self.out_layout = 'file'
+        """
+        Layout of the output, see ObjectWriter
+        """
+
+        self._out_writer: Optional[ObjectWriter] = None
+
         self.dry_run = False
         """
         True if no OC should be called
@@ -45,6 +57,21 @@ class RunMode:
         Delete mode
         """
 
+        self.diff_format = 'text'
+        """
+        Output format of the plan diffs: text or json
+        """
+
+        self.object_jobs = 1
+        """
+        Number of objects of an app which may be deployed concurrently, 0 for no limit
+        """
+
+        self.change_sets: Optional[List[ChangeSet]] = None
+        """
+        Receives the changes of all updated objects in plan mode, None if they should only be printed
+        """
+
     def set_override_env(self, env: List[str]):
         """
         Parses a key=value list
@@ -58,6 +85,35 @@ class RunMode:
             value = parts[1]
             self.var_override[key] = value
 
+    def get_out_writer(self) -> ObjectWriter:
+        """
+        Returns the writer for the out file, the writer is created on first use
+        """
+        if self._out_writer is None:
+            self._out_writer = ObjectWriter.create(self.out_file, self.out_layout)
+        return self._out_writer
+
+    def set_out_writer(self, writer: ObjectWriter):
+        """
+        Writes the output with the given writer instead of the out file
+        :param writer: Writer
+        """
+        self._out_writer = writer
+
+    def has_output(self) -> bool:
+        """
+        Indicates if the objects should be written to an output
+        """
+        return self.out_file is not None or self._out_writer is not None
+
+    def close_out_writer(self):
+        """
+        Closes the writer of the out file (if any)
+        """
+        if self._out_writer is not None:
+            self._out_writer.close()
+            self._out_writer = None
+
 
 class RootConfig(BaseConfig):
     """
@@ -72,7 +128,7 @@ class RootConfig(BaseConfig):
     _parent: Optional[RootConfig] = None
     """
     The parent that uses this config.
-    This may only be set if this config is a library.
+    Only set for the views of a library, see LibraryView.
     """
 
     _libraries: List[RootConfig]
@@ -87,6 +143,9 @@ class RootConfig(BaseConfig):
         self._k8s_api = None
         self._libraries = []
         self._global_var_overrides: Dict[str, str] = {}
+        self._app_dirs: Optional[Tuple[int, Set[str]]] = None
+        self._app_configs: Dict[str, Tuple[int, AppConfig]] = {}
+        self._template_graph: Optional[TemplateGraph] = None
 
         parent_dir = os.path.abspath(os.path.join(path, os.pardir, os.pardir))
         inherit = self.data.get('inherit')
@@ -99,11 +158,15 @@ class RootConfig(BaseConfig):
             lib_dir = os.path.join(parent_dir, lib)
             self._load_library(lib_dir)
 
-        state_name = self.data.get('stateName', '')
-        self._state = StateTracking(self.create_api(), state_name)
-
+        self._state: Optional[StateTracking] = None
         self._app_flags = self.data.get('apps', {})
 
+    def get_library(self) -> RootConfig:
+        """
+        Returns the library itself, the libraries of a project are views of the shared libraries
+        """
+        return self
+
     def get_var_overrides(self) -> Dict[str, str]:
         return self._global_var_overrides
 
@@ -124,25 +187,43 @@ class RootConfig(BaseConfig):
         return flags.get('enabled', True)
 
     def get_state(self) -> StateTracking:
+        """
+        Returns the state of this project, the state (and api) is created on first use
+        """
+        if self._state is None:
+            self._state = StateTracking(self.create_api(), self.data.get('stateName', ''))
         return self._state
 
     def initialize_state(self, run_mode: RunMode):
-        self._global_var_overrides = run_mode.var_override
+        if run_mode.var_override != self._global_var_overrides:
+            self._global_var_overrides = run_mode.var_override
+            # The app configs inherit the overrides
+            self._app_configs = {}
+            self._template_graph = None
         if run_mode.out_file is not None:
+            # Starts a new output
+            run_mode.close_out_writer()
             if os.path.isfile(run_mode.out_file):
                 os.remove(run_mode.out_file)
         if run_mode.dry_run:
             return
-        self._state.restore(self.get_namespace_name())
+        self.get_state().restore(self.get_namespace_name())
 
     def persist_state(self, run_mode: RunMode):
+        run_mode.close_out_writer()
         if run_mode.dry_run or run_mode.plan:
             return
-        self._state.store(self.get_namespace_name())
+        self.get_state().store(self.get_namespace_name())
 
     def get_config_root(self) -> str:
         return self._config_root
 
+    def get_libraries(self) -> List[RootConfig]:
+        """
+        Returns all libraries used by this project
+        """
+        return self._libraries
+
     def is_library(self) -> bool:
         """
         Indicates if this collection is a library
@@ -152,6 +233,13 @@ class RootConfig(BaseConfig):
     def _get_mode(self) -> str:
         return self.data.get('mode', 'k8s')
 
+    def use_api(self, api: K8sApi):
+        """
+        Uses the given client instead of creating a new one
+        :param api: Client
+        """
+        self._k8s_api = api
+
     def create_api(self) -> K8sApi:
         """
         Creates a new openshift / k8s client.
@@ -233,6 +321,20 @@ class RootConfig(BaseConfig):
         """
         return [DecryptionProcessor(), NamespaceProcessor(self)]
 
+    def get_template_graph(self) -> TemplateGraph:
+        """
+        Returns the reference graph of all templates, the graph is shared by all apps of this run
+        """
+        if self._template_graph is None:
+            self._template_graph = TemplateGraph(self)
+        return self._template_graph
+
+    def reset_template_graph(self):
+        """
+        Drops the template graph, it gets built again on next use
+        """
+        self._template_graph = None
+
     def load_app_configs(self) -> List[AppConfig]:
         """
         Loads all app configurations available in this project
@@ -240,9 +342,9 @@ class RootConfig(BaseConfig):
         """
         items = []
         for dir_item in os.listdir(self._config_root):
-            path = os.path.join(self._config_root, dir_item)
-            if not os.path.isdir(path):
+            if dir_item not in self._get_app_dirs():
                 continue
+            path = os.path.join(self._config_root, dir_item)
             try:
                 app_config = self.load_app_config(dir_item)
             except FileNotFoundError:
@@ -262,8 +364,38 @@ class RootConfig(BaseConfig):
         return items
 
     def load_app_config(self, name: str) -> AppConfig:
+        """
+        Loads the configuration of the given app or template.
+        The configs are cached until their _index.yml changes
+        :param name: Name of the app folder
+        :return: Config
+        :raise FileNotFoundError: Gets raised if the app is neither defined in this project nor in a library
+        """
+        cached = self._app_configs.get(name)
+        if cached is not None:
+            try:
+                if os.stat(cached[1].get_path()).st_mtime_ns == cached[0]:
+                    return cached[1]
+            except FileNotFoundError:
+                pass
+
+        config = self._load_app_config(name)
+        self._app_configs[name] = (os.stat(config.get_path()).st_mtime_ns, config)
+        return config
+
+    def _get_app_dirs(self) -> Set[str]:
+        """
+        Returns the names of all folders inside the config root
+        """
+        version = os.stat(self._config_root).st_mtime_ns
+        if self._app_dirs is None or self._app_dirs[0] != version:
+            self._app_dirs = (version, set(item for item in os.listdir(self._config_root)
+                                           if os.path.isdir(os.path.join(self._config_root, item))))
+        return self._app_dirs[1]
+
+    def _load_app_config(self, name: str) -> AppConfig:
         folder_path = os.path.join(self._config_root, name)
-        if not os.path.isdir(folder_path):
+        if name not in self._get_app_dirs():
             # Search in library
             for library in self._libraries:
                 try:
@@ -285,10 +417,36 @@ class RootConfig(BaseConfig):
         Loads the library project at the given directory
         :param lib_dir: Path to the root of the library directory
         """
-        if not os.path.isdir(lib_dir):
-            raise FileNotFoundError('Library not found: ' + lib_dir)
-        library = RootConfig.load(lib_dir)
-        library._parent = self
-        if not library.is_library():
-            raise ConfigError(f'{lib_dir} referenced but is not marked as library')
-        self._libraries.append(library)
+        library = LibraryRegistry.shared().get(lib_dir, RootConfig.load)
+        # Libraries are shared between projects, every project gets its own view with its app flags
+        self._libraries.append(LibraryView(library, self))
+
+
+class LibraryView(RootConfig):
+    """
+    A shared library as seen by a single parent.
+    The parsed library is shared, the parent (and with it the app flags) and the loaded apps belong to the view.
+    """
+
+    def __init__(self, library: RootConfig, parent: RootConfig):
+        """
+        :param library: Shared library
+        :param parent: Project (or library) using the library
+        """
+        # The state of the library is shared, see __getattr__
+        self._library = library
+        self._parent = parent
+        self._app_dirs = None
+        self._app_configs = {}
+        self._template_graph = None
+        # Nested libraries have to see the flags of this parent as well
+        self._libraries = [LibraryView(x.get_library(), self) for x in library.get_libraries()]
+
+    def get_library(self) -> RootConfig:
+        """
+        Returns the shared library
+        """
+        return self._library
+
+    def __getattr__(self, name: str):
+        return getattr(self._library, name)
@@ -1,5 +1,5 @@
 import os
-from typing import Dict
+from typing import Dict, List
 
 
 class ConfigMapObject:
@@ -19,6 +19,12 @@ class DynamicConfigMap:
         self.files = data['files']
         self.disable_templating = data.get('disableTemplating', False)
 
+    def get_files(self, config_root: str) -> List[str]:
+        """
+        Returns the paths of all files which are included in the configmap
+        """
+        return [os.path.join(config_root, file_obj['file']) for file_obj in self.files]
+
     def build_object(self, config_root: str) -> ConfigMapObject:
         """
         Creates a configmap object out of this definition
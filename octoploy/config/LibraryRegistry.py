@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from octoploy.config.Config import RootConfig
+
+from octoploy.utils.Errors import ConfigError
+
+
+class LibraryRegistry:
+    """
+    Process wide registry of all loaded libraries, keyed by the absolute path of the library.
+    Every library is only loaded and validated once, no matter how many projects use it.
+    Entries are reloaded once the root file of the library changes.
+    """
+
+    _instance: Optional[LibraryRegistry] = None
+
+    def __init__(self):
+        self._libraries: Dict[str, Tuple[int, RootConfig]] = {}
+        self._loading: List[str] = []
+
+    @classmethod
+    def shared(cls) -> LibraryRegistry:
+        """
+        Returns the registry shared by all projects of this process
+        """
+        if cls._instance is None:
+            cls._instance = LibraryRegistry()
+        return cls._instance
+
+    def get(self, lib_dir: str, load: Callable[[str], RootConfig]) -> RootConfig:
+        """
+        Returns the library at the given directory
+        :param lib_dir: Path to the root of the library directory
+        :param load: Loads the library project at the given directory
+        :return: Library
+        :raise FileNotFoundError: Gets raised if the library doesn't exist
+        :raise ConfigError: Gets raised if the project is not a library or the libraries reference each other
+        """
+        lib_dir = os.path.abspath(lib_dir)
+        if not os.path.isdir(lib_dir):
+            raise FileNotFoundError('Library not found: ' + lib_dir)
+        version = os.stat(os.path.join(lib_dir, '_root.yml')).st_mtime_ns
+
+        cached = self._libraries.get(lib_dir)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if lib_dir in self._loading:
+            chain = self._loading[self._loading.index(lib_dir):] + [lib_dir]
+            raise ConfigError('Cyclic library reference: ' + ' -> '.join(chain))
+
+        self._loading.append(lib_dir)
+        try:
+            library = load(lib_dir)
+        finally:
+            self._loading.pop()
+        if not library.is_library():
+            raise ConfigError(f'{lib_dir} referenced but is not marked as library')
+
+        self._libraries[lib_dir] = (version, library)
+        return library
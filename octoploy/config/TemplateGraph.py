@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from octoploy.config.Config import RootConfig
+
+from octoploy.config.AppConfig import AppConfig
+from octoploy.utils.Errors import ConfigError
+
+
+class TemplateNode:
+    """
+    A template referenced via applyTemplates/postApplyTemplates
+    """
+
+    __slots__ = ('name', 'config', 'enabled', 'pre', 'post')
+
+    def __init__(self, name: str, config: AppConfig, enabled: bool):
+        self.name = name
+        self.config = config
+        self.enabled = enabled
+        """
+        Disabled templates are not expanded
+        """
+        self.pre: List[TemplateNode] = []
+        self.post: List[TemplateNode] = []
+
+    def get_refs(self) -> List[TemplateNode]:
+        return self.pre + self.post
+
+
+class TemplateGraph:
+    """
+    Reference graph of all templates of a project (including the templates of libraries).
+    Every template is loaded and resolved only once per run, no matter how many apps
+    or forEach instances reference it.
+    """
+
+    def __init__(self, root: RootConfig):
+        self._root = root
+        self._nodes: Dict[str, TemplateNode] = {}
+
+    def resolve(self, template_names: List[str]) -> List[TemplateNode]:
+        """
+        Resolves the given template references
+        :param template_names: Names of the templates
+        :return: Templates, in the order of the references
+        :raise ConfigError: Gets raised if the templates reference each other
+        :raise ValueError: Gets raised if a referenced app is not a template
+        """
+        return [self._get_node(name, []) for name in template_names]
+
+    def get_order(self, template_names: List[str]) -> List[TemplateNode]:
+        """
+        Returns the given templates and all templates they reference (recursively)
+        in topological order, so every template comes after the templates it references
+        :param template_names: Names of the templates
+        :return: Templates, every template is only contained once
+        """
+        order = []
+        visited = set()
+        stack = [(node, False) for node in reversed(self.resolve(template_names))]
+        while len(stack) > 0:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if node.name in visited:
+                continue
+            visited.add(node.name)
+            stack.append((node, True))
+            for ref in reversed(node.get_refs()):
+                if ref.name not in visited:
+                    stack.append((ref, False))
+        return order
+
+    def _get_node(self, name: str, path: List[str]) -> TemplateNode:
+        if name in path:
+            chain = path[path.index(name):] + [name]
+            raise ConfigError('Cyclic template reference: ' + ' -> '.join(chain))
+
+        node = self._nodes.get(name)
+        if node is not None:
+            return node
+
+        config = self._root.load_app_config(name)
+        if not config.is_template():
+            raise ValueError(f'Referenced app {name} is not declared as template')
+        node = TemplateNode(name, config, config.enabled())
+        if node.enabled:
+            path = path + [name]
+            node.pre = [self._get_node(ref, path) for ref in config.get_pre_template_refs()]
+            node.post = [self._get_node(ref, path) for ref in config.get_post_template_refs()]
+        self._nodes[name] = node
+        return node
@@ -2,11 +2,19 @@ from typing import Optional
 
 import yaml
 
+from octoploy.utils.ParseCache import ParseCache
+
 
 class YmlConfig:
     def __init__(self, path: Optional[str]):
         self.data = {}
         self._path = path
         if path is not None:
-            with open(path, 'r') as stream:
-                self.data = yaml.safe_load(stream)
+            self.data = ParseCache.load(path, yaml.safe_load, 'safe_load')
+
+    def get_path(self) -> Optional[str]:
+        """
+        Returns the path of the yml file
+        :return: Path or None if the config has not been loaded from a file
+        """
+        return self._path
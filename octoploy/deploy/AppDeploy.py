@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import os
 from typing import List
 
 import yaml
 
 from octoploy.config.Config import RootConfig, AppConfig, RunMode
+from octoploy.config.TemplateGraph import TemplateNode
 from octoploy.deploy.DeploymentBundle import DeploymentBundle
 from octoploy.deploy.K8sObjectDeployer import K8sObjectDeployer
+from octoploy.deploy.ObjectTemplateCache import ObjectTemplateCache
+from octoploy.processing.TreeWalker import TreeWalker
 from octoploy.processing.YmlTemplateProcessor import YmlTemplateProcessor
 from octoploy.utils.Errors import SkipObject
 from octoploy.utils.Log import Log
-from octoploy.utils.Yml import Yml
 
 
 class AppDeployment:
@@ -72,6 +73,7 @@ class AppDeployRunner(Log):
         self._app_config = app_config
         self._bundle = DeploymentBundle(self._root_config.get_pre_processor())
         self._mode = mode
+        self._templates = ObjectTemplateCache.shared()
 
     def deploy(self):
         """
@@ -86,31 +88,32 @@ class AppDeployRunner(Log):
         template_processor = self._app_config.get_template_processor()
         template_processor.parents([self._root_config.get_template_processor()])
 
-        self._apply_templates(self._app_config.get_pre_template_refs(), template_processor)
+        templates = self._root_config.get_template_graph()
+        self._apply_templates(templates.resolve(self._app_config.get_pre_template_refs()), template_processor)
         self._load_files(self._app_config.get_config_root(), template_processor)
         self._load_extras(self._app_config, template_processor)
-        self._apply_templates(self._app_config.get_post_template_refs(), template_processor)
+        self._apply_templates(templates.resolve(self._app_config.get_post_template_refs()), template_processor)
 
         # Additional processing
-        tree_processors = self._root_config.get_yml_processors()
+        # All processors are applied in a single pass over each object
+        walker = TreeWalker(self._root_config.get_yml_processors())
         skipped_objects = []
-        for processor in tree_processors:
-            for k8s_object in self._bundle.objects:
-                try:
-                    processor.process(k8s_object)
-                except SkipObject as e:
-                    self.log.warning(f'Skipping object: {e}')
-                    skipped_objects.append(k8s_object)
+        for k8s_object in self._bundle.objects:
+            try:
+                walker.process(k8s_object)
+            except SkipObject as e:
+                self.log.warning(f'Skipping object: {e}')
+                skipped_objects.append(k8s_object)
 
         for k8s_object in skipped_objects:
             # Mark in state as "visited" so the object doesn't get deleted on k8s side
             self._root_config.get_state().visit(self._app_config.get_name(), k8s_object, k8s_object.get_hash(),
                                                 only_update=True)
-            self._bundle.objects.remove(k8s_object)
+        self._bundle.remove_objects(skipped_objects)
 
         api = self._root_config.create_api()
-        if self._mode.out_file is not None:
-            self._bundle.dump_objects(self._mode.out_file)
+        if self._mode.has_output():
+            self._mode.get_out_writer().write(self._app_config.get_name(), self._bundle.objects)
 
         if self._mode.dry_run:
             return
@@ -119,19 +122,16 @@ class AppDeployRunner(Log):
         object_deployer = K8sObjectDeployer(self._root_config, api, self._app_config, mode=self._mode)
         self._bundle.deploy(object_deployer)
 
-    def _apply_templates(self, template_names: List[str], template_processor: YmlTemplateProcessor):
+    def _apply_templates(self, templates: List[TemplateNode], template_processor: YmlTemplateProcessor):
         """
         Deploys all referenced templates (recursively)
         """
-        for template_name in template_names:
-            template = self._root_config.load_app_config(template_name)
-            if not template.is_template():
-                raise ValueError(f'Referenced app {template_name} is not declared as template')
-            if not template.enabled():
-                self.log.warning(f'Template {template_name} is disabled, skipping')
+        for template in templates:
+            if not template.enabled:
+                self.log.warning(f'Template {template.name} is disabled, skipping')
                 return
 
-            child_template_processor = YmlTemplateProcessor(template)
+            child_template_processor = YmlTemplateProcessor(template.config)
             # Inherit all vars from the previous template processor
             # The child processor is a parent from a config perspective
             # since its configuration will be overwritten by the previous template
@@ -139,10 +139,10 @@ class AppDeployRunner(Log):
 
             # The template might reference other templates
             # -> Recursively deploy them
-            self._apply_templates(template.get_pre_template_refs(), child_template_processor)
-            self._load_files(template.get_config_root(), child_template_processor)
-            self._load_extras(template, child_template_processor)
-            self._apply_templates(template.get_post_template_refs(), child_template_processor)
+            self._apply_templates(template.pre, child_template_processor)
+            self._load_files(template.config.get_config_root(), child_template_processor)
+            self._load_extras(template.config, child_template_processor)
+            self._apply_templates(template.post, child_template_processor)
 
     def _load_files(self, root: str, template_processor: YmlTemplateProcessor):
         """
@@ -150,10 +150,7 @@ class AppDeployRunner(Log):
         :param root: Path to the root of the configs folder
         :param template_processor: The template processor that should be used for those files
         """
-        for item in os.listdir(root):
-            path = os.path.join(root, item)
-            if not os.path.isfile(path) or not item.endswith('.yml') or item.startswith('_'):
-                continue
+        for path in self._templates.list_files(root):
             self._load_file(path, template_processor)
 
     def _load_file(self, path: str, template_processor: YmlTemplateProcessor):
@@ -163,12 +160,13 @@ class AppDeployRunner(Log):
         :param template_processor: Template processor which should be used
         """
         try:
-            docs = Yml.load_docs(path)
+            plans = self._templates.load_plans(path)
         except yaml.parser.ParserError as e:
             self.log.error(f'Could not parse {path} {e}')
             raise
-        for doc in docs:
-            self._bundle.add_object(doc, template_processor)
+        for plan in plans:
+            # The document is rendered from the shared plan, no need to process it again
+            self._bundle.add_object(template_processor.render(plan), None)
 
     def _load_extras(self, app_config: AppConfig, template_processor: YmlTemplateProcessor):
         """
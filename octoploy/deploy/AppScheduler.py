@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from octoploy.config.AppConfig import AppConfig
+from octoploy.config.AppGraph import AppGraph
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.AppDeploy import AppDeployment
+from octoploy.utils.Log import Log
+
+
+class AppScheduler(Log):
+    """
+    Deploys apps in the waves of their dependency graph.
+    If an app fails, the apps depending on it (directly or indirectly) are skipped,
+    all other apps are still deployed.
+    """
+
+    def __init__(self, root_config: RootConfig, mode: RunMode, jobs: int = 1):
+        """
+        :param root_config: Project
+        :param mode: Run mode
+        :param jobs: Number of apps of a wave which are deployed concurrently, 0 for no limit
+        """
+        super().__init__()
+        self._root_config = root_config
+        self._mode = mode
+        self._jobs = jobs
+
+    def deploy(self, app_configs: List[AppConfig]):
+        """
+        Deploys the given apps
+        :param app_configs: Apps
+        :raise ConfigError: Gets raised if the apps depend on each other
+        :raise Exception: The error of the first failed app, after all other apps have been deployed
+        """
+        graph = AppGraph(self._root_config, app_configs)
+        dependencies = graph.get_dependencies()
+        errors: Dict[str, Exception] = {}
+        failed = set()
+        for wave in graph.get_waves():
+            runnable = []
+            for app_config in wave:
+                name = AppGraph.get_dir_name(app_config)
+                blocked = [x for x in dependencies[name] if x in failed]
+                if len(blocked) > 0:
+                    self.log.error(f'Skipping {name}, depends on failed app(s) {", ".join(blocked)}')
+                    failed.add(name)
+                    continue
+                runnable.append(app_config)
+
+            for app_config, error in zip(runnable, self._deploy_wave(runnable)):
+                if error is not None:
+                    name = AppGraph.get_dir_name(app_config)
+                    self.log.error(f'Deploying {name} failed: {error}')
+                    failed.add(name)
+                    errors[name] = error
+
+        if len(errors) > 0:
+            raise next(iter(errors.values()))
+
+    def _deploy_wave(self, app_configs: List[AppConfig]) -> List[Optional[Exception]]:
+        if self._jobs == 1 or len(app_configs) <= 1:
+            return [self._deploy_app(x) for x in app_configs]
+        with ThreadPoolExecutor(max_workers=None if self._jobs <= 0 else self._jobs) as executor:
+            return list(executor.map(self._deploy_buffered, app_configs))
+
+    def _deploy_buffered(self, app_config: AppConfig) -> Optional[Exception]:
+        # The output of an app is printed at once, so the output of concurrent apps doesn't interleave
+        with Log.buffer():
+            return self._deploy_app(app_config)
+
+    def _deploy_app(self, app_config: AppConfig) -> Optional[Exception]:
+        try:
+            AppDeployment(self._root_config, app_config, self._mode).deploy()
+        except Exception as e:
+            return e
+        return None
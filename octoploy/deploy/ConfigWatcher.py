@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from octoploy.api.CachingK8sApi import CachingK8sApi
+from octoploy.config.AppConfig import AppConfig
+from octoploy.config.AppDependencies import AppDependencies
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.AppDeploy import AppDeployment
+from octoploy.utils.Log import Log
+from octoploy.utils.ParseCache import ParseCache
+
+
+class ConfigWatcher(Log):
+    """
+    Polls the config tree of a project for changes and re-plans the affected apps.
+    The project and the parsed files are kept in memory between the runs, the project is only loaded again
+    if a _root.yml changes. The live objects read by the re-planned apps (and the state) are fetched again,
+    so changes made outside of octoploy show up in their plan. The cached objects of the other apps are kept.
+    """
+
+    IGNORED_DIRS = {ParseCache.DIR_NAME, '.git'}
+
+    ROOT_FILE = '_root.yml'
+    INDEX_FILE = '_index.yml'
+
+    def __init__(self, load_project: Callable[[], RootConfig], app_names: List[str], mode: RunMode,
+                 interval: float = 0.5):
+        """
+        :param load_project: Loads the project
+        :param app_names: Names of the apps which should be watched, empty for all apps
+        :param mode: Run mode, plan mode is always enabled
+        :param interval: Polling interval in seconds
+        """
+        super().__init__()
+        self._load_project = load_project
+        self._app_names = app_names
+        self._mode = mode
+        self._mode.plan = True
+        self._interval = interval
+        self._api: Optional[CachingK8sApi] = None
+        self._root: Optional[RootConfig] = None
+        self._dirs: List[str] = []
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._app_objects: Dict[str, Set[Tuple[str, Optional[str]]]] = {}
+        self._state_objects: Set[Tuple[str, Optional[str]]] = set()
+
+    def run(self):
+        """
+        Plans all apps, then watches for changes until interrupted
+        """
+        self.start()
+        self.log.info('Watching for changes')
+        while True:
+            time.sleep(self._interval)
+            self.check()
+
+    def start(self):
+        """
+        Plans all watched apps
+        :raise FileNotFoundError: Gets raised if the project could not be found
+        """
+        self._root = self._load_project()
+        self._api = CachingK8sApi(self._root.create_api())
+        self._dirs = self._get_dirs(self._root)
+        self._snapshot = self._take_snapshot()
+        self._plan(None)
+
+    def check(self) -> bool:
+        """
+        Re-plans the apps affected by changed files
+        :return: True if any files changed
+        """
+        snapshot = self._take_snapshot()
+        changed = set(snapshot.keys()) ^ set(self._snapshot.keys())
+        for path, version in snapshot.items():
+            if self._snapshot.get(path, version) != version:
+                changed.add(path)
+        self._snapshot = snapshot
+        if len(changed) == 0:
+            return False
+
+        self.log.debug(f'Changed files: {sorted(changed)}')
+        names = {os.path.basename(x) for x in changed}
+        if self._root is None or self.ROOT_FILE in names:
+            try:
+                self._root = self._load_project()
+                self._dirs = self._get_dirs(self._root)
+            except Exception as e:
+                self._root = None
+                self.log.error(f'Loading the project failed: {e}')
+                return True
+        elif self.INDEX_FILE in names:
+            # The apps are reloaded on their own, but the templates they reference might have changed
+            self._root.reset_template_graph()
+        self._plan(changed)
+        return True
+
+    def _plan(self, changed: Optional[Set[str]]):
+        """
+        Plans the affected apps
+        :param changed: Paths of the changed files, None if all apps should be planned
+        """
+        root_config = self._root
+        root_config.use_api(self._api)
+        try:
+            # Objects might have been changed outside of octoploy in the meantime
+            self._invalidate(self._state_objects)
+            with self._api.record() as keys:
+                # Filled while planning, so the objects are known even if the planning fails
+                self._state_objects = keys
+                root_config.initialize_state(self._mode)
+
+            app_configs = self._get_app_configs(root_config)
+            if changed is not None:
+                app_configs = AppDependencies(root_config).get_affected(app_configs, changed)
+            for app_config in app_configs:
+                # The app name is optional, the directory identifies the app
+                app_dir = app_config.get_config_root()
+                self._invalidate(self._app_objects.pop(app_dir, set()))
+                with self._api.record() as keys:
+                    self._app_objects[app_dir] = keys
+                    AppDeployment(root_config, app_config, self._mode).deploy()
+        except Exception as e:
+            # Keep watching, the config is probably being edited
+            self.log.error(f'Planning failed: {e}')
+            return
+        self.log.info(f'Planned {len(app_configs)} app(s), cached objects: {self._api.get_size()}')
+
+    def _invalidate(self, keys: Set[Tuple[str, Optional[str]]]):
+        """
+        Drops the given objects from the cache
+        :param keys: Keys (name, namespace) of the objects
+        """
+        for name, namespace in keys:
+            self._api.invalidate(name, namespace)
+
+    def _get_app_configs(self, root_config: RootConfig) -> List[AppConfig]:
+        if len(self._app_names) == 0:
+            return root_config.load_app_configs()
+        return [root_config.load_app_config(name) for name in self._app_names]
+
+    def _get_dirs(self, root_config: RootConfig) -> List[str]:
+        dirs = [os.path.realpath(root_config.get_config_root())]
+        for library in root_config.get_libraries():
+            dirs.extend(self._get_dirs(library))
+        return list(dict.fromkeys(dirs))
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the mtime and size of all files inside the watched directories
+        """
+        snapshot = {}
+        for root_dir in self._dirs:
+            for dir_path, dir_names, file_names in os.walk(root_dir):
+                dir_names[:] = [x for x in dir_names if x not in self.IGNORED_DIRS]
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        # Removed in the meantime
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
@@ -1,9 +1,6 @@
 from __future__ import annotations
 
-import os
-from typing import List, Optional
-
-import yaml
+from typing import Dict, List, Optional
 
 from octoploy.deploy.K8sObjectDeployer import K8sObjectDeployer
 from octoploy.k8s.BaseObj import BaseObj
@@ -11,7 +8,6 @@ from octoploy.processing.DataPreProcessor import DataPreProcessor
 from octoploy.processing.K8sObjectMerge import K8sObjectMerge
 from octoploy.processing.YmlTemplateProcessor import YmlTemplateProcessor
 from octoploy.utils.Log import Log
-from octoploy.utils.YmlWriter import YmlWriter
 
 
 class DeploymentBundle(Log):
@@ -24,6 +20,11 @@ class DeploymentBundle(Log):
         super().__init__()
         self.objects = []  # All objects which should be deployed
         self._pre_processor = pre_processor
+        self._index: Dict[str, BaseObj] = {}
+        """
+        First added object of each fqn, objects can only be merged into these
+        """
+        self._merger = K8sObjectMerge()
 
     def add_object(self, data: dict, template_processor: Optional[YmlTemplateProcessor]):
         """
@@ -40,47 +41,37 @@ class DeploymentBundle(Log):
         if template_processor is not None:
             template_processor.process(k8s_object)
 
-        merger = K8sObjectMerge()
-        # Check if the new data can be merged into any existing objects
-        for item in self.objects:
-            if merger.merge(item, k8s_object):
-                # Data has been merged
-                return
+        # Check if the new data can be merged into an existing object
+        existing = self._index.get(k8s_object.get_fqn())
+        if existing is not None and self._merger.merge(existing, k8s_object):
+            # Data has been merged
+            return
 
         self._pre_processor.process(data)
+        k8s_object.refresh()
         self.objects.append(k8s_object)
+        self._index.setdefault(k8s_object.get_fqn(), k8s_object)
+
+    def remove_objects(self, k8s_objects: List[BaseObj]):
+        """
+        Removes the given objects from this bundle
+        :param k8s_objects: Objects which have been added to this bundle
+        """
+        removed = set(id(x) for x in k8s_objects)
+        if len(removed) == 0:
+            return
+        self.objects = [x for x in self.objects if id(x) not in removed]
+        self._index = {}
+        for k8s_object in self.objects:
+            self._index.setdefault(k8s_object.get_fqn(), k8s_object)
 
     def deploy(self, deploy_runner: K8sObjectDeployer):
         """
         Deploys all objects in this bundle
         :param deploy_runner: Deployment runner which should be used
         """
-        # First sort the objects, we want "deployments" to be the last object type
-        # so all prerequisites are available
-        def sorting(x: BaseObj):
-            if x.is_kind('DeploymentConfig') or x.is_kind('Deployment'):
-                return 1
-            return 0
-
-        self.objects.sort(key=sorting)
+        # The deployer orders the objects by their dependencies
         for item in self.objects:
             deploy_runner.add_object(item)
 
         deploy_runner.execute()
-
-    def dump_objects(self, path: str):
-        """
-        Very crude method for dumping the objects to a yml file.
-        If the file does already exist the content will be appended
-        :param path: Path to a file
-        """
-        all_objects = []
-        if os.path.isfile(path):
-            with open(path) as f:
-                data = yaml.load_all(f, Loader=yaml.FullLoader)
-                for doc in data:
-                    all_objects.append(doc)
-
-        all_objects.extend([x.data for x in self.objects])
-        with open(path, 'w') as file:
-            YmlWriter.dump_all(all_objects, file)
@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from octoploy.api.Kubectl import K8sApi
 from octoploy.config.Config import RootConfig, AppConfig, RunMode
+from octoploy.deploy.ObjectGraph import ObjectGraph
 from octoploy.k8s.BaseObj import BaseObj
 from octoploy.k8s.K8sObjectDiff import K8sObjectDiff
 from octoploy.state.StateTracking import StateTracking
@@ -49,15 +51,33 @@ class K8sObjectDeployer(Log):
 
     def _deploy_objects(self):
         """
-        Deploys the pending objects
+        Deploys the pending objects, wave by wave.
+        The objects of a wave don't depend on each other and are deployed concurrently,
+        the reload actions run once the wave has been deployed.
+        In delete mode the waves are processed in reverse order, so dependents are removed before their dependencies
         """
-        for k8s_object in self._to_be_deployed:
-            self._deploy_object(k8s_object)
-
-    def _deploy_object(self, k8s_object: BaseObj):
+        waves = ObjectGraph(self._to_be_deployed).get_waves()
+        if self._mode.delete:
+            waves = list(reversed(waves))
+        jobs = self._mode.object_jobs
+        for wave in waves:
+            if jobs == 1 or len(wave) == 1:
+                for k8s_object in wave:
+                    if self._deploy_object(k8s_object):
+                        self._reload_config()
+                continue
+            with ThreadPoolExecutor(max_workers=None if jobs <= 0 else jobs) as executor:
+                # Raises the first error (if any)
+                reloads = list(executor.map(self._deploy_object, wave))
+            for reload in reloads:
+                if reload:
+                    self._reload_config()
+
+    def _deploy_object(self, k8s_object: BaseObj) -> bool:
         """
         Deploy the given object (if a deployment required, otherwise does nothing)
         :param k8s_object: Object which should be deployed
+        :return: True if the reload actions of the app should be executed
         """
         hash_val = k8s_object.get_hash()
         item_path = k8s_object.get_fqn()
@@ -66,7 +86,7 @@ class K8sObjectDeployer(Log):
         current_object = self._api.get(item_path, namespace=namespace)
         if current_object is None:
             if self._mode.delete:
-                return
+                return False
             self._log_create(item_path)
 
         state_hash = None
@@ -84,29 +104,32 @@ class K8sObjectDeployer(Log):
             if current_object is not None:
                 self._log_delete(item_path)
                 if self._mode.plan:
-                    return
+                    return False
                 self._api.delete(item_path, namespace=namespace)
             if obj_state is not None:
                 self._state.remove(obj_state)
-            return
+            return False
 
         if current_object is not None and state_hash is None:
             # Item has not been deployed with octoploy, but it does already exist
             self.log.warning(f'{item_path} has no state, assuming no change required')
             self._state.visit(self._app_config.get_name(), k8s_object, hash_val)
-            return
+            return False
 
         if state_hash == hash_val:
             self.log.debug(f"{item_path} hasn't changed")
-            return
+            return False
 
         if current_object is not None:
             self._log_update(item_path)
             if self._mode.plan:
-                K8sObjectDiff(self._api).print(current_object, k8s_object)
+                change_set = K8sObjectDiff(self._api).print(current_object, k8s_object,
+                                                            output_format=self._mode.diff_format)
+                if self._mode.change_sets is not None:
+                    self._mode.change_sets.append(change_set)
 
         if self._mode.plan:
-            return
+            return False
 
         if old_state_hash is not None:
             # Migrate to new state format by removing the old one
@@ -118,9 +141,7 @@ class K8sObjectDeployer(Log):
 
         # Update hash
         self._state.visit(self._app_config.get_name(), k8s_object, hash_val)
-
-        if k8s_object.is_kind('ConfigMap'):
-            self._reload_config()
+        return k8s_object.is_kind('ConfigMap')
 
     def _delete_abandoned_objects(self):
         """
@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional
+
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.utils.Errors import ConfigError
+from octoploy.utils.Log import Log
+
+
+class ObjectGraph(Log):
+    """
+    Dependency graph of the objects of a single app.
+    Objects depend on the objects listed in their depends-on annotation.
+    The kind priorities are a soft default on top of that: every wave consists of the ready objects
+    (all dependencies deployed) with the lowest priority, the objects of a wave don't depend on each other.
+    """
+
+    DEPENDS_ON_ANNOTATION = 'octoploy/depends-on'
+    """
+    Comma separated objects which have to be deployed first, either Kind/name or Kind.group/name
+    """
+
+    KIND_PRIORITIES = [
+        ['Namespace'],
+        ['CustomResourceDefinition'],
+        ['ServiceAccount', 'Role', 'ClusterRole', 'RoleBinding', 'ClusterRoleBinding'],
+        ['ConfigMap', 'Secret'],
+        ['StorageClass', 'PersistentVolume', 'PersistentVolumeClaim'],
+        ['Service'],
+        [None],
+        ['Deployment', 'DeploymentConfig', 'StatefulSet', 'DaemonSet', 'ReplicaSet', 'Job', 'CronJob', 'Pod'],
+        ['Ingress', 'Route'],
+    ]
+    """
+    Deploy order of the kinds, None stands for all other kinds (e.g. custom resources)
+    """
+
+    _PRIORITIES: Dict[Optional[str], int] = {kind.lower() if kind is not None else None: i
+                                             for i, kinds in enumerate(KIND_PRIORITIES) for kind in kinds}
+
+    def __init__(self, objects: List[BaseObj]):
+        """
+        :param objects: Objects, the order is kept within the waves
+        """
+        super().__init__()
+        self._objects = objects
+
+    @classmethod
+    def get_priority(cls, k8s_object: BaseObj) -> int:
+        kind = k8s_object.kind.lower() if k8s_object.kind is not None else None
+        return cls._PRIORITIES.get(kind, cls._PRIORITIES[None])
+
+    def get_waves(self) -> List[List[BaseObj]]:
+        """
+        Returns the objects grouped into waves, every object comes after its dependencies
+        :return: Waves
+        :raise ConfigError: Gets raised if the objects depend on each other
+        """
+        count = len(self._objects)
+        priorities = [self.get_priority(x) for x in self._objects]
+        dependents: List[List[int]] = [[] for _ in range(count)]
+        pending = [0] * count
+        for i, item_deps in enumerate(self._get_dependencies()):
+            pending[i] = len(item_deps)
+            for dep in item_deps:
+                dependents[dep].append(i)
+
+        waves = []
+        ready = [i for i in range(count) if pending[i] == 0]
+        done = 0
+        while len(ready) > 0:
+            priority = min(priorities[i] for i in ready)
+            wave = [i for i in ready if priorities[i] == priority]
+            ready = [i for i in ready if priorities[i] != priority]
+            waves.append([self._objects[i] for i in wave])
+            done += len(wave)
+            for i in wave:
+                for dependent in dependents[i]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+            ready.sort()
+
+        if done < count:
+            cycle = [self._objects[i].get_fqn() for i in range(count) if pending[i] > 0]
+            raise ConfigError('Cyclic object dependency between: ' + ', '.join(cycle))
+        return waves
+
+    def _get_dependencies(self) -> List[List[int]]:
+        """
+        Returns the indices of the objects every object depends on (via its annotation)
+        """
+        by_name: Dict[str, List[int]] = {}
+        for i, k8s_object in enumerate(self._objects):
+            by_name.setdefault(k8s_object.get_fqn(), []).append(i)
+            short_name = f'{k8s_object.kind}/{k8s_object.name}'
+            if short_name != k8s_object.get_fqn():
+                by_name.setdefault(short_name, []).append(i)
+
+        deps: List[List[int]] = [[] for _ in self._objects]
+        for i, k8s_object in enumerate(self._objects):
+            value = k8s_object.get_annotation(self.DEPENDS_ON_ANNOTATION)
+            if value is None:
+                continue
+            for name in value.split(','):
+                name = name.strip()
+                if name == '':
+                    continue
+                matches = by_name.get(name)
+                if matches is None:
+                    # Probably part of another app
+                    self.log.warning(f'{k8s_object.get_fqn()} depends on {name} which is not part of the app')
+                    continue
+                for dep in matches:
+                    if dep not in deps[i]:
+                        deps[i].append(dep)
+        return deps
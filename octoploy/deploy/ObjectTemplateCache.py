@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from octoploy.processing.TemplatePlan import TemplatePlan
+from octoploy.utils.DictUtils import DictUtils
+from octoploy.utils.Yml import Yml
+
+
+class ObjectTemplateCache:
+    """
+    Parses k8s yml files only once and hands out copies of the parsed documents.
+    This allows forEach instances and templates to share the parsing and rendering work.
+    Entries are invalidated once the mtime or size of the file (or directory) changes.
+    """
+
+    _instance: Optional[ObjectTemplateCache] = None
+
+    def __init__(self):
+        self._docs: Dict[str, Tuple[Tuple[int, int], List[Dict[str, any]], List[TemplatePlan]]] = {}
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
+
+    @classmethod
+    def shared(cls) -> ObjectTemplateCache:
+        """
+        Returns the cache shared by all deployments of this process
+        """
+        if cls._instance is None:
+            cls._instance = ObjectTemplateCache()
+        return cls._instance
+
+    def list_files(self, root: str) -> List[str]:
+        """
+        Returns the paths of all k8s yml files inside the given folder
+        :param root: Path to the folder
+        :return: Paths
+        """
+        mtime = os.stat(root).st_mtime_ns
+        cached = self._listings.get(root)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        files = []
+        for item in os.listdir(root):
+            path = os.path.join(root, item)
+            if not os.path.isfile(path) or not item.endswith('.yml') or item.startswith('_'):
+                continue
+            files.append(path)
+        self._listings[root] = (mtime, files)
+        return files
+
+    def load_docs(self, path: str) -> List[Dict[str, any]]:
+        """
+        Returns a copy of all documents inside the given yml file
+        :param path: Path
+        :return: Documents, can be modified by the caller
+        """
+        return DictUtils.copy_tree(self._load(path)[0])
+
+    def load_plans(self, path: str) -> List[TemplatePlan]:
+        """
+        Returns the compiled documents inside the given yml file
+        :param path: Path
+        :return: Compiled documents, must not be modified
+        """
+        return self._load(path)[1]
+
+    def _load(self, path: str) -> Tuple[List[Dict[str, any]], List[TemplatePlan]]:
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._docs.get(path)
+        if cached is None or cached[0] != version:
+            docs = Yml.load_docs(path)
+            cached = (version, docs, [TemplatePlan.compile(doc) for doc in docs])
+            self._docs[path] = cached
+        return cached[1], cached[2]
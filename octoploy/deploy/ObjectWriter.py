@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.utils.YmlWriter import YmlWriter
+
+
+class ObjectWriter(ABC):
+    """
+    Writes the objects of all apps to the out file, as soon as an app has been processed.
+    Existing output is replaced by the first write.
+    """
+
+    LAYOUTS = ('file', 'app', 'object', 'jsonl')
+
+    @staticmethod
+    def create(path: str, layout: str = 'file') -> ObjectWriter:
+        """
+        Creates a writer for the given layout
+        :param path: Output file, or directory for the "app" and "object" layouts
+        :param layout: file: single yml file, app: one yml file per app, object: one yml file per object
+        (grouped in app directories), jsonl: single file containing one json object per line
+        :return: Writer
+        :raise ValueError: Gets raised if the layout is unknown
+        """
+        if layout == 'file':
+            return YmlFileWriter(path)
+        if layout == 'app':
+            return AppFileWriter(path)
+        if layout == 'object':
+            return ObjectFileWriter(path)
+        if layout == 'jsonl':
+            return JsonLinesWriter(path)
+        raise ValueError(f'Unknown output layout {layout}, expected one of {", ".join(ObjectWriter.LAYOUTS)}')
+
+    @abstractmethod
+    def write(self, app_name: str, objects: List[BaseObj]):
+        """
+        Writes the objects of an app
+        :param app_name: Name of the app
+        :param objects: Objects of the app
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class _StreamWriter(ObjectWriter):
+    """
+    Keeps a single output file open
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file: Optional[IO] = None
+
+    def write(self, app_name: str, objects: List[BaseObj]):
+        if len(objects) == 0:
+            return
+        if self._file is None:
+            directory = os.path.dirname(self._path)
+            if directory != '':
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self._path, 'w')
+        self._write(self._file, objects)
+        # Downstream tools can consume the output while the other apps are processed
+        self._file.flush()
+
+    @abstractmethod
+    def _write(self, file: IO, objects: List[BaseObj]):
+        raise NotImplementedError
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class YmlFileWriter(_StreamWriter):
+    """
+    Writes all objects into a single yml file
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._empty = True
+
+    def _write(self, file: IO, objects: List[BaseObj]):
+        if not self._empty:
+            file.write('---\n')
+        YmlWriter.dump_all([x.data for x in objects], file)
+        self._empty = False
+
+
+class JsonLinesWriter(_StreamWriter):
+    """
+    Writes one json object per line
+    """
+
+    def _write(self, file: IO, objects: List[BaseObj]):
+        for k8s_object in objects:
+            # Dates are written like in the yml output
+            file.write(json.dumps(k8s_object.data, sort_keys=True, default=str))
+            file.write('\n')
+
+
+class ObjectCollector(ObjectWriter):
+    """
+    Keeps the written objects in memory
+    """
+
+    def __init__(self):
+        self.items: List[Tuple[str, List[dict]]] = []
+
+    def write(self, app_name: str, objects: List[BaseObj]):
+        self.items.append((app_name, [x.data for x in objects]))
+
+
+class _DirectoryWriter(ObjectWriter):
+    """
+    Writes yml files into an output directory.
+    The written files are recorded in a manifest inside the directory, the files of a previous run
+    are removed when the writer is created. Other files are never touched.
+    """
+
+    MANIFEST = '.octoploy-output'
+
+    def __init__(self, path: str):
+        """
+        :param path: Output directory
+        :raise FileExistsError: Gets raised if the directory is not empty and hasn't been written by octoploy
+        """
+        self._path = path
+        self._files: Set[str] = set()
+        self._clear()
+
+    def _clear(self):
+        if not os.path.isdir(self._path):
+            return
+        manifest = os.path.join(self._path, self.MANIFEST)
+        if not os.path.isfile(manifest):
+            if len(os.listdir(self._path)) > 0:
+                raise FileExistsError(f'{self._path} is not empty and does not contain octoploy output')
+            return
+
+        with open(manifest) as f:
+            files = [x for x in f.read().splitlines() if x != '']
+        root = os.path.realpath(self._path)
+        for name in files:
+            path = os.path.realpath(os.path.join(root, name))
+            if not path.startswith(root + os.sep):
+                # Never delete anything outside of the output
+                continue
+            if os.path.isfile(path):
+                os.remove(path)
+            directory = os.path.dirname(path)
+            if directory != root and os.path.isdir(directory) and len(os.listdir(directory)) == 0:
+                os.rmdir(directory)
+        os.remove(manifest)
+
+    def _open(self, path: str, mode: str = 'w') -> IO:
+        """
+        Opens a file inside the output directory and records it in the manifest
+        :param path: Path of the file
+        :param mode: File mode
+        :return: File
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        name = os.path.relpath(path, self._path)
+        if name not in self._files:
+            # Recorded before writing, so the file is known even if the run gets aborted
+            with open(os.path.join(self._path, self.MANIFEST), 'a') as manifest:
+                manifest.write(name + '\n')
+            self._files.add(name)
+        return open(path, mode)
+
+
+class AppFileWriter(_DirectoryWriter):
+    """
+    Writes one yml file per app into the output directory
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._written: Set[str] = set()
+
+    def write(self, app_name: str, objects: List[BaseObj]):
+        if len(objects) == 0:
+            return
+        path = os.path.join(self._path, _to_file_name(app_name) + '.yml')
+        append = path in self._written
+        with self._open(path, 'a' if append else 'w') as file:
+            if append:
+                file.write('---\n')
+            YmlWriter.dump_all([x.data for x in objects], file)
+        self._written.add(path)
+
+
+class ObjectFileWriter(_DirectoryWriter):
+    """
+    Writes every object into its own yml file: <output>/<app>/<Kind>_<name>.yml
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._counts: Dict[str, int] = {}
+
+    def write(self, app_name: str, objects: List[BaseObj]):
+        app_dir = os.path.join(self._path, _to_file_name(app_name))
+        for k8s_object in objects:
+            name = os.path.join(app_dir, _to_file_name(k8s_object.get_fqn()))
+            # Objects which couldn't be merged share the fqn
+            count = self._counts.get(name, 0) + 1
+            self._counts[name] = count
+            path = name + '.yml' if count == 1 else f'{name}-{count}.yml'
+            with self._open(path) as file:
+                file.write(YmlWriter.dump(k8s_object.data))
+
+
+def _to_file_name(name: str) -> str:
+    return re.sub(r'[^\w.-]', '_', name)
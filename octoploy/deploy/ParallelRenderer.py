@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from octoploy.config.AppConfig import AppConfig
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.AppDeploy import AppDeployment
+from octoploy.deploy.ObjectWriter import ObjectCollector
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.processing.DecryptionProcessor import DecryptionProcessor
+from octoploy.utils.Log import Log
+from octoploy.utils.ParseCache import ParseCache
+
+
+class _RenderSettings:
+    """
+    Process wide settings which have to be passed to the workers
+    """
+
+    def __init__(self, config_root: str, var_override: Dict[str, str]):
+        self.config_root = config_root
+        self.var_override = var_override
+        self.parse_cache = ParseCache.is_enabled()
+        self.skip_secrets = DecryptionProcessor.skip_secrets
+        self.deploy_plain_text = DecryptionProcessor.deploy_plain_text
+        self.log_level = Log.log_level
+
+
+_worker_root: Optional[RootConfig] = None
+_worker_settings: Optional[_RenderSettings] = None
+
+
+def _init_worker(settings: _RenderSettings):
+    global _worker_root, _worker_settings
+    if settings.parse_cache:
+        ParseCache.enable(settings.config_root)
+    DecryptionProcessor.skip_secrets = settings.skip_secrets
+    DecryptionProcessor.deploy_plain_text = settings.deploy_plain_text
+    Log.log_level = settings.log_level
+    _worker_settings = settings
+    # Loaded once per worker, so the caches stay warm for all apps rendered by this worker
+    _worker_root = RootConfig.load(settings.config_root)
+
+
+def _find_root(root: RootConfig, config_root: str) -> Optional[RootConfig]:
+    """
+    Returns the project or library with the given config root
+    """
+    if os.path.realpath(root.get_config_root()) == config_root:
+        return root
+    for library in root.get_libraries():
+        found = _find_root(library, config_root)
+        if found is not None:
+            return found
+    return None
+
+
+def _render_app(app_key: Tuple[str, str]) -> List[Tuple[str, List[dict]]]:
+    """
+    Renders a single app inside a worker process
+    :param app_key: Config root of the project/library containing the app and the name of the app folder
+    :return: Name and objects of every instance of the app
+    """
+    config_root, app_dir = app_key
+    owner = _find_root(_worker_root, config_root)
+    if owner is None:
+        raise FileNotFoundError(f'App folder not found: {os.path.join(config_root, app_dir)}')
+    mode = RunMode()
+    mode.dry_run = True
+    mode.var_override = _worker_settings.var_override
+    collector = ObjectCollector()
+    mode.set_out_writer(collector)
+
+    _worker_root.initialize_state(mode)
+    AppDeployment(_worker_root, owner.load_app_config(app_dir), mode).deploy()
+    return collector.items
+
+
+class ParallelRenderer(Log):
+    """
+    Renders apps on all cores (dry run only).
+    The objects are written to the output of the run mode in the order of the apps,
+    so the output is the same as the output of a sequential run.
+    """
+
+    def __init__(self, root_config: RootConfig, mode: RunMode, jobs: Optional[int] = None):
+        """
+        :param root_config: Project
+        :param mode: Run mode, must be a dry run
+        :param jobs: Number of worker processes, None for the number of cores
+        :raise ValueError: Gets raised if the mode is not a dry run
+        """
+        super().__init__()
+        if not mode.dry_run:
+            raise ValueError('Parallel rendering requires a dry run')
+        self._root_config = root_config
+        self._mode = mode
+        self._jobs = jobs
+
+    def render(self, app_configs: List[AppConfig]):
+        """
+        Renders the given apps and writes their objects
+        :param app_configs: Apps of the project
+        """
+        # Folder names are only unique within a project/library
+        app_keys = [self._get_key(x) for x in app_configs]
+        settings = _RenderSettings(self._root_config.get_config_root(), self._mode.var_override)
+        writer = self._mode.get_out_writer()
+        with ProcessPoolExecutor(max_workers=self._jobs, initializer=_init_worker,
+                                 initargs=(settings,)) as executor:
+            # The results are returned in the order of the apps
+            for results in executor.map(_render_app, app_keys):
+                for app_name, objects in results:
+                    writer.write(app_name, [BaseObj(x) for x in objects])
+
+    @staticmethod
+    def _get_key(app_config: AppConfig) -> Tuple[str, str]:
+        app_dir = os.path.realpath(app_config.get_config_root())
+        return os.path.dirname(app_dir), os.path.basename(app_dir)
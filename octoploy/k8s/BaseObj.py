@@ -11,14 +11,28 @@ class BaseObj:
     namespace: Optional[str]
     metadata: Dict[str, any]
 
+    _serialized: Optional[str]
+    """
+    Cached yml representation of the data, see as_string()
+    """
+
+    _hash: Optional[str]
+    """
+    Cached hash of the serialized data, see get_hash()
+    """
+
     def __init__(self, data: Dict[str, any]):
         self.data = data
         self.refresh()
 
     def refresh(self):
         """
-        Refreshes the meta-data fields from the current data
+        Refreshes the meta-data fields from the current data.
+        Must be called after the data has been modified, since this also
+        invalidates the cached serialized form and hash.
         """
+        self._serialized = None
+        self._hash = None
         self.kind = self.data['kind']
         self.api_version = self.data['apiVersion']
 
@@ -30,8 +44,12 @@ class BaseObj:
         return self.metadata.get('annotations', {}).get(key)
 
     def set_namespace(self, namespace: str):
+        if 'metadata' not in self.data:
+            self.data['metadata'] = self.metadata
         self.metadata['namespace'] = namespace
         self.namespace = namespace
+        self._serialized = None
+        self._hash = None
 
     def get_fqn(self) -> str:
         """
@@ -66,9 +84,17 @@ class BaseObj:
             raise ValueError(f'Object is not of kind {kind}')
 
     def as_string(self) -> str:
-        return YmlWriter.dump(self.data)
+        """
+        Returns the yml representation of this object.
+        The result is cached until the next call of refresh()
+        :return: Yml
+        """
+        if self._serialized is None:
+            # Sort the content so it's always reproducible
+            self._serialized = YmlWriter.dump(self.data)
+        return self._serialized
 
     def get_hash(self) -> str:
-        # Sort the content so it's always reproducible
-        str_repr = YmlWriter.dump(self.data)
-        return hashlib.md5(str_repr.encode('utf-8')).hexdigest()
+        if self._hash is None:
+            self._hash = hashlib.md5(self.as_string().encode('utf-8')).hexdigest()
+        return self._hash
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import difflib
+import json
+from typing import Any, Dict, List, Optional
+
+from octoploy.utils.Log import ColorFormatter
+
+
+class Change:
+    """
+    A single changed value
+    """
+
+    ADD = 'add'
+    REMOVE = 'remove'
+    CHANGE = 'change'
+
+    __slots__ = ('op', 'path', 'old', 'new')
+
+    def __init__(self, op: str, path: List[str], old: Any = None, new: Any = None):
+        self.op = op
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def get_path(self) -> str:
+        return '.'.join(self.path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {'op': self.op, 'path': self.get_path()}
+        if self.op != self.ADD:
+            data['old'] = self.old
+        if self.op != self.REMOVE:
+            data['new'] = self.new
+        return data
+
+    def __repr__(self):
+        return f'{self.op} {self.get_path()}'
+
+
+class ChangeSet:
+    """
+    All changes between two objects, can be rendered as text or json
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        """
+        :param name: Name of the object (fqn)
+        """
+        self.name = name
+        self.sections: List[str] = []
+        """
+        Top level sections which contain changes (e.g. spec.template)
+        """
+        self.changes: List[Change] = []
+
+    def is_empty(self) -> bool:
+        return len(self.changes) == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'sections': self.sections,
+            'changes': [x.to_dict() for x in self.changes],
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns the change set as a single json line
+        """
+        return json.dumps(self.to_dict(), default=str)
+
+    def to_text(self) -> List[str]:
+        """
+        Returns the colored lines of a human readable diff
+        """
+        lines = []
+        if len(self.sections) > 0:
+            lines.append(ColorFormatter.colorize('  changed sections: ' + ', '.join(self.sections), ColorFormatter.grey))
+        for change in self.changes:
+            path = change.get_path()
+            if change.op == Change.ADD:
+                lines.append(ColorFormatter.colorize(f'+ {path} = {change.new}', ColorFormatter.green))
+                continue
+            if change.op == Change.REMOVE:
+                lines.append(ColorFormatter.colorize(f'- {path} = {change.old}', ColorFormatter.red))
+                continue
+
+            # If the entry is a multiline string, we create a proper diff
+            if (isinstance(change.old, str) and isinstance(change.new, str) and
+                    ('\n' in change.old or '\n' in change.new)):
+                lines.append(ColorFormatter.colorize(f'~ {path}:', ColorFormatter.yellow))
+                delta = difflib.unified_diff(change.old.splitlines(), change.new.splitlines())
+                lines.extend(self._text_diff(delta))
+                continue
+            lines.append(ColorFormatter.colorize(f'~ {path} = {change.old} -> {change.new}', ColorFormatter.yellow))
+        return lines
+
+    @staticmethod
+    def _text_diff(delta) -> List[str]:
+        lines = []
+        for line in delta:
+            line = line.strip('\n').strip()
+            if line == '---' or line == '+++':
+                continue
+            color = ''
+            if line.startswith('+'):
+                color = ColorFormatter.green
+            elif line.startswith('-'):
+                color = ColorFormatter.red
+            lines.append(ColorFormatter.colorize('\t' + line, color))
+        return lines
@@ -1,10 +1,11 @@
 import difflib
-from typing import Dict, List, Iterator
+from typing import Dict, List, Optional
 
 from octoploy.api.Kubectl import K8sApi
 from octoploy.k8s.BaseObj import BaseObj
-from octoploy.utils.Log import ColorFormatter
-from octoploy.utils.YmlWriter import YmlWriter
+from octoploy.k8s.ChangeSet import ChangeSet, Change
+from octoploy.k8s.TreeHash import TreeHash
+from octoploy.utils.Log import Log
 
 
 class ValueMask:
@@ -30,16 +31,42 @@ class K8sObjectDiff:
     """
     Creates nice to look at diffs of two yml files.
     This diff ignores any changes injected by k8s itself (e.g. status, timestamps, ..)
+
+    Lists are aligned by the identity of their items (e.g. the name of a container),
+    other lists are aligned by their longest common subsequence.
+    """
+
+    IDENTITY_KEYS = ('name', 'containerPort', 'mountPath', 'devicePath', 'port', 'ip')
+    """
+    Keys which identify list items, the first key that is set (and unique) in all items is used
     """
 
     def __init__(self, k8s: K8sApi):
         self._api = k8s
+        self._tree_hash = TreeHash()
 
-    def print(self, current: BaseObj, new: BaseObj):
+    def print(self, current: BaseObj, new: BaseObj, output_format: str = 'text') -> ChangeSet:
         """
         Prints a diff
         :param current: The current object in the cluster
         :param new: The new object
+        :param output_format: text or json (a single line)
+        :return: The printed changes
+        """
+        change_set = self.diff(current, new)
+        if output_format == 'json':
+            Log.write(change_set.to_json())
+            return change_set
+        for line in change_set.to_text():
+            Log.write(line)
+        return change_set
+
+    def diff(self, current: BaseObj, new: BaseObj) -> ChangeSet:
+        """
+        Compares the given objects
+        :param current: The current object in the cluster
+        :param new: The new object
+        :return: Changes
         """
         mask = ValueMask()
         if current.is_kind('secret') or new.is_kind('secret'):
@@ -48,12 +75,28 @@ class K8sObjectDiff:
         current_data = self._filter_injected(current.data)
 
         # Server side dry-run to get the same format / list sorting
-        new = self._api.dry_run(YmlWriter.dump(new.data))
+        new = self._api.dry_run(new.as_string())
         new_data = self._filter_injected(new.data)
-        self._print_diff(current_data, new_data, [], mask)
+        return self.diff_data(current_data, new_data, mask, name=new.get_fqn())
 
-    def _print_diff(self, current_data: Dict[str, any], new_data: Dict[str, any],
-                    context: List[str], value_mask: ValueMask):
+    def diff_data(self, current_data: Dict[str, any], new_data: Dict[str, any],
+                  value_mask: Optional[ValueMask] = None, name: Optional[str] = None) -> ChangeSet:
+        """
+        Compares the given trees
+        :param current_data: Current tree
+        :param new_data: New tree
+        :param value_mask: Values which should not be contained in the changes
+        :param name: Name of the object
+        :return: Changes
+        """
+        self._tree_hash = TreeHash()
+        change_set = ChangeSet(name)
+        change_set.sections = self._tree_hash.changed_paths(current_data, new_data)
+        self._diff_dict(current_data, new_data, [], value_mask or ValueMask(), change_set.changes)
+        return change_set
+
+    def _diff_dict(self, current_data: Dict[str, any], new_data: Dict[str, any],
+                   context: List[str], value_mask: ValueMask, changes: List[Change]):
         if current_data is None:
             current_data = {}
         if new_data is None:
@@ -65,65 +108,96 @@ class K8sObjectDiff:
         for key in all_keys:
             current_entry = current_data.get(key)
             new_entry = new_data.get(key)
-            self._print_value_diff(current_entry, new_entry, context + [key], value_mask)
+            self._diff_value(current_entry, new_entry, context + [key], value_mask, changes)
 
-    def _print_value_diff(self, current_entry, new_entry, context: List[str], value_mask: ValueMask):
-        mask_value: bool = value_mask.should_mask_value(context)
+    def _diff_value(self, current_entry, new_entry, context: List[str], value_mask: ValueMask,
+                    changes: List[Change]):
+        if self._tree_hash.equal(current_entry, new_entry):
+            # Identical subtree, nothing changed
+            return
         if isinstance(current_entry, list) or isinstance(new_entry, list):
-            if current_entry is None:
-                current_entry = []
-            if new_entry is None:
-                new_entry = []
-
-            count = max(len(current_entry), len(new_entry))
-            for i in range(count):
-                current_val = None
-                new_val = None
-                if i < len(current_entry):
-                    current_val = current_entry[i]
-                if i < len(new_entry):
-                    new_val = new_entry[i]
-                self._print_value_diff(current_val, new_val, context + [f'[{i}]'], value_mask)
+            if not isinstance(current_entry, list):
+                current_entry = [] if current_entry is None else [current_entry]
+            if not isinstance(new_entry, list):
+                new_entry = [] if new_entry is None else [new_entry]
+            self._diff_list(current_entry, new_entry, context, value_mask, changes)
             return
 
         if isinstance(current_entry, dict) or isinstance(new_entry, dict):
-            self._print_diff(current_entry, new_entry, context, value_mask)
+            self._diff_dict(current_entry, new_entry, context, value_mask, changes)
             return
         if current_entry == new_entry:
             return
 
-        if mask_value:
+        if value_mask.should_mask_value(context):
             if current_entry is not None:
                 current_entry = '***'
             if new_entry is not None:
                 new_entry = '***'
 
         if current_entry is None:
-            # The entire tree will be added
-            print(ColorFormatter.colorize(
-                '+ ' + '.'.join(context) + f' = {new_entry}',
-                ColorFormatter.green))
-            return
-        if new_entry is None:
-            # The entire tree will be removed
-            print(ColorFormatter.colorize(
-                '- ' + '.'.join(context) + f' = {current_entry}',
-                ColorFormatter.red))
+            changes.append(Change(Change.ADD, context, new=new_entry))
+        elif new_entry is None:
+            changes.append(Change(Change.REMOVE, context, old=current_entry))
+        else:
+            changes.append(Change(Change.CHANGE, context, old=current_entry, new=new_entry))
+
+    def _diff_list(self, current_entry: list, new_entry: list, context: List[str], value_mask: ValueMask,
+                   changes: List[Change]):
+        """
+        Aligns the items of both lists and compares the aligned items.
+        The paths contain the index of the item in the new list (or the current list for removed items)
+        """
+        key = self._get_identity_key(current_entry, new_entry)
+        if key is not None:
+            new_index = {item[key]: i for i, item in enumerate(new_entry)}
+            current_index = {item[key]: i for i, item in enumerate(current_entry)}
+            for i, item in enumerate(current_entry):
+                if item[key] not in new_index:
+                    self._diff_value(item, None, context + [f'[{i}]'], value_mask, changes)
+            for i, item in enumerate(new_entry):
+                current_i = current_index.get(item[key])
+                current_val = None if current_i is None else current_entry[current_i]
+                self._diff_value(current_val, item, context + [f'[{i}]'], value_mask, changes)
             return
 
-        # If the entry is a multiline string, we create a proper diff
-        if (isinstance(current_entry, str) and isinstance(new_entry, str) and
-                ('\n' in current_entry or '\n' in new_entry)):
-            delta = difflib.unified_diff(current_entry.splitlines(), new_entry.splitlines())
-            print(ColorFormatter.colorize(
-                '~ ' + '.'.join(context) + f':',
-                ColorFormatter.yellow))
-            self._print_text_diff(delta)
-            return
+        digest = self._tree_hash.digest
+        matcher = difflib.SequenceMatcher(None, [digest(x) for x in current_entry],
+                                          [digest(x) for x in new_entry], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            # Replaced items are compared pairwise, the remaining items are added / removed
+            paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+            for offset in range(paired):
+                self._diff_value(current_entry[i1 + offset], new_entry[j1 + offset],
+                                 context + [f'[{j1 + offset}]'], value_mask, changes)
+            for i in range(i1 + paired, i2):
+                self._diff_value(current_entry[i], None, context + [f'[{i}]'], value_mask, changes)
+            for j in range(j1 + paired, j2):
+                self._diff_value(None, new_entry[j], context + [f'[{j}]'], value_mask, changes)
+
+    def _get_identity_key(self, current_entry: list, new_entry: list) -> Optional[str]:
+        """
+        Returns the key which identifies the items of both lists, None if there is none
+        """
+        items = current_entry + new_entry
+        if len(items) == 0 or not all(isinstance(x, dict) for x in items):
+            return None
+        for key in self.IDENTITY_KEYS:
+            if self._is_unique(current_entry, key) and self._is_unique(new_entry, key):
+                return key
+        return None
 
-        print(ColorFormatter.colorize(
-            '~ ' + '.'.join(context) + f' = {current_entry} -> {new_entry}',
-            ColorFormatter.yellow))
+    @staticmethod
+    def _is_unique(items: List[dict], key: str) -> bool:
+        values = set()
+        for item in items:
+            value = item.get(key)
+            if value is None or not isinstance(value, (str, int)) or value in values:
+                return False
+            values.add(value)
+        return True
 
     def _filter_injected(self, data: Dict[str, any]) -> Dict[str, any]:
         """Removes injected fields"""
@@ -143,16 +217,3 @@ class K8sObjectDiff:
     def _del(data: Dict[str, any], key: str):
         if key in data:
             del data[key]
-
-    @staticmethod
-    def _print_text_diff(delta: Iterator[str]):
-        for line in delta:
-            line = line.strip('\n').strip()
-            if line == '---' or line == '+++':
-                continue
-            color = ''
-            if line.startswith('+'):
-                color = ColorFormatter.green
-            elif line.startswith('-'):
-                color = ColorFormatter.red
-            print(ColorFormatter.colorize('\t' + line, color))
@@ -0,0 +1,83 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+
+class TreeHash:
+    """
+    Merkle style hashing of dictionary trees.
+    Every dict/list node gets a digest which is derived from the digests of its children,
+    so two subtrees can be compared in O(1) once their digests are known.
+
+    Digests are cached per node instance, the trees must therefore not be modified
+    while the instance is in use.
+    """
+
+    def __init__(self):
+        self._cache: Dict[int, Tuple[any, bytes]] = {}
+
+    def digest(self, node: any) -> bytes:
+        """
+        Returns the digest of the given node
+        :param node: Dict, list or primitive value
+        :return: Digest
+        """
+        if not isinstance(node, (dict, list)):
+            return self._hash(f'{type(node).__name__}:{node!r}'.encode('utf-8'))
+
+        cached = self._cache.get(id(node))
+        if cached is not None:
+            return cached[1]
+
+        if isinstance(node, dict):
+            parts = [b'd']
+            for key in sorted(node.keys(), key=str):
+                parts.append(repr(key).encode('utf-8'))
+                parts.append(self.digest(node[key]))
+        else:
+            parts = [b'l']
+            parts.extend(self.digest(item) for item in node)
+
+        digest = self._hash(b'\0'.join(parts))
+        # Keep a reference to the node so the id can't be reused while cached
+        self._cache[id(node)] = (node, digest)
+        return digest
+
+    def equal(self, a: any, b: any) -> bool:
+        """
+        Checks if both nodes contain the same data
+        :param a: First node
+        :param b: Second node
+        :return: True if equal
+        """
+        if a is b:
+            return True
+        if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+            return self.digest(a) == self.digest(b)
+        return a == b
+
+    def changed_paths(self, a: Dict[str, any], b: Dict[str, any], depth: int = 2) -> List[str]:
+        """
+        Returns the paths of all sections which differ between both trees.
+        Identical sections are skipped without walking them.
+        :param a: First tree
+        :param b: Second tree
+        :param depth: Maximum depth of the returned paths
+        :return: Paths such as "spec.template" or "data"
+        """
+        paths = []
+        self._changed_paths(a, b, [], depth, paths)
+        return paths
+
+    def _changed_paths(self, a: any, b: any, context: List[str], depth: int, paths: List[str]):
+        if self.equal(a, b):
+            return
+        if len(context) >= depth or not isinstance(a, dict) or not isinstance(b, dict):
+            paths.append('.'.join(context))
+            return
+
+        for key in sorted(set(a.keys()) | set(b.keys()), key=str):
+            self._changed_paths(a.get(key), b.get(key), context + [str(key)], depth, paths)
+
+    @staticmethod
+    def _hash(data: bytes) -> bytes:
+        return hashlib.md5(data).digest()
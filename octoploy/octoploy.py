@@ -1,28 +1,40 @@
 from __future__ import annotations
 
 import argparse
+from typing import TYPE_CHECKING, List, Optional
 
-from octoploy.backup.BackupGenerator import BackupGenerator
-from octoploy.config.Config import RootConfig, RunMode
-from octoploy.converter.HelmToOcto import HelmToOcto
-from octoploy.deploy.AppDeploy import AppDeployment
-from octoploy.processing.DecryptionProcessor import DecryptionProcessor
-from octoploy.state.StateMover import StateMover
-from octoploy.utils.Encryption import YmlEncrypter
 from octoploy.utils.Log import Log
+from octoploy.utils.ParseCache import ParseCache
+
+if TYPE_CHECKING:
+    from octoploy.config.AppConfig import AppConfig
+    from octoploy.config.Config import RootConfig, RunMode
+
+# The subsystems are imported by the command handlers,
+# so simple commands don't pay the import costs of the whole deploy engine
 
 log_instance = Log('octoploy')
 
 
+use_parse_cache = True
+
+
+def _load_root(path: str) -> RootConfig:
+    from octoploy.config.Config import RootConfig
+    if use_parse_cache:
+        ParseCache.enable(path)
+    return RootConfig.load(path)
+
+
 def load_project(config_dir: str) -> RootConfig:
     if config_dir != '':
-        return RootConfig.load(config_dir)
+        return _load_root(config_dir)
 
     # No path specified, try a few common ones
     paths = ['.', 'configs', 'octoploy']
     for path in paths:
         try:
-            return RootConfig.load(path)
+            return _load_root(path)
         except FileNotFoundError:
             continue
     raise FileNotFoundError(f'Did not find config in any of {paths}')
@@ -47,6 +59,7 @@ def reload_config(args):
 
 
 def _run_app_deploy(config_dir: str, app_name: str, mode: RunMode):
+    from octoploy.deploy.AppDeploy import AppDeployment
     root_config = load_project(config_dir)
     root_config.initialize_state(mode)
     app_config = root_config.load_app_config(app_name)
@@ -58,35 +71,64 @@ def _run_app_deploy(config_dir: str, app_name: str, mode: RunMode):
     log_instance.log.info('Done')
 
 
-def _run_apps_deploy(config_dir: str, mode: RunMode):
+def _filter_changed_apps(root_config: RootConfig, configs: List[AppConfig], changed_since: str) -> List[AppConfig]:
+    """
+    Returns the apps affected by the changes since the given git ref.
+    Skipped apps are not touched at all, so their objects and state stay as they are
+    """
+    from octoploy.config.AppDependencies import AppDependencies
+    from octoploy.utils.Git import Git
+    changed_files = Git(root_config.get_config_root()).get_changed_files(changed_since)
+    affected = AppDependencies(root_config).get_affected(configs, changed_files)
+    log_instance.log.info(f'{len(affected)} of {len(configs)} apps changed since {changed_since}')
+    return affected
+
+
+def _run_apps_deploy(config_dir: str, mode: RunMode, changed_since: Optional[str] = None, jobs: int = 1,
+                     app_jobs: int = 1):
+    from octoploy.deploy.AppScheduler import AppScheduler
     root_config = load_project(config_dir)
     root_config.initialize_state(mode)
     configs = root_config.load_app_configs()
+    if changed_since is not None:
+        configs = _filter_changed_apps(root_config, configs, changed_since)
     log_instance.log.debug(f'Found {len(configs)} apps to deploy')
     try:
-        for app_config in configs:
-            AppDeployment(root_config, app_config, mode).deploy()
+        if jobs != 1 and mode.dry_run and mode.has_output():
+            from octoploy.config.AppGraph import AppGraph
+            from octoploy.deploy.ParallelRenderer import ParallelRenderer
+            # Same order as a deployment
+            configs = [x for wave in AppGraph(root_config, configs).get_waves() for x in wave]
+            ParallelRenderer(root_config, mode, jobs=None if jobs <= 0 else jobs).render(configs)
+        else:
+            AppScheduler(root_config, mode, jobs=app_jobs).deploy(configs)
     finally:
         root_config.persist_state(mode)
     log_instance.log.info('Done')
 
 
 def plan_app(args):
+    from octoploy.config.Config import RunMode
     mode = RunMode()
     mode.plan = True
+    mode.diff_format = args.diff_format
     mode.set_override_env(args.env)
     _run_app_deploy(args.config_dir, args.name[0], mode)
 
 
 def deploy_app(args):
+    from octoploy.config.Config import RunMode
     mode = RunMode()
     mode.out_file = args.out_file
+    mode.out_layout = args.out_layout
     mode.dry_run = args.dry_run
+    mode.object_jobs = args.object_jobs
     mode.set_override_env(args.env)
     _run_app_deploy(args.config_dir, args.name[0], mode)
 
 
 def delete_app(args):
+    from octoploy.config.Config import RunMode
     mode = RunMode()
     mode.delete = True
     mode.plan = args.plan
@@ -95,26 +137,58 @@ def delete_app(args):
 
 
 def plan_all(args):
+    from octoploy.config.Config import RunMode
     mode = RunMode()
     mode.plan = True
+    mode.diff_format = args.diff_format
     mode.set_override_env(args.env)
-    _run_apps_deploy(args.config_dir, mode)
+    _run_apps_deploy(args.config_dir, mode, args.changed_since, app_jobs=args.app_jobs)
 
 
 def deploy_all(args):
+    from octoploy.config.Config import RunMode
     mode = RunMode()
     mode.out_file = args.out_file
+    mode.out_layout = args.out_layout
     mode.dry_run = args.dry_run
+    mode.object_jobs = args.object_jobs
     mode.set_override_env(args.env)
-    _run_apps_deploy(args.config_dir, mode)
+    if args.jobs != 1 and not (args.dry_run and args.out_file is not None):
+        log_instance.log.warning('--jobs only applies to --dry-run with --out-file, rendering sequentially')
+    _run_apps_deploy(args.config_dir, mode, args.changed_since, jobs=args.jobs, app_jobs=args.app_jobs)
+
+
+def watch_apps(args):
+    from octoploy.config.Config import RunMode
+    from octoploy.deploy.ConfigWatcher import ConfigWatcher
+    mode = RunMode()
+    mode.set_override_env(args.env)
+    watcher = ConfigWatcher(lambda: load_project(args.config_dir), args.names, mode, interval=args.interval)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        log_instance.log.info('Stopped watching')
+
+
+def serve(args):
+    from octoploy.server.DeployServer import DeployServer
+    from octoploy.server.DeployService import DeployService
+    service = DeployService(lambda: load_project(args.config_dir))
+    server = DeployServer(service, host=args.host, port=args.port, socket_path=args.socket)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        log_instance.log.info('Stopped serving')
 
 
 def create_backup(args):
+    from octoploy.backup.BackupGenerator import BackupGenerator
     root_config = load_project(args.config_dir)
     BackupGenerator(root_config).create_backup(args.name[0])
 
 
 def convert_helm(args):
+    from octoploy.converter.HelmToOcto import HelmToOcto
     dest = args.config_dir
     if dest == '':
         dest = '.'
@@ -126,12 +200,14 @@ def convert_helm(args):
 
 
 def encrypt_secrets(args):
+    from octoploy.utils.Encryption import YmlEncrypter
     files = args.file
     for file in files:
         YmlEncrypter(file).encrypt()
 
 
 def list_state(args):
+    from octoploy.config.Config import RunMode
     root_config = load_project(args.config_dir)
     root_config.initialize_state(RunMode())
 
@@ -140,6 +216,7 @@ def list_state(args):
 
 
 def move_state(args):
+    from octoploy.state.StateMover import StateMover
     source = args.items[0]
     dest = args.items[1]
     target_cm = args.to
@@ -159,6 +236,8 @@ def main():
                         help="Skips all secret objects and therefore doesn't require a key to be set")
     parser.add_argument('--deploy-plain-secrets', dest='deploy_plain_text', action='store_true',
                         help="Deploys plain text secret objects")
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help=f'Disables the parse cache inside the {ParseCache.DIR_NAME} folder of the project')
     parser.add_argument('-c', '--config-dir', dest='config_dir',
                         help='Path to the folder containing all configurations',
                         default='')
@@ -203,16 +282,49 @@ def main():
 
     plan_parser = subparsers.add_parser('plan', help='Verifies what changes have to be applied for a single app')
     plan_parser.add_argument('name', help='Name of the app which should be checked (folder name)', nargs=1)
+    plan_parser.add_argument('--diff-format', dest='diff_format', default='text', choices=['text', 'json'],
+                             help='Format of the changes, json prints one line per changed object')
     plan_parser.set_defaults(func=plan_app)
 
     plan_all_parser = subparsers.add_parser('plan-all',
                                             help='Verifies what changes have to be applied for all apps')
+    plan_all_parser.add_argument('--app-jobs', dest='app_jobs', type=int, default=1,
+                                 help='Number of independent apps which are processed concurrently, '
+                                      '0 for no limit. Apps are ordered by their dependsOn field')
+    plan_all_parser.add_argument('--changed-since', dest='changed_since',
+                                 help='Only plans the apps affected by the changes since the given git ref')
+    plan_all_parser.add_argument('--diff-format', dest='diff_format', default='text', choices=['text', 'json'],
+                                 help='Format of the changes, json prints one line per changed object')
     plan_all_parser.set_defaults(func=plan_all)
 
+    watch_parser = subparsers.add_parser('watch', help='Re-plans the affected apps whenever the configuration changes')
+    watch_parser.add_argument('names', help='Names of the apps which should be watched, all apps if omitted',
+                              nargs='*')
+    watch_parser.add_argument('--interval', dest='interval', type=float, default=0.5,
+                              help='Polling interval in seconds')
+    watch_parser.set_defaults(func=watch_apps)
+
+    serve_parser = subparsers.add_parser('serve', help='Accepts plan/deploy requests via http, '
+                                                       'the project and the cluster objects are kept in memory. '
+                                                       'Plan/deploy requests are executed one after another')
+    serve_parser.add_argument('--host', dest='host', default='127.0.0.1', help='Host to listen on')
+    serve_parser.add_argument('--port', dest='port', type=int, default=8080, help='Port to listen on')
+    serve_parser.add_argument('--socket', dest='socket', help='Listens on the given unix socket instead of a port')
+    serve_parser.set_defaults(func=serve)
+
     deploy_parser = subparsers.add_parser('deploy', help='Deploys the configuration of an application')
     deploy_parser.add_argument('--out-file', dest='out_file',
                                help='Writes all objects into a yml file instead of deploying them. '
                                     'This does not communicate with openshift in any way')
+    deploy_parser.add_argument('--out-layout', dest='out_layout', default='file',
+                               choices=['file', 'app', 'object', 'jsonl'],
+                               help='Layout of the out-file. file: single yml file, '
+                                    'app: directory with one yml file per app, '
+                                    'object: directory with one yml file per object, '
+                                    'jsonl: single file with one json object per line')
+    deploy_parser.add_argument('--object-jobs', dest='object_jobs', type=int, default=1,
+                               help='Number of independent objects of an app which are applied concurrently, '
+                                    '0 for no limit')
     deploy_parser.add_argument('--dry-run', dest='dry_run', help='Does not interact with k8s/openshift '
                                                                  '(pure template processing). '
                                                                  'Can be used in conjunction with out-file to preview '
@@ -226,8 +338,25 @@ def main():
     deploy_all_parser.add_argument('--out-file', dest='out_file',
                                    help='Writes all objects into a yml file instead of deploying them. '
                                         'This does not communicate with openshift in any way')
+    deploy_all_parser.add_argument('--out-layout', dest='out_layout', default='file',
+                                   choices=['file', 'app', 'object', 'jsonl'],
+                                   help='Layout of the out-file. file: single yml file, '
+                                        'app: directory with one yml file per app, '
+                                        'object: directory with one yml file per object, '
+                                        'jsonl: single file with one json object per line')
+    deploy_all_parser.add_argument('--object-jobs', dest='object_jobs', type=int, default=1,
+                                   help='Number of independent objects of an app which are applied concurrently, '
+                                        '0 for no limit')
     deploy_all_parser.add_argument('--dry-run', dest='dry_run', help='Does not interact with openshift',
                                    action='store_true')
+    deploy_all_parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                                   help='Number of processes rendering the apps in parallel, 0 uses all cores. '
+                                        'Only applies to --dry-run with --out-file')
+    deploy_all_parser.add_argument('--app-jobs', dest='app_jobs', type=int, default=1,
+                                   help='Number of independent apps which are processed concurrently, '
+                                        '0 for no limit. Apps are ordered by their dependsOn field')
+    deploy_all_parser.add_argument('--changed-since', dest='changed_since',
+                                   help='Only deploys the apps affected by the changes since the given git ref')
     deploy_all_parser.set_defaults(func=deploy_all)
 
     delete_parser = subparsers.add_parser('delete', help='Deletes the configuration of an application')
@@ -250,6 +379,9 @@ def main():
     if args.debug:
         Log.set_debug()
 
+    global use_parse_cache
+    use_parse_cache = not args.no_cache
+    from octoploy.processing.DecryptionProcessor import DecryptionProcessor
     DecryptionProcessor.skip_secrets = args.skip_secrets
     DecryptionProcessor.deploy_plain_text = args.deploy_plain_text
     args.func(args)
@@ -1,9 +1,9 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from octoploy.k8s.BaseObj import BaseObj
 
 from octoploy.k8s.SecretObj import SecretObj
-from octoploy.processing.TreeWalker import TreeProcessor, TreeWalker
+from octoploy.processing.TreeWalker import TreeProcessor
 from octoploy.utils import Utils
 from octoploy.utils.Encryption import Encryption
 from octoploy.utils.Errors import SkipObject
@@ -32,14 +32,23 @@ class DecryptionProcessor(TreeProcessor, Log):
         super().__init__(__name__)
         self.encryption = Encryption()
 
-    def process(self, k8s_object: BaseObj):
+    value_prefixes = (Encryption.CRYPT_PREFIX,)
+
+    def begin(self, k8s_object: BaseObj):
         try:
             self._secret_obj = SecretObj(k8s_object.data)
         except ValueError:
             self._secret_obj = None
 
-        walker = TreeWalker(self)
-        walker.walk(k8s_object.data)
+    def get_markers(self) -> Optional[Tuple[str, ...]]:
+        if self._secret_obj is not None:
+            # All values of secrets need to be checked
+            return None
+        return super().get_markers()
+
+    def wants_str(self, value: str, key: str) -> bool:
+        # Secrets are checked for plain text values as well
+        return self._secret_obj is not None or super().wants_str(value, key)
 
     def process_str(self, value: str, parent: Dict[str, any], key: str) -> str:
         if not value.startswith(Encryption.CRYPT_PREFIX):
@@ -1,16 +1,71 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
-from octoploy.api.Model import DeploymentConfig, NamedItem
+from octoploy.api.Model import DeploymentConfig
 from octoploy.k8s.BaseObj import BaseObj
 from octoploy.utils.Log import Log
 
 
+class ListMergeKey:
+    """
+    Identifies the items of a list by the value of a key (e.g. env vars by "name"),
+    items with the same key are merged instead of appended
+    """
+
+    __slots__ = ('key', 'item_schema', 'extra_keys')
+
+    def __init__(self, key: str, item_schema: Optional[Dict[str, any]] = None,
+                 extra_keys: Optional[Dict[str, any]] = None):
+        """
+        :param key: Field identifying the items, items without the field are never merged
+        :param item_schema: Merge schema of the items
+        :param extra_keys: Additional fields identifying the items, with the values used if the field is missing
+        """
+        self.key = key
+        self.item_schema = item_schema or {}
+        self.extra_keys = extra_keys or {}
+
+    def get(self, item: any) -> Optional[Tuple]:
+        """
+        Returns the key of the given list item
+        :param item: List item
+        :return: Key, None if the item can't be identified
+        """
+        if not isinstance(item, dict) or item.get(self.key) is None:
+            return None
+        return (item[self.key],) + tuple(item.get(name, default) for name, default in self.extra_keys.items())
+
+
+_CONTAINER_SCHEMA = {
+    'env': ListMergeKey('name'),
+    # The same port can be used by TCP and UDP
+    'ports': ListMergeKey('containerPort', extra_keys={'protocol': 'TCP'}),
+    'volumeMounts': ListMergeKey('mountPath'),
+    'volumeDevices': ListMergeKey('devicePath'),
+}
+
+_POD_SPEC_SCHEMA = {
+    'containers': ListMergeKey('name', _CONTAINER_SCHEMA),
+    'initContainers': ListMergeKey('name', _CONTAINER_SCHEMA),
+    'ephemeralContainers': ListMergeKey('name', _CONTAINER_SCHEMA),
+    'volumes': ListMergeKey('name'),
+    'imagePullSecrets': ListMergeKey('name'),
+    'hostAliases': ListMergeKey('ip'),
+}
+
+
 class K8sObjectMerge(Log):
     """
     Merges kubernetes objects
     """
     NAME_PATH = 'metadata.name'
 
+    MERGE_SCHEMA = {
+        'spec': {'template': {'spec': _POD_SPEC_SCHEMA}},
+    }
+    """
+    Lists which are merged by a key (similar to strategic merge patches), all other lists are concatenated
+    """
+
     def __init__(self):
         super().__init__()
         self._existing_dc = None  # type: DeploymentConfig
@@ -28,9 +83,11 @@ class K8sObjectMerge(Log):
 
         if existing.is_kind('DeploymentConfig') or existing.is_kind('Deployment'):
             self._merge_dc(DeploymentConfig(existing), DeploymentConfig(to_add))
+            existing.refresh()
             return True
 
         self.log.warning('Don\'t know how to merge ' + existing.kind)
+        return False
 
     def _merge_dc(self, existing: DeploymentConfig, to_add: DeploymentConfig):
         """
@@ -47,34 +104,30 @@ class K8sObjectMerge(Log):
                 and existing.get_template_name() != to_add_template_name:
             return
 
-        # Containers and volumes need special treatment
-        self._merge_object(existing.data, to_add.data, {
-            'spec': {'template': {'spec': {
-                'containers': True,
-                'volumes': True
-            }}}})
-
-        self._merge_named_item(existing.get_containers(), to_add.get_containers(), existing.add_container)
-        self._merge_named_item(existing.get_volumes(), to_add.get_volumes(), existing.add_volume)
+        self._merge_object(existing.data, to_add.data, self.MERGE_SCHEMA)
 
-    def _merge_object(self, existing: dict, new_data: dict, ignore_keys: Dict[str, any]):
+    def _merge_object(self, existing: dict, new_data: dict, schema: Dict[str, any]):
         """
         Merges the given dict
         :param existing: Dict where the data should be merged to
         :param new_data: New data
+        :param schema: Merge keys of the lists inside the dict, see MERGE_SCHEMA
         """
         for key, item in new_data.items():
-            if ignore_keys.get(key, False) is True:
-                continue
             if key not in existing:
                 existing[key] = item
                 continue
             parent_item = existing[key]
-            if isinstance(item, list):
-                parent_item.extend(item)
+            if isinstance(item, list) and isinstance(parent_item, list):
+                merge_key = schema.get(key)
+                if isinstance(merge_key, ListMergeKey):
+                    self._merge_list(parent_item, item, merge_key)
+                else:
+                    parent_item.extend(item)
                 continue
-            if isinstance(item, dict):
-                self._merge_object(parent_item, item, ignore_keys.get(key, {}))
+            if isinstance(item, dict) and isinstance(parent_item, dict):
+                sub_schema = schema.get(key)
+                self._merge_object(parent_item, item, sub_schema if isinstance(sub_schema, dict) else {})
                 continue
             if item == parent_item:
                 continue
@@ -83,18 +136,25 @@ class K8sObjectMerge(Log):
             self.log.warning(f'Value conflict: {item} (from {self._new_dc.get_template_name()}) replaces ' + \
                              f'{parent_item} (from {self._existing_dc.get_template_name()})')
 
-    def _merge_named_item(self, existing_items: Dict[str, NamedItem], new_item: Dict[str, NamedItem], add_func_call):
+    def _merge_list(self, existing: list, new_items: list, merge_key: ListMergeKey):
         """
-        Merges a named item object
-        :param existing_items: Parent items, mapped to their name
-        :param new_item: New items, mapped to their name
-        :param add_func_call: Function call for adding an item to the parent
+        Merges the items with the same key, other items are appended
+        :param existing: List where the items should be merged to
+        :param new_items: New items
+        :param merge_key: Key identifying the items
         """
-        for name, new_container in new_item.items():
-            if name in existing_items:
-                # Merge data
-                self._merge_object(existing_items[name].data, new_container.data, {})
-                continue
+        index = {}
+        for item in existing:
+            key = merge_key.get(item)
+            if key is not None:
+                index.setdefault(key, item)
 
-            # Additional item
-            add_func_call(new_container)
+        for item in new_items:
+            key = merge_key.get(item)
+            match = index.get(key) if key is not None else None
+            if match is None:
+                existing.append(item)
+                if key is not None:
+                    index[key] = item
+                continue
+            self._merge_object(match, item, merge_key.item_schema)
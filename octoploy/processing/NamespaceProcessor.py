@@ -15,9 +15,12 @@ class NamespaceProcessor(TreeProcessor):
     def __init__(self, root: RootConfig):
         self._root = root
 
-    def process(self, k8s_object: BaseObj):
+    def begin(self, k8s_object: BaseObj):
         self._update_namespace(k8s_object)
 
+    def walks_tree(self) -> bool:
+        return False
+
     def _update_namespace(self, k8s_object: BaseObj):
         """
         Updates the namespace meta-data of this object.
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from octoploy.processing.TemplateString import TemplateString
+from octoploy.utils.DictUtils import DictUtils
+
+
+class TemplatePlan:
+    """
+    Partially evaluated yml document.
+    Everything which doesn't reference a variable is evaluated once when compiling the plan,
+    rendering only fills the remaining holes. Renders are memoized by the values of the referenced variables,
+    so a template used by many apps is only rendered once per distinct set of values.
+    """
+
+    MERGE_KEY: str = '_merge'
+    MAX_RENDERS: int = 256
+
+    skeleton: any
+    """
+    Document with all static strings evaluated, must not be modified
+    """
+
+    holes: Optional[List[Tuple[Tuple[any, ...], TemplateString]]]
+    """
+    Paths of all strings which reference variables (in walking order) with their compiled template.
+    None if the document can't be rendered by the plan (e.g. since it uses merge keys)
+    """
+
+    var_names: Tuple[str, ...]
+    """
+    Names of all referenced variables
+    """
+
+    def __init__(self, skeleton: any, holes: Optional[List[Tuple[Tuple[any, ...], TemplateString]]]):
+        self.skeleton = skeleton
+        self.holes = holes
+        self._renders: Dict[str, Tuple[any, List[str]]] = {}
+        # Plans are shared between apps which might be rendered concurrently
+        self._lock = threading.Lock()
+
+        var_names = []
+        for _, template in holes or []:
+            var_names.extend(template.var_names)
+        self.var_names = tuple(dict.fromkeys(var_names))
+
+    @staticmethod
+    def compile(data: any) -> TemplatePlan:
+        """
+        Compiles the given document
+        :param data: Parsed document, won't be modified
+        :return: Plan
+        """
+        if TemplatePlan._uses_merge(data):
+            # Merging modifies the structure of the document
+            return TemplatePlan(data, None)
+        holes = []
+        skeleton = TemplatePlan._compile(data, (), holes)
+        return TemplatePlan(skeleton, holes)
+
+    @staticmethod
+    def _compile(data: any, path: Tuple[any, ...], holes: List[Tuple[Tuple[any, ...], TemplateString]]) -> any:
+        if isinstance(data, dict):
+            return {key: TemplatePlan._compile(value, path + (key,), holes) for key, value in data.items()}
+        if isinstance(data, list):
+            return [TemplatePlan._compile(value, path + (idx,), holes) for idx, value in enumerate(data)]
+        if not isinstance(data, str) or not TemplateString.has_vars(data):
+            return data
+
+        template = TemplateString.compile(data)
+        if len(template.var_names) == 0:
+            # Only escape sequences, can be evaluated right away
+            return template.render({}, [])
+        holes.append((path, template))
+        return data
+
+    @staticmethod
+    def _uses_merge(data: any) -> bool:
+        if isinstance(data, dict):
+            if TemplatePlan.MERGE_KEY in data:
+                return True
+            return any(TemplatePlan._uses_merge(value) for value in data.values())
+        if isinstance(data, list):
+            return any(TemplatePlan._uses_merge(value) for value in data)
+        return False
+
+    def render(self, replacements: Mapping[str, any], missing_vars: List[str]) -> any:
+        """
+        Renders the document
+        :param replacements: Variable values
+        :param missing_vars: Receives the names of all referenced variables without value
+        :return: Rendered document, can be modified by the caller
+        """
+        if self.holes is None:
+            raise ValueError('Document can not be rendered by a plan')
+
+        values = [replacements.get(name) for name in self.var_names]
+        key = repr(values)
+        with self._lock:
+            cached = self._renders.get(key)
+        if cached is None:
+            render_missing = []
+            data = DictUtils.copy_tree(self.skeleton)
+            for path, template in self.holes:
+                value = template.render(replacements, render_missing)
+                if len(path) == 0:
+                    data = value
+                    continue
+                self._set(data, path, value)
+            cached = (data, render_missing)
+
+            with self._lock:
+                if key not in self._renders and len(self._renders) >= self.MAX_RENDERS:
+                    del self._renders[next(iter(self._renders))]
+                self._renders[key] = cached
+
+        missing_vars.extend(cached[1])
+        return DictUtils.copy_tree(cached[0])
+
+    @staticmethod
+    def _set(data: any, path: Tuple[any, ...], value: any):
+        for part in path[:-1]:
+            data = data[part]
+        data[path[-1]] = value
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Mapping, Optional, Tuple
+
+
+class TemplateString:
+    """
+    Compiled representation of a string which may contain variable references.
+    The syntax is "${KEY}" for a variable and "$$" for an escaped "$".
+    """
+
+    LITERAL = 0
+    VAR = 1
+
+    __slots__ = ('tokens', 'single_var', 'var_names')
+
+    tokens: Tuple[Tuple[int, str], ...]
+    """
+    Literal and variable tokens in the order of appearance
+    """
+
+    single_var: Optional[str]
+    """
+    Name of the variable if the string consists of exactly one variable reference
+    """
+
+    var_names: Tuple[str, ...]
+    """
+    Names of all referenced variables
+    """
+
+    def __init__(self, tokens: List[Tuple[int, str]]):
+        self.tokens = tuple(tokens)
+        self.var_names = tuple(value for kind, value in tokens if kind == self.VAR)
+        self.single_var = None
+        if len(tokens) == 1 and tokens[0][0] == self.VAR:
+            self.single_var = tokens[0][1]
+
+    @staticmethod
+    def has_vars(item: str) -> bool:
+        """
+        Fast check if the given string might contain variables or escape sequences
+        """
+        return '$' in item
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def compile(item: str) -> TemplateString:
+        """
+        Compiles the given string into literal and variable tokens
+        :param item: String
+        :return: Compiled string (cached by the source string)
+        """
+        tokens = []
+        literal = []
+
+        def flush():
+            text = ''.join(literal)
+            if text != '':
+                tokens.append((TemplateString.LITERAL, text))
+            literal.clear()
+
+        pos = 0
+        length = len(item)
+        while pos < length:
+            idx = item.find('$', pos)
+            if idx < 0:
+                literal.append(item[pos:])
+                break
+            literal.append(item[pos:idx])
+
+            next_char = item[idx + 1:idx + 2]
+            if next_char == '':
+                # Ended with a $
+                literal.append('$')
+                break
+            if next_char == '$':
+                # Escaped $
+                literal.append('$')
+                pos = idx + 2
+                continue
+            if next_char != '{':
+                # Not a variable tag, just keep the $ and the current char
+                literal.append('$' + next_char)
+                pos = idx + 2
+                continue
+
+            end = item.find('}', idx + 2)
+            if end < 0:
+                # Unterminated variable tag
+                literal.append(item[idx:])
+                break
+            flush()
+            tokens.append((TemplateString.VAR, item[idx + 2:end]))
+            pos = end + 1
+
+        flush()
+        return TemplateString(tokens)
+
+    def render(self, replacements: Mapping[str, any], missing_vars: List[str]) -> any:
+        """
+        Replaces all variables with the given values
+        :param replacements: Variable values
+        :param missing_vars: Receives the names of all variables without value
+        :return: The new value. Might be a non string value if the string only refers to a single variable
+        """
+        if self.single_var is not None:
+            # The value can be an "object" as well, which can only be replaced
+            # if the string only refers to this variable
+            new_val = replacements.get(self.single_var)
+            if new_val is None:
+                missing_vars.append(self.single_var)
+                return '${' + self.single_var + '}'
+            return new_val
+
+        parts = []
+        for kind, value in self.tokens:
+            if kind == self.LITERAL:
+                parts.append(value)
+                continue
+
+            new_val = replacements.get(value)
+            if new_val is None:
+                missing_vars.append(value)
+                parts.append('${' + value + '}')
+                continue
+            if not isinstance(new_val, str):
+                raise ValueError(f'Invalid replacement for {value}: Expected string, got {new_val}.\n'
+                                 f'Non string replacements are only possible for single variable references.')
+            parts.append(new_val)
+        return ''.join(parts)
@@ -1,20 +1,67 @@
-from abc import abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Optional, List, Union, Tuple, FrozenSet
 
 from octoploy.k8s.BaseObj import BaseObj
 
 
 class TreeProcessor:
-    @abstractmethod
+    value_prefixes: Optional[Tuple[str, ...]] = None
+    """
+    Only string leafs starting with one of these prefixes are passed to process_str().
+    None if all strings should be processed
+    """
+
+    structural_keys: FrozenSet[str] = frozenset()
+    """
+    Keys for which the processor might modify the parent of the value (e.g. by removing the key)
+    """
+
     def process(self, k8s_object: BaseObj):
         """
         Processes the tree
 
+        :param k8s_object: K8s object
+        :raises: SkipObject: The object should be skipped
+        """
+        TreeWalker(self).process(k8s_object)
+
+    def begin(self, k8s_object: BaseObj):
+        """
+        Gets called before the tree of the given object is walked
         :param k8s_object: K8s object
         :raises: SkipObject: The object should be skipped
         """
         pass
 
+    def end(self, k8s_object: BaseObj):
+        """
+        Gets called after the tree of the given object has been walked
+        :param k8s_object: K8s object
+        """
+        pass
+
+    def get_markers(self) -> Optional[Tuple[str, ...]]:
+        """
+        Returns substrings of which at least one is contained in every key or string
+        the processor would modify. Subtrees without any of them are skipped.
+        Gets called after begin()
+        :return: Markers or None if every node has to be visited
+        """
+        return self.value_prefixes
+
+    def walks_tree(self) -> bool:
+        """
+        Indicates if the processor needs to visit the nodes of the tree
+        """
+        return True
+
+    def wants_str(self, value: str, key: str) -> bool:
+        """
+        Indicates if the given string leaf should be passed to process_str()
+        :param value: Value
+        :param key: Key of the value
+        """
+        return self.value_prefixes is None or value.startswith(self.value_prefixes)
+
     def process_object(self, data: Dict[str, any], parent: Dict[str, any], key: str) -> Optional[Dict[str, any]]:
         """
        Processes a node of the tree
@@ -38,36 +85,134 @@ class TreeProcessor:
 
 class TreeWalker:
     """
-    Walks through dictionary trees
+    Walks through dictionary trees and applies a chain of processors in a single traversal.
+    Every node is passed to the processors in the order of the chain.
     """
 
-    def __init__(self, processor: TreeProcessor):
-        self.processor = processor
+    def __init__(self, processors: Union[TreeProcessor, List[TreeProcessor]]):
+        if isinstance(processors, TreeProcessor):
+            processors = [processors]
+        self.processors = processors
+        self._walking_processors = [x for x in processors if x.walks_tree()]
+        self._structural_keys = frozenset().union(*[x.structural_keys for x in self._walking_processors])
+
+    def process(self, k8s_object: BaseObj):
+        """
+        Applies all processors to the given object
+        :param k8s_object: K8s object, will be modified in place
+        :raises: SkipObject: The object should be skipped
+        """
+        for processor in self.processors:
+            processor.begin(k8s_object)
+        if len(self._walking_processors) > 0:
+            try:
+                self.walk(k8s_object.data, self._get_markers())
+            finally:
+                k8s_object.refresh()
+        for processor in self.processors:
+            processor.end(k8s_object)
+
+    def walk(self, data: Dict[str, any], markers: Optional[Tuple[str, ...]] = None):
+        """
+        Walks through the given tree
+        :param data: Tree, will be modified in place
+        :param markers: Markers of the processors, subtrees and strings without any of them are skipped.
+        None if every node should be visited
+        """
+        # Each frame holds the iterator of a dict or list, the dict (and key) which holds the value,
+        # the index of the first processor which should be applied and the depth
+        stack = [(data, self._iter_dict(data), data, None, 0, 0)]
+        while len(stack) > 0:
+            container, items, parent, parent_key, start, depth = stack[-1]
+            entry = next(items, None)
+            if entry is None:
+                stack.pop()
+                continue
 
-    def walk(self, data: Dict[str, any]):
-        self._walk(data)
+            index, value = entry
+            if isinstance(container, dict):
+                parent = container
+                parent_key = index
+            if markers is not None and isinstance(value, str) and not self._str_contains_markers(value, parent_key,
+                                                                                                 markers):
+                continue
+            new_val, new_start = self._process_value(value, parent, parent_key, start)
+            if new_val is None and isinstance(container, dict):
+                # Parent should not be updated
+                continue
+            if new_val is not value:
+                container[index] = new_val
 
-    def _walk(self, data: Dict[str, any]):
-        for key in list(data.keys()):
-            value = data[key]
-            new_val = self._process_item(value, data, key)
-            if new_val is None:
+            if not isinstance(new_val, (dict, list)):
+                continue
+            if markers is not None and depth == 0 and not self._contains_markers(new_val, markers):
+                # Only the direct children of the root are scanned, so every node is scanned at most once
                 continue
-            data[key] = new_val
+            if isinstance(new_val, dict):
+                stack.append((new_val, self._iter_dict(new_val), new_val, None, new_start, depth + 1))
+            else:
+                stack.append((new_val, enumerate(new_val), parent, parent_key, new_start, depth + 1))
+
+    def _get_markers(self) -> Optional[Tuple[str, ...]]:
+        markers = []
+        for processor in self._walking_processors:
+            processor_markers = processor.get_markers()
+            if processor_markers is None:
+                return None
+            markers.extend(processor_markers)
+        return tuple(markers)
+
+    @staticmethod
+    def _str_contains_markers(value: str, key: any, markers: Tuple[str, ...]) -> bool:
+        for marker in markers:
+            if marker in value or (isinstance(key, str) and marker in key):
+                return True
+        return False
+
+    @staticmethod
+    def _contains_markers(node: any, markers: Tuple[str, ...]) -> bool:
+        """
+        Checks if any key or string inside the given subtree might contain one of the markers.
+        The check is done on the repr of the tree which is way faster than walking it,
+        but might return false positives.
+        """
+        text = repr(node)
+        for marker in markers:
+            if marker in text:
+                return True
+        return False
 
-    def _process_item(self, value, data, key) -> any:
-        if isinstance(value, list):
-            for idx, list_item in enumerate(value):
-                value[idx] = self._process_item(list_item, data, key)
-            return value
+    def _iter_dict(self, data: Dict[str, any]):
+        keys = data
+        if not self._structural_keys.isdisjoint(data.keys()):
+            # The processors might modify the dict while iterating
+            keys = list(data.keys())
+        for key in keys:
+            if key in data:
+                yield key, data[key]
 
+    def _process_value(self, value: any, parent: Dict[str, any], key: str, start: int) -> Tuple[any, int]:
+        """
+        Applies the processors to the given value
+        :return: New value and the index of the first processor which should be applied to its children
+        """
+        processors = self._walking_processors
         if isinstance(value, str):
-            return self.processor.process_str(value, data, key)
+            for idx in range(start, len(processors)):
+                processor = processors[idx]
+                if not processor.wants_str(value, key):
+                    continue
+                value = processor.process_str(value, parent, key)
+                if value is None:
+                    return None, len(processors)
+                if not isinstance(value, str):
+                    # Replaced by an object, only the following processors should see it
+                    return self._process_value(value, parent, key, idx + 1)
+            return value, len(processors)
 
         if isinstance(value, dict):
-            new_val = self.processor.process_object(value, data, key)
-            if new_val is None:
-                return None
-            self._walk(new_val)
-            return new_val
-        return value
+            for idx in range(start, len(processors)):
+                value = processors[idx].process_object(value, parent, key)
+                if value is None:
+                    return None, len(processors)
+        return value, start
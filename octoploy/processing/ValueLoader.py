@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import base64
+import copy
 import os
 from abc import abstractmethod
-from typing import Dict
+from typing import Dict, Tuple, List, Optional, Mapping
 from typing import TYPE_CHECKING
 
 import yaml
@@ -22,6 +23,24 @@ class ValueLoader:
     def load(self, data: Dict) -> Dict[str, any]:
         pass
 
+    @abstractmethod
+    def get_keys(self, data: Dict) -> Optional[List[str]]:
+        """
+        Returns the keys of the values that will be returned by load() without loading them
+        :param data: Loader options
+        :return: Keys, None if the keys are looked up on demand via has_key()
+        """
+        pass
+
+    def has_key(self, data: Dict, key: str) -> bool:
+        """
+        Checks if load() would return a value for the given key
+        :param data: Loader options
+        :param key: Key
+        """
+        keys = self.get_keys(data)
+        return keys is not None and key in keys
+
     def _resolve_path(self, path: str) -> str:
         if os.path.isabs(path):
             return path
@@ -29,15 +48,59 @@ class ValueLoader:
 
 
 class EnvLoader(ValueLoader):
+    """
+    Provides the environment variables, only the referenced variables are looked up
+    """
+
+    def load(self, data: Dict) -> Mapping[str, str]:
+        return os.environ
+
+    def get_keys(self, data: Dict) -> Optional[List[str]]:
+        return None
+
+    def has_key(self, data: Dict, key: str) -> bool:
+        return key in os.environ
+
+
+class CachedFileLoader(ValueLoader):
+    """
+    Loads values from a single file.
+    The results are cached for the lifetime of the process and shared between all configs,
+    the cache key consists of the resolved path, mtime, size and the loader options.
+    """
 
-    def load(self, data: Dict) -> Dict[str, str]:
-        return dict(os.environ)
+    _cache: Dict[Tuple, Dict[str, any]] = {}
+
+    def load(self, data: Dict) -> Dict[str, any]:
+        file = os.path.realpath(self._resolve_path(data['file']))
+        stat = os.stat(file)
+        options = repr(sorted((key, value) for key, value in data.items() if key != 'file'))
+        key = (self.__class__.__name__, file, stat.st_mtime_ns, stat.st_size, options)
+
+        values = CachedFileLoader._cache.get(key)
+        if values is None:
+            values = self._load_file(file, data)
+            CachedFileLoader._cache[key] = values
+        # The values might be modified by the caller
+        return copy.deepcopy(values)
+
+    @abstractmethod
+    def _load_file(self, file: str, data: Dict) -> Dict[str, any]:
+        """
+        Loads the values of the given file
+        :param file: Absolute path to the file
+        :param data: Loader options
+        :return: Values
+        """
+        pass
 
 
-class FileLoader(ValueLoader):
+class FileLoader(CachedFileLoader):
 
-    def load(self, data: Dict) -> Dict[str, str]:
-        file = self._resolve_path(data['file'])
+    def get_keys(self, data: Dict) -> List[str]:
+        return ['']
+
+    def _load_file(self, file: str, data: Dict) -> Dict[str, any]:
         encoding = data.get('encoding', 'utf-8')
         conversion = data.get('conversion')
 
@@ -55,11 +118,13 @@ class FileLoader(ValueLoader):
         return {'': content.decode(encoding)}
 
 
-class PemLoader(ValueLoader):
+class PemLoader(CachedFileLoader):
+
+    def get_keys(self, data: Dict) -> List[str]:
+        return ['_PUBLIC', '_KEY', '_CACERT']
 
-    def load(self, data: Dict) -> Dict[str, str]:
-        file = self._resolve_path(data['file'])
-        cert = Cert(self._config.get_file(file))
+    def _load_file(self, file: str, data: Dict) -> Dict[str, any]:
+        cert = Cert(file)
         return {
             '_PUBLIC': cert.cert,
             '_KEY': cert.key,
@@ -67,6 +132,91 @@ class PemLoader(ValueLoader):
         }
 
 
+class LazyLoad:
+    """
+    Runs a loader once the first of its values is requested
+    """
+
+    def __init__(self, loader: ValueLoader, data: Dict):
+        self._loader = loader
+        self._data = data
+        self._values = None  # type: Optional[Dict[str, any]]
+
+    def get(self, key: str) -> any:
+        if self._values is None:
+            self._values = self._loader.load(self._data)
+        return self._values.get(key)
+
+    def has(self, key: str) -> bool:
+        """
+        Checks if the loader provides the given key, without loading the values
+        """
+        return self._loader.has_key(self._data, key)
+
+
+class LazyValue:
+    """
+    Placeholder for a loader backed variable.
+    The value is only loaded once it's referenced.
+    """
+    __slots__ = ('_load', '_key')
+
+    def __init__(self, load: LazyLoad, key: str):
+        self._load = load
+        self._key = key
+
+    def get(self) -> any:
+        return self._load.get(self._key)
+
+
+class LoaderScope(dict):
+    """
+    Variables of a config. Loaders which can't list their keys up front (e.g. env) are registered with
+    a prefix, their variables are only looked up once they are referenced.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefixes: List[Tuple[str, LazyLoad]] = []
+
+    def add_prefix(self, prefix: str, load: LazyLoad):
+        """
+        Provides the values of the given loader as prefix + key
+        :param prefix: Prefix of the variable names
+        :param load: Loader
+        """
+        self._prefixes.append((prefix, load))
+
+    def update(self, other=(), **kwargs):
+        if isinstance(other, LoaderScope):
+            for entry in other._prefixes:
+                if entry not in self._prefixes:
+                    self._prefixes.append(entry)
+        super().update(other, **kwargs)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key) -> bool:
+        return super().__contains__(key) or self._lookup(key) is not None
+
+    def __missing__(self, key):
+        value = self._lookup(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _lookup(self, key) -> Optional[LazyValue]:
+        if not isinstance(key, str):
+            return None
+        for prefix, load in self._prefixes:
+            if key.startswith(prefix) and load.has(key[len(prefix):]):
+                return LazyValue(load, key[len(prefix):])
+        return None
+
+
 class ValueLoaderFactory:
 
     @staticmethod
@@ -0,0 +1,171 @@
+from typing import Dict, List, Iterator, Mapping
+
+from octoploy.processing.TemplateString import TemplateString
+from octoploy.processing.ValueLoader import LazyValue
+from octoploy.utils.Errors import ConfigError
+
+
+class VarResolver(Mapping):
+    """
+    Resolves references between variables and provides the resolved values.
+    Variables are evaluated in topological order of their references, so every variable is only
+    evaluated once. Loader backed variables are only loaded and resolved once they are referenced.
+    A variable which consists only of a reference to itself (A: ${A}) is kept as it is.
+    """
+
+    def __init__(self, scope: Mapping[str, any], missing_vars: List[str]):
+        """
+        :param scope: Unresolved variables, won't be modified
+        :param missing_vars: Receives the names of all variables without value which are referenced
+        by variables that are not loader backed
+        """
+        self._scope = scope
+        self._missing_vars = missing_vars
+        self._resolved = {}  # type: Dict[str, any]
+        self._in_progress = []  # type: List[str]
+        self._lazy_missing = {}  # type: Dict[str, List[str]]
+        """
+        Missing variables referenced by the resolved loader backed variables
+        """
+        self._collectors = [missing_vars]  # type: List[List[str]]
+
+    def track_missing(self, missing_vars: List[str]):
+        """
+        Sets the list which receives the missing variables referenced by the loader backed variables
+        used from now on, e.g. while rendering a single object
+        :param missing_vars: Missing variables
+        """
+        self._collectors = [missing_vars]
+
+    def resolve(self):
+        """
+        Resolves all variables which are not loader backed
+        :raise ConfigError: Gets raised if the variables contain a reference cycle
+        """
+        deps = {}
+        for key, value in self._scope.items():
+            if isinstance(value, LazyValue):
+                continue
+            deps[key] = [] if self._is_self_reference(key, value) else self._get_deps(value)
+
+        for key in self._sort(deps):
+            self._get(key)
+
+    def __getitem__(self, key: str) -> any:
+        return self._get(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resolved or key in self._scope
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._scope)
+
+    def __len__(self) -> int:
+        return len(self._scope)
+
+    def _get(self, key: str) -> any:
+        if key in self._resolved:
+            self._report_missing(key)
+            return self._resolved[key]
+
+        value = self._scope[key]
+        if key in self._in_progress:
+            chain = self._in_progress[self._in_progress.index(key):] + [key]
+            raise ConfigError('Cyclic variable reference: ' + ' -> '.join(chain))
+
+        self._in_progress.append(key)
+        try:
+            if isinstance(value, LazyValue):
+                # Resolved on demand, the missing variables are reported to every user of the value
+                missing = []
+                self._collectors.append(missing)
+                try:
+                    value = self._resolve_value(key, value.get())
+                finally:
+                    self._collectors.pop()
+                self._lazy_missing[key] = missing
+            else:
+                value = self._resolve_value(key, value)
+        finally:
+            self._in_progress.pop()
+        self._resolved[key] = value
+        self._report_missing(key)
+        return value
+
+    def _report_missing(self, key: str):
+        missing = self._lazy_missing.get(key)
+        if missing is not None:
+            self._collectors[-1].extend(missing)
+
+    @staticmethod
+    def _is_self_reference(key: str, value: any) -> bool:
+        return isinstance(value, str) and TemplateString.has_vars(value) and \
+            TemplateString.compile(value).single_var == key
+
+    def _get_deps(self, value: any) -> List[str]:
+        """
+        Returns the names of all variables (which are not loader backed) referenced by the given value
+        """
+        deps = []
+        for var_name in self._iter_var_names(value):
+            if not isinstance(self._scope.get(var_name), (type(None), LazyValue)):
+                deps.append(var_name)
+        return deps
+
+    def _iter_var_names(self, value: any) -> Iterator[str]:
+        if isinstance(value, dict):
+            # A replacement might be an object
+            # So every item might refer to another variable
+            for item in value.values():
+                yield from self._iter_var_names(item)
+            return
+        if isinstance(value, str) and TemplateString.has_vars(value):
+            yield from TemplateString.compile(value).var_names
+
+    @staticmethod
+    def _sort(deps: Dict[str, List[str]]) -> List[str]:
+        """
+        Sorts the variables so that every variable comes after its references
+        :param deps: Variable names mapped to the names they reference
+        :return: Variable names
+        """
+        order = []
+        state = {}  # 1 = in progress, 2 = done
+        for root in deps:
+            if root in state:
+                continue
+            state[root] = 1
+            path = [root]
+            stack = [iter(deps[root])]
+            while len(stack) > 0:
+                child = next(stack[-1], None)
+                if child is None:
+                    key = path.pop()
+                    stack.pop()
+                    state[key] = 2
+                    order.append(key)
+                    continue
+
+                child_state = state.get(child)
+                if child_state == 2:
+                    continue
+                if child_state == 1:
+                    chain = path[path.index(child):] + [child]
+                    raise ConfigError('Cyclic variable reference: ' + ' -> '.join(chain))
+                state[child] = 1
+                path.append(child)
+                stack.append(iter(deps[child]))
+        return order
+
+    def _resolve_value(self, key: str, value: any) -> any:
+        if self._is_self_reference(key, value):
+            return value
+        return self._render(value)
+
+    def _render(self, value: any) -> any:
+        if isinstance(value, dict):
+            # Create a copy, the variable definition might be shared with other scopes
+            return {key: self._render(item) for key, item in value.items()}
+        if not isinstance(value, str) or not TemplateString.has_vars(value):
+            return value
+        return TemplateString.compile(value).render(self, self._collectors[-1])
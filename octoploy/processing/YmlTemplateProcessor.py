@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, List, Set
+from collections import ChainMap
+from typing import Optional, Dict, List, Set, Tuple
 from typing import TYPE_CHECKING
 
 from octoploy.k8s.BaseObj import BaseObj
+from octoploy.processing.TemplatePlan import TemplatePlan
+from octoploy.processing.TemplateString import TemplateString
 from octoploy.processing.TreeWalker import TreeWalker, TreeProcessor
+from octoploy.processing.VarResolver import VarResolver
+from octoploy.utils.DictUtils import DictUtils
 from octoploy.utils.Log import Log
 
 if TYPE_CHECKING:
@@ -18,12 +23,29 @@ class YmlTemplateProcessor(Log, TreeProcessor):
     """
 
     KEY_FIELD_MERGE: str = '_merge'
+    structural_keys = frozenset({KEY_FIELD_MERGE})
 
     _config: BaseConfig
-    _replacements: Dict[str, any]
     _parents: List[YmlTemplateProcessor]
     _child: Optional[YmlTemplateProcessor]
 
+    _scope: Optional[ChainMap]
+    """
+    Unresolved replacements of this processor layered on top of the parent and child replacements
+    """
+
+    _replacements: Optional[VarResolver]
+    """
+    Resolved replacements, loader backed values are resolved once they are referenced
+    """
+
+    _params: Optional[Set[str]]
+
+    _scope_missing_vars: List[str]
+    """
+    List of all variables which are referenced by other variables but are not defined
+    """
+
     _missing_vars: List[str]
     """
     List of all variables which have not been replace because
@@ -37,7 +59,17 @@ class YmlTemplateProcessor(Log, TreeProcessor):
         self._config = config
         self._parents = []
         self._child = None
-        self._replacements = {}
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drops the cached replacements.
+        Must be called if the config of this processor has been changed.
+        """
+        self._scope = None
+        self._replacements = None
+        self._params = None
+        self._scope_missing_vars = []
 
     def parents(self, template_processor: List[YmlTemplateProcessor]):
         """
@@ -50,6 +82,7 @@ class YmlTemplateProcessor(Log, TreeProcessor):
         if len(self._parents) > 0:
             raise ValueError('Parent processors already defined')
         self._parents = template_processor
+        self.invalidate()
 
     def child(self, template_processor: YmlTemplateProcessor):
         """
@@ -62,6 +95,7 @@ class YmlTemplateProcessor(Log, TreeProcessor):
         if self._child is not None:
             raise ValueError('Child processor already defined')
         self._child = template_processor
+        self.invalidate()
 
     def process(self, k8s_object: BaseObj):
         """
@@ -70,39 +104,79 @@ class YmlTemplateProcessor(Log, TreeProcessor):
         :param k8s_object: Data of the app, the data will be modified in place
         :raise MissingParam: Gets raised if at least one parameter is not defined
         """
+        super().process(k8s_object)
+
+    def begin(self, k8s_object: BaseObj):
         self._load_replacements()
+        self._missing_vars = []
+        self._replacements.track_missing(self._missing_vars)
+
+    def end(self, k8s_object: BaseObj):
+        self._check_missing_vars(self._missing_vars)
 
-        # Now replace any placeholders in the actual data tree
-        walker = TreeWalker(self)
-        walker.walk(k8s_object.data)
-        k8s_object.refresh()
+    def render(self, plan: TemplatePlan) -> Dict[str, any]:
+        """
+        Renders a compiled document, this is equivalent to processing a copy of the document.
+        Renders of the plan are shared between all processors with the same values for the referenced variables
 
-        # Check if any of the missing vars are declared as "params"
-        # (aka are required)
-        if len(self._missing_vars) > 0:
+        :param plan: Compiled document
+        :return: Rendered document, can be modified by the caller
+        :raise MissingParam: Gets raised if at least one parameter is not defined
+        """
+        if plan.holes is None:
+            # The structure of the document depends on the variables
+            data = DictUtils.copy_tree(plan.skeleton)
+            self.process(BaseObj(data))
+            return data
+
+        self._load_replacements()
+        missing_vars = []
+        self._replacements.track_missing(missing_vars)
+        data = plan.render(self._replacements, missing_vars)
+        self._check_missing_vars(missing_vars)
+        return data
+
+    def _check_missing_vars(self, missing_vars: List[str]):
+        """
+        Checks if any of the missing vars are declared as "params" (aka are required)
+        :param missing_vars: Variables which have not been replaced
+        :raise MissingParam: Gets raised if at least one parameter is not defined
+        """
+        missing_vars = list(dict.fromkeys(self._scope_missing_vars + missing_vars))
+        if len(missing_vars) > 0:
             missing_params = []
             params = self._get_params()
-            for missing in self._missing_vars:
+            for missing in missing_vars:
                 if missing not in params:
                     continue
                 missing_params.append(missing)
             if len(missing_params) > 0:
                 raise MissingParam('The following params are not defined: ' + str(missing_params))
-            self.log.warning('The following vars are not defined: ' + str(self._missing_vars))
+            self.log.warning('The following vars are not defined: ' + str(missing_vars))
 
     def _get_params(self) -> Set[str]:
         """
         Returns all defined params
         :return: Param names
         """
+        if self._params is not None:
+            return self._params
+
         params = set()
         for parent in self._parents:
             params.update(parent._get_params())
         params.update(self._config.get_params())
         if self._child is not None:
             params.update(self._child._get_params())
+        self._params = params
         return params
 
+    def get_markers(self) -> Optional[Tuple[str, ...]]:
+        return '$', self.KEY_FIELD_MERGE
+
+    def wants_str(self, value: str, key: str) -> bool:
+        return key == self.KEY_FIELD_MERGE or TemplateString.has_vars(value)
+
     def process_object(self, data: Dict[str, any], parent: Dict[str, any], key: str) -> Optional[Dict[str, any]]:
         if key == self.KEY_FIELD_MERGE:
             # Remove the item from the parent
@@ -132,107 +206,36 @@ class YmlTemplateProcessor(Log, TreeProcessor):
         :param item: Variable in the format "${KEY}" "$$" will be escaped to "$"
         :return: Value or item if no replacement was found
         """
-        new_item = ''
-        var_name_buffer = ''
-        mode = 0
-        for char in item:
-            if mode == 0:  # Search for tag start $
-                if char == '$':
-                    mode = 1
-                    continue
-                new_item += char
-                continue
-
-            if mode == 1:  # After $
-                if char == '$':
-                    # Escaped $
-                    new_item += '$'
-                    mode = 0
-                    continue
-
-                if char == '{':
-                    mode = 2
-                    var_name_buffer = ''
-                    continue
-
-                # Not a variable tag, just add the $ and the current char
-                new_item += '$' + char
-                mode = 0
-                continue
-
-            if mode == 2:  # After ${, search for end }
-                if char == '}':
-                    # End of variable tag found
-                    mode = 0
-                    new_val = self._replacements.get(var_name_buffer)
-                    if new_val is None:
-                        self._missing_vars.append(var_name_buffer)
-                        new_item += '${' + var_name_buffer + '}'
-                        continue
-
-                    # The new_val can be an "object" as well,
-                    # but we can only replace it if the given item
-                    # only refers to this variable and is not a combination of strings
-                    if item == '${' + var_name_buffer + '}':
-                        return new_val
-
-                    if not isinstance(new_val, str):
-                        raise ValueError(f'Invalid replacement for {var_name_buffer}: Expected string, got {new_val}.\n'
-                                         f'Non string replacements are only possible for single variable references.')
-                    new_item += new_val
-                    continue
-                var_name_buffer += char
-                continue
-
-        if mode == 1:
-            # Ended with a $
-            new_item += '$'
-        if mode == 2:
-            # Ended with a ${, so we need to add the buffer
-            new_item += '${' + var_name_buffer
-
-        return new_item
+        if not TemplateString.has_vars(item):
+            return item
+        return TemplateString.compile(item).render(self._replacements, self._missing_vars)
 
     def _load_replacements(self):
         """
-        Loads all available replacements
+        Loads all available replacements.
+        The replacements are resolved once and cached until the processor gets invalidated
+        :raise ConfigError: Gets raised if the replacements contain a reference cycle
         """
-        self._replacements = self._get_replacements()
-        self._resolve_refs(self._replacements)
+        if self._replacements is not None:
+            return
+        self._scope_missing_vars = []
+        replacements = VarResolver(self._get_replacements(), self._scope_missing_vars)
+        replacements.resolve()
+        self._replacements = replacements
 
-    def _get_replacements(self) -> Dict[str, any]:
+    def _get_replacements(self) -> ChainMap:
         """
         Returns all replacements handled by this processor, including all parent variables
         :return: Replacements
         """
-        replacements = {}
-        for parent in self._parents:
-            replacements.update(parent._get_replacements())
-        replacements.update(self._config.get_replacements())
-        if self._child is not None:
-            replacements.update(self._child._get_replacements())
-        return replacements
-
-    def _resolve_refs(self, data: Dict[str, any]):
-        """
-        Resolves any references in the given replacements (in place)
-        :param data: Replacements
-        """
-        found_var_to_replace = True
-        while found_var_to_replace:
-            found_var_to_replace = False
-            for key, value in data.items():
-                if isinstance(value, dict):
-                    # A replacement might be an object
-                    # So we need to walk through every item and see if there is something to replace
-                    self._resolve_refs(value)
-                    continue
-                if not isinstance(value, str):
-                    continue
+        if self._scope is not None:
+            return self._scope
 
-                # The replacement value might refer to another variable
-                new_val = self._replace(value)
-                if new_val != value:
-                    data[key] = new_val
-                    found_var_to_replace = True
-                    continue
+        layers = []
+        if self._child is not None:
+            layers.append(self._child._get_replacements())
+        layers.append(self._config.get_replacements())
+        for parent in reversed(self._parents):
+            layers.append(parent._get_replacements())
+        self._scope = ChainMap(*layers)
+        return self._scope
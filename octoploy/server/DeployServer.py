@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import stat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from octoploy.server.DeployService import DeployService
+from octoploy.utils.Log import Log
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Maps the http endpoints to the deploy service:
+
+    GET  /health
+    GET  /metrics
+    POST /plan[/app]              {"apps": [...], "env": ["key=value"]}
+    POST /deploy[/app]            {"apps": [...], "env": ["key=value"]}
+    POST /invalidate/config
+    POST /invalidate/objects      {"name": "Kind/name", "namespace": "..."}
+    POST /invalidate
+    """
+
+    service: DeployService
+    logger: Log
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._respond(200, {'status': 'ok'})
+        elif self.path == '/metrics':
+            self._respond(200, self.service.get_metrics())
+        else:
+            self._respond(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        try:
+            body = self._read_body()
+        except ValueError as e:
+            self._respond(400, {'error': f'Invalid body: {e}'})
+            return
+
+        parts = [x for x in self.path.split('/') if x != '']
+        if len(parts) == 0:
+            self._respond(404, {'error': f'Unknown path {self.path}'})
+            return
+
+        action = parts[0]
+        if action in DeployService.ACTIONS and len(parts) <= 2:
+            apps = parts[1:] + list(body.get('apps', []))
+            try:
+                result = self.service.run(action, apps, env=body.get('env', []))
+            except ValueError as e:
+                self._respond(400, {'error': str(e)})
+                return
+            self._respond(200 if result['status'] == 'ok' else 500, result)
+            return
+
+        if action == 'invalidate' and len(parts) <= 2:
+            target = parts[1] if len(parts) == 2 else None
+            if target not in (None, 'config', 'objects'):
+                self._respond(404, {'error': f'Unknown path {self.path}'})
+                return
+            if target in (None, 'config'):
+                self.service.invalidate_config()
+            if target in (None, 'objects'):
+                self.service.invalidate_objects(body.get('name'), body.get('namespace'))
+            self._respond(200, {'status': 'ok'})
+            return
+
+        self._respond(404, {'error': f'Unknown path {self.path}'})
+
+    def log_message(self, format: str, *args: Any):
+        # The client address is empty for unix sockets
+        self.logger.log.debug(f'{self.command} {self.path}')
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        if length == 0:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError('Expected a json object')
+        return body
+
+    def _respond(self, code: int, data: Dict[str, Any]):
+        content = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects an address tuple
+        return request, ('local', 0)
+
+
+class DeployServer(Log):
+    """
+    Serves a DeployService via http, either on a tcp port or on a unix socket.
+    Every request is handled in its own thread, so health and metrics requests are answered
+    while a plan/deploy is running. Plan/deploy requests still wait for each other.
+    """
+
+    def __init__(self, service: DeployService, host: str = '127.0.0.1', port: int = 8080,
+                 socket_path: Optional[str] = None):
+        """
+        :param service: Service handling the requests
+        :param host: Host to listen on
+        :param port: Port to listen on, 0 for a random port
+        :param socket_path: Path of the unix socket, replaces the host and port if set
+        :raise FileExistsError: Gets raised if the socket path exists, but is not a socket
+        """
+        super().__init__()
+        handler = type('RequestHandler', (_RequestHandler,), {'service': service, 'logger': self})
+        self._socket_path = socket_path
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                # Left over from a previous run, never delete anything else
+                if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                    raise FileExistsError(f'{socket_path} exists and is not a socket')
+                os.remove(socket_path)
+            self._server = _UnixHTTPServer(socket_path, handler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), handler)
+
+    def get_address(self) -> str:
+        """
+        Returns the address the server is listening on
+        """
+        if self._socket_path is not None:
+            return self._socket_path
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def serve(self):
+        """
+        Handles requests until the server gets shut down
+        """
+        self.log.info(f'Listening on {self.get_address()}')
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self._socket_path is not None and os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+    def shutdown(self):
+        """
+        Stops serving, needs to be called from another thread
+        """
+        self._server.shutdown()
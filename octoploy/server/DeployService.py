@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from octoploy.api.CachingK8sApi import CachingK8sApi
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.AppDeploy import AppDeployment
+from octoploy.utils.Log import Log, ColorFormatter
+
+
+class _LogCapture(logging.Handler):
+    """
+    Collects the log messages of a single request
+    """
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(ColorFormatter.decolorize(record.getMessage()))
+
+
+class DeployService(Log):
+    """
+    Executes plan/deploy requests against a project which is kept in memory.
+    The parsed project, the state and the live objects of the cluster stay warm between the requests,
+    plan/deploy requests are executed one after another.
+    The metrics can be read while a request is running.
+    """
+
+    ACTIONS = ('plan', 'deploy')
+
+    def __init__(self, load_project: Callable[[], RootConfig]):
+        """
+        :param load_project: Loads the project
+        """
+        super().__init__()
+        self._load_project = load_project
+        self._root_config: Optional[RootConfig] = None
+        self._api: Optional[CachingK8sApi] = None
+        self._lock = threading.Lock()
+        """
+        Guards the project, the state and the cluster objects
+        """
+        self._metrics_lock = threading.Lock()
+        self._started = time.time()
+        self._metrics: Dict[str, Any] = {
+            'requests': 0,
+            'errors': 0,
+            'project_loads': 0,
+            'last_duration': 0.0,
+            'total_duration': 0.0,
+            'actions': {action: 0 for action in self.ACTIONS},
+        }
+
+    def run(self, action: str, app_names: List[str], env: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Plans / deploys the given apps
+        :param action: plan or deploy
+        :param app_names: Names of the apps, empty for all apps
+        :param env: key=value pairs which should be passed to the templating engine
+        :return: Result of the request
+        :raise ValueError: Gets raised if the action is unknown
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f'Unknown action {action}')
+        mode = RunMode()
+        mode.plan = action == 'plan'
+        mode.set_override_env(env or [])
+        # The diffs are returned as part of the result
+        mode.change_sets = []
+
+        capture = _LogCapture()
+        result = {'action': action, 'apps': [], 'status': 'ok'}
+        with self._lock:
+            # Only one request at a time, so the captured output belongs to this request
+            start = time.perf_counter()
+            Log.add_handler(capture)
+            try:
+                self._run(mode, app_names, result)
+            except Exception as e:
+                self.log.error(f'{action} failed: {e}')
+                result['status'] = 'error'
+                result['error'] = str(e)
+            finally:
+                Log.remove_handler(capture)
+                duration = time.perf_counter() - start
+                self._count(action, duration, result['status'] != 'ok')
+
+        result['duration'] = duration
+        result['log'] = capture.messages
+        result['changes'] = [x.to_dict() for x in mode.change_sets]
+        return result
+
+    def invalidate_config(self):
+        """
+        Drops the parsed project, it gets loaded again on the next request
+        """
+        with self._lock:
+            self._root_config = None
+
+    def invalidate_objects(self, name: Optional[str] = None, namespace: Optional[str] = None):
+        """
+        Drops cached live objects
+        :param name: Name of the object, None if all objects should be dropped
+        :param namespace: Namespace of the object
+        """
+        with self._lock:
+            if self._api is not None:
+                self._api.invalidate(name, namespace)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns the request metrics and the cache statistics
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics['actions'] = dict(self._metrics['actions'])
+            metrics['uptime'] = time.time() - self._started
+            metrics['project_loaded'] = self._root_config is not None
+            metrics['objects'] = {
+                'cached': 0 if self._api is None else self._api.get_size(),
+                'hits': 0 if self._api is None else self._api.hits,
+                'misses': 0 if self._api is None else self._api.misses,
+            }
+        return metrics
+
+    def _run(self, mode: RunMode, app_names: List[str], result: Dict[str, Any]):
+        root_config = self._get_root_config()
+        root_config.initialize_state(mode)
+        if len(app_names) == 0:
+            app_configs = root_config.load_app_configs()
+        else:
+            app_configs = [root_config.load_app_config(name) for name in app_names]
+
+        try:
+            for app_config in app_configs:
+                AppDeployment(root_config, app_config, mode).deploy()
+                result['apps'].append(app_config.get_name())
+        finally:
+            root_config.persist_state(mode)
+
+    def _get_root_config(self) -> RootConfig:
+        if self._root_config is None:
+            root_config = self._load_project()
+            if self._api is None:
+                self._api = CachingK8sApi(root_config.create_api())
+            root_config.use_api(self._api)
+            self._root_config = root_config
+            with self._metrics_lock:
+                self._metrics['project_loads'] += 1
+        return self._root_config
+
+    def _count(self, action: str, duration: float, failed: bool):
+        with self._metrics_lock:
+            self._metrics['requests'] += 1
+            self._metrics['actions'][action] += 1
+            self._metrics['last_duration'] = duration
+            self._metrics['total_duration'] += duration
+            if failed:
+                self._metrics['errors'] += 1
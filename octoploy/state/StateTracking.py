@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import Dict, List, Optional
 
 import yaml
@@ -66,6 +67,7 @@ class StateTracking(Log):
     """
     Stores the objects that have been deployed with octoploy.
     This allows octoploy to detect renamed / deleted objects.
+    The state is shared by all apps of a project, which might be deployed concurrently.
     """
     CM_NAME = 'octoploy-state'
     _k8s_api: K8sApi
@@ -76,27 +78,26 @@ class StateTracking(Log):
         self._k8s_api = api
         self._cm_name = self.CM_NAME + name_suffix
         self._state = {}
+        self._lock = threading.RLock()
 
     def restore(self, namespace: str):
+        state = {}
         item = self._k8s_api.get(f'ConfigMap/{self._cm_name}', namespace=namespace)
-        if item is None:
-            return
-        cm = item.data
-        state_data_str = cm.get('data', {}).get('state', '')
-        state_data = yaml.safe_load(state_data_str)
-        if state_data is None:
-            return
-
-        for state_obj in state_data:
-            object_state = ObjectState().parse(state_obj)
-            self._state[object_state.get_key()] = object_state
+        if item is not None:
+            cm = item.data
+            state_data_str = cm.get('data', {}).get('state', '')
+            state_data = yaml.safe_load(state_data_str)
+            for state_obj in state_data or []:
+                object_state = ObjectState().parse(state_obj)
+                state[object_state.get_key()] = object_state
+        with self._lock:
+            self._state = state
 
     def store(self, namespace: str):
         self.log.debug(f'Persisting state in ConfigMap {self._cm_name}')
 
-        states = []
-        for object_state in self._state.values():
-            states.append(object_state.to_dict())
+        with self._lock:
+            states = [object_state.to_dict() for object_state in self._state.values()]
 
         data = {
             'kind': 'ConfigMap',
@@ -112,13 +113,16 @@ class StateTracking(Log):
         self._k8s_api.apply(yml, namespace=namespace)
 
     def add(self, object_state: ObjectState):
-        self._state[object_state.get_key()] = object_state
+        with self._lock:
+            self._state[object_state.get_key()] = object_state
 
     def remove(self, object_state: ObjectState):
-        del self._state[object_state.get_key()]
+        with self._lock:
+            del self._state[object_state.get_key()]
 
     def remove_key(self, key: str):
-        del self._state[key]
+        with self._lock:
+            del self._state[key]
 
     def get_items(self, prefix: str) -> List[ObjectState]:
         """
@@ -127,7 +131,7 @@ class StateTracking(Log):
         :return: Items
         """
         items = []
-        for value in list(self._state.values()):
+        for value in self._get_values():
             key = value.get_key()
             if not key.startswith(prefix):
                 continue
@@ -141,14 +145,15 @@ class StateTracking(Log):
         :return: Objects
         """
         items = []
-        for object_state in self._state.values():
+        for object_state in self._get_values():
             if not object_state.visited and object_state.context == context:
                 items.append(object_state)
         return items
 
     def get_state(self, context_name: str, k8s_object: BaseObj) -> Optional[ObjectState]:
         state = self._k8s_to_state(context_name, k8s_object)
-        return self._state.get(state.get_key())
+        with self._lock:
+            return self._state.get(state.get_key())
 
     def visit(self, context_name: str, k8s_object: BaseObj, hash_val: str, only_update: bool = False):
         """
@@ -160,30 +165,39 @@ class StateTracking(Log):
         :param only_update: True if the state should only be updated and not added if not existing
         """
         state = self._k8s_to_state(context_name, k8s_object)
-        existing_state = self._state.get(state.get_key())
-        if existing_state is None:
-            if only_update:
+        with self._lock:
+            existing_state = self._state.get(state.get_key())
+            if existing_state is None:
+                if only_update:
+                    return
+                state.hash = hash_val
+                self._state[state.get_key()] = state
                 return
-            state.hash = hash_val
-            self._state[state.get_key()] = state
-            return
-        existing_state.hash = hash_val
-        existing_state.visited = True
+            existing_state.hash = hash_val
+            existing_state.visited = True
 
     def visit_only(self, context_name: str, k8s_object):
         """
         Marks the given object as "visited" if already in the state
         """
         state = self._k8s_to_state(context_name, k8s_object)
-        existing_state = self._state.get(state.get_key())
-        if existing_state is not None:
-            existing_state.visited = True
+        with self._lock:
+            existing_state = self._state.get(state.get_key())
+            if existing_state is not None:
+                existing_state.visited = True
 
     def print(self):
         self.log.info(f'State content of ConfigMap {self._cm_name}')
-        for key, value in self._state.items():
+        for value in self._get_values():
             self.log.info('|- ' + value.get_key())
 
+    def _get_values(self) -> List[ObjectState]:
+        """
+        Returns a copy of the state items, which can be iterated while other threads modify the state
+        """
+        with self._lock:
+            return list(self._state.values())
+
     @staticmethod
     def _k8s_to_state(context_name: str, k8s_object: BaseObj) -> ObjectState:
         # At this point we always have a namespace set for the object
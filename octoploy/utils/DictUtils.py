@@ -33,3 +33,17 @@ class DictUtils:
         if key not in data:
             return
         del data[parts[-1]]
+
+    @staticmethod
+    def copy_tree(data: any) -> any:
+        """
+        Creates a structural copy of the given tree.
+        Dicts and lists are copied, all other values are shared since they are immutable
+        :param data: Tree
+        :return: Copy
+        """
+        if isinstance(data, dict):
+            return {key: DictUtils.copy_tree(value) for key, value in data.items()}
+        if isinstance(data, list):
+            return [DictUtils.copy_tree(value) for value in data]
+        return data
@@ -0,0 +1,48 @@
+import os
+import subprocess
+from typing import List, Optional, Set
+
+from octoploy.utils.Log import Log
+
+
+class Git(Log):
+    """
+    Minimal git client used to detect changed files
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Any path inside the repository
+        """
+        super().__init__()
+        self._path = path
+
+    def get_changed_files(self, ref: str) -> Set[str]:
+        """
+        Returns all files which changed since the given ref.
+        This includes uncommitted and untracked files
+        :param ref: Git ref such as a commit, branch or tag
+        :return: Real paths, may contain files which have been deleted (renamed files are reported with both paths)
+        """
+        top_level = self._exec(['rev-parse', '--show-toplevel'], self._path)[0]
+        # -z: The paths are neither quoted nor escaped
+        files = self._exec(['diff', '--name-only', '--no-renames', '-z', ref, '--'], top_level, separator='\0')
+        files.extend(self._exec(['ls-files', '--others', '--exclude-standard', '-z'], top_level, separator='\0'))
+        return set(os.path.realpath(os.path.join(top_level, file)) for file in files)
+
+    def _exec(self, args: List[str], cwd: str, separator: Optional[str] = None) -> List[str]:
+        """
+        Executes git and returns the output
+        :param args: Arguments
+        :param cwd: Working directory
+        :param separator: Separator of the output entries, None for lines
+        :return: Entries of the output
+        """
+        args = ['git'] + args
+        self.log.debug('Executing ' + str(args))
+        result = subprocess.run(args, capture_output=True, cwd=cwd)
+        if result.returncode != 0:
+            raise Exception('Failed: ' + str(result.stderr.decode('utf-8')))
+        output = result.stdout.decode('utf-8')
+        entries = output.splitlines() if separator is None else output.split(separator)
+        return [entry for entry in entries if entry != '']
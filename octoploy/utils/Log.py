@@ -1,6 +1,9 @@
 import logging
 import re
 import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 
 
 class ColorFormatter(logging.Formatter):
@@ -34,21 +37,119 @@ class ColorFormatter(logging.Formatter):
         return formatter.format(record)
 
 
+class _OutputHandler(logging.StreamHandler):
+    """
+    Prints the messages, unless the output of the current thread is buffered
+    """
+
+    def emit(self, record: logging.LogRecord):
+        buffer = Log.get_buffer()
+        if buffer is None:
+            super().emit(record)
+            return
+        try:
+            buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 class Log:
     log_level = logging.INFO
 
+    ROOT_NAME = 'octoploy'
+    """
+    Name of the logger all loggers of octoploy are part of
+    """
+
+    _configured = False
+
+    _local = threading.local()
+
+    _output_lock = threading.Lock()
+
     def __init__(self, name: str = None):
         if not hasattr(self, 'log'):
             if name is None:
                 name = self.__class__.__name__
-            log = logging.getLogger(name)
-            if not log.hasHandlers():
-                handler = logging.StreamHandler(stream=sys.stdout)
+            if name != Log.ROOT_NAME and not name.startswith(Log.ROOT_NAME + '.'):
+                name = Log.ROOT_NAME + '.' + name
+            Log._get_root()
+            # The level is inherited from the root
+            self.log = logging.getLogger(name)
+
+    @staticmethod
+    def _get_root() -> logging.Logger:
+        """
+        Returns the parent of all octoploy loggers, the messages are printed by this logger
+        (unless the logging has already been configured)
+        """
+        root = logging.getLogger(Log.ROOT_NAME)
+        if not Log._configured:
+            Log._configured = True
+            root.setLevel(Log.log_level)
+            if not root.hasHandlers():
+                handler = _OutputHandler(stream=sys.stdout)
                 handler.setFormatter(ColorFormatter())
-                log.addHandler(handler)
-                log.setLevel(Log.log_level)
-            self.log = log
+                root.addHandler(handler)
+        return root
+
+    @classmethod
+    def add_handler(cls, handler: logging.Handler):
+        """
+        Additionally passes all messages to the given handler (e.g. for capturing the output),
+        independent of the logging configuration
+        :param handler: Handler
+        """
+        cls._get_root().addHandler(handler)
+
+    @classmethod
+    def remove_handler(cls, handler: logging.Handler):
+        """
+        Removes a handler added via add_handler
+        :param handler: Handler
+        """
+        cls._get_root().removeHandler(handler)
 
     @classmethod
     def set_debug(cls):
         cls.log_level = logging.DEBUG
+        cls._get_root().setLevel(cls.log_level)
+
+    @classmethod
+    def write(cls, line: str):
+        """
+        Prints the given line (e.g. a diff) without any log formatting
+        :param line: Line
+        """
+        buffer = cls.get_buffer()
+        if buffer is not None:
+            buffer.append(line)
+            return
+        print(line)
+
+    @classmethod
+    def get_buffer(cls) -> Optional[List[str]]:
+        """
+        Returns the output buffer of the current thread, None if the output is not buffered
+        """
+        return getattr(cls._local, 'buffer', None)
+
+    @classmethod
+    @contextmanager
+    def buffer(cls) -> Iterator[None]:
+        """
+        Buffers the output of the current thread and prints it at once at the end,
+        so the output of concurrently running threads doesn't interleave
+        """
+        if cls.get_buffer() is not None:
+            yield
+            return
+        buffer: List[str] = []
+        cls._local.buffer = buffer
+        try:
+            yield
+        finally:
+            cls._local.buffer = None
+            with cls._output_lock:
+                for line in buffer:
+                    print(line)
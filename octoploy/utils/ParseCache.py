@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+from typing import Callable, Optional, Dict, Tuple
+
+from octoploy.utils.Log import Log
+
+
+class ParseCache(Log):
+    """
+    Persistent cache for parsed yml files.
+    The parsed trees are stored in marshal format, keyed by the path, mtime, size and content digest of the file.
+    The least recently used entries get evicted once the cache exceeds its size limit.
+    """
+
+    DIR_NAME = '.octoploy-cache'
+    FORMAT_VERSION = 1
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+    ENTRY_SUFFIX = '.bin'
+
+    _instance: Optional[ParseCache] = None
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE):
+        super().__init__()
+        self._path = path
+        self._max_size = max_size
+        self._entries = None  # type: Optional[Dict[str, Tuple[float, int]]]
+        self._total_size = 0
+        self._writable = True
+
+    @classmethod
+    def enable(cls, project_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Enables the cache for the given project
+        :param project_dir: Root directory of the project, the cache will be stored inside
+        :param max_size: Maximum size of the cache in bytes
+        """
+        cls._instance = ParseCache(os.path.join(project_dir, cls.DIR_NAME), max_size)
+
+    @classmethod
+    def disable(cls):
+        cls._instance = None
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._instance is not None
+
+    @classmethod
+    def load(cls, path: str, parse: Callable[[any], any], name: str) -> any:
+        """
+        Parses the given file or returns the cached tree
+        :param path: Path to the file
+        :param parse: Parses a stream or the raw content of the file
+        :param name: Name of the parse function, used as part of the cache key
+        :return: Parsed tree
+        """
+        if cls._instance is None:
+            with open(path, 'r') as stream:
+                return parse(stream)
+        return cls._instance._load(path, parse, name)
+
+    def _load(self, path: str, parse: Callable[[any], any], name: str) -> any:
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+
+        key = self._get_key(name, os.path.abspath(path), stat.st_mtime_ns, stat.st_size, content)
+        entry_path = os.path.join(self._path, key + self.ENTRY_SUFFIX)
+        try:
+            with open(entry_path, 'rb') as f:
+                data = marshal.load(f)
+            os.utime(entry_path)  # Mark as recently used
+            if self._entries is not None and entry_path in self._entries:
+                self._add_entry(entry_path, self._entries[entry_path][1])
+            return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        data = parse(content)
+        self._store(entry_path, data)
+        return data
+
+    def _store(self, entry_path: str, data: any):
+        if not self._writable:
+            return
+        try:
+            payload = marshal.dumps(data)
+        except ValueError:
+            # Contains types which can't be stored (e.g. dates)
+            return
+
+        try:
+            self._init_dir()
+            tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            self.log.debug(f'Could not write parse cache: {e}')
+            self._writable = False
+            return
+
+        self._add_entry(entry_path, len(payload))
+        self._evict()
+
+    def _init_dir(self):
+        if self._entries is not None:
+            return
+        os.makedirs(self._path, exist_ok=True)
+        ignore_file = os.path.join(self._path, '.gitignore')
+        if not os.path.isfile(ignore_file):
+            with open(ignore_file, 'w') as f:
+                f.write('*\n')
+
+        self._entries = {}
+        for item in os.listdir(self._path):
+            if not item.endswith(self.ENTRY_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self._path, item))
+            except OSError:
+                continue
+            self._add_entry(os.path.join(self._path, item), stat.st_size, stat.st_mtime)
+
+    def _add_entry(self, entry_path: str, size: int, last_used: Optional[float] = None):
+        if last_used is None:
+            last_used = os.path.getmtime(entry_path)
+        previous = self._entries.get(entry_path)
+        if previous is not None:
+            self._total_size -= previous[1]
+        self._entries[entry_path] = (last_used, size)
+        self._total_size += size
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache fits into the size limit
+        """
+        if self._total_size <= self._max_size:
+            return
+        for entry_path, (_, size) in sorted(self._entries.items(), key=lambda x: x[1][0]):
+            if self._total_size <= self._max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            del self._entries[entry_path]
+            self._total_size -= size
+
+    def _get_key(self, name: str, path: str, mtime: int, size: int, content: bytes) -> str:
+        digest = hashlib.sha256()
+        header = f'{self.FORMAT_VERSION}|{sys.version_info[0]}.{sys.version_info[1]}|{marshal.version}|' \
+                 f'{name}|{path}|{mtime}|{size}|'
+        digest.update(header.encode('utf-8'))
+        digest.update(hashlib.sha256(content).digest())
+        return digest.hexdigest()
@@ -2,18 +2,23 @@ from typing import Dict, List
 
 import yaml
 
+from octoploy.utils.ParseCache import ParseCache
+
 
 class Yml:
+    @classmethod
+    def load_docs(cls, path: str) -> List[Dict[any, any]]:
+        return ParseCache.load(path, cls._parse_docs, 'load_docs')
+
     @staticmethod
-    def load_docs(path: str) -> List[Dict[any, any]]:
+    def _parse_docs(stream) -> List[Dict[any, any]]:
         docs = []
-        with open(path) as f:
-            data = yaml.load_all(f, Loader=yaml.FullLoader)
-            for doc in data:
-                if doc is None:
-                    # Empty block
-                    continue
-                docs.append(doc)
+        data = yaml.load_all(stream, Loader=yaml.FullLoader)
+        for doc in data:
+            if doc is None:
+                # Empty block
+                continue
+            docs.append(doc)
         return docs
 
     @classmethod
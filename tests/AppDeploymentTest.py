@@ -1,10 +1,15 @@
+import json
 import os
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 
 import yaml
 
 from octoploy.config.Config import RootConfig, RunMode
 from octoploy.deploy.AppDeploy import AppDeployment
+from octoploy.deploy.ObjectTemplateCache import ObjectTemplateCache
+from octoploy.deploy.ParallelRenderer import ParallelRenderer
 from octoploy.utils.Errors import MissingParam
 from octoploy.utils.Yml import Yml
 from tests import TestUtils
@@ -20,6 +25,7 @@ class AppDeploymentTest(TestCase):
         self._mode.out_file = self._tmp_file
 
     def tearDown(self) -> None:
+        self._mode.close_out_writer()
         if os.path.isfile(self._tmp_file):
             os.remove(self._tmp_file)
 
@@ -115,6 +121,18 @@ KEY STUFF
         self.assertEqual('hello', docs[0]['metadata']['REMAPPED'])
         self.assertEqual('hello', docs[1]['metadata']['REMAPPED'])
 
+    def test_for_each_parse_once(self):
+        ObjectTemplateCache._instance = None
+        with patch.object(Yml, 'load_docs', wraps=Yml.load_docs) as load_docs:
+            self._deploy('app-for-each')
+            self._deploy('app-for-each')
+        # One file, shared by both instances and runs
+        self.assertEqual(1, load_docs.call_count)
+
+        docs = Yml.load_docs(self._tmp_file)
+        self.assertEqual(2, len(docs))
+        self.assertNotEqual(docs[0]['metadata']['name'], docs[1]['metadata']['name'])
+
     def test_params(self):
         prj_config = RootConfig.load(os.path.join(self._base_path, 'app_deploy_test_params'))
         app_config = prj_config.load_app_config('app-params')
@@ -153,6 +171,72 @@ KEY STUFF
         self.assertEqual('hello world', data['stringData']['ref'])
         self.assertEqual('hello world', data['stringData']['field'])
 
+    def test_out_layouts(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._mode.out_layout = 'object'
+            self._mode.out_file = os.path.join(tmp_dir, 'out')
+            self._deploy('app')
+            self._mode.close_out_writer()
+            self.assertEqual(['ConfigMap_test-config.yml', 'Deployment_ABC.yml'],
+                             sorted(os.listdir(os.path.join(tmp_dir, 'out', 'ABC'))))
+
+            self._mode.out_layout = 'jsonl'
+            self._mode.out_file = os.path.join(tmp_dir, 'out.jsonl')
+            self._deploy(None)
+            self._mode.close_out_writer()
+            with open(self._mode.out_file) as f:
+                docs = [json.loads(line) for line in f]
+            self.assertIn('test-config', [x['metadata']['name'] for x in docs])
+            self.assertGreater(len(docs), 2)
+
+    def test_out_file_append(self):
+        # Every app gets appended to the open out file
+        os.environ['OCTOPLOY_KEY'] = TestUtils.OCTOPLOY_KEY
+        self._deploy(None)
+        self._mode.close_out_writer()
+        docs = Yml.load_docs(self._tmp_file)
+        self.assertEqual(['ABC', 'test-config'], [x['metadata']['name'] for x in docs[:2]])
+        self.assertGreater(len(docs), 2)
+
+    def test_parallel_render(self):
+        os.environ['OCTOPLOY_KEY'] = TestUtils.OCTOPLOY_KEY
+        self._deploy(None)
+        self._mode.close_out_writer()
+        with open(self._tmp_file) as f:
+            expected = f.read()
+
+        prj_config = RootConfig.load(os.path.join(self._base_path, 'app_deploy_test'))
+        prj_config.initialize_state(self._mode)
+        ParallelRenderer(prj_config, self._mode, jobs=2).render(prj_config.load_app_configs())
+        self._mode.close_out_writer()
+        with open(self._tmp_file) as f:
+            # Same order as a sequential run
+            self.assertEqual(expected, f.read())
+
+    def test_parallel_render_same_folder_name(self):
+        # The project and its library both contain a "web" folder
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            files = {
+                'lib/_root.yml': "type: 'library'\n",
+                'lib/web/_index.yml': "name: 'lib-web'\n",
+                'lib/web/cm.yml': 'kind: ConfigMap\napiVersion: v1\nmetadata:\n  name: ${APP_NAME}\n',
+                'project/_root.yml': "namespace: 'oc-project'\nlibraries:\n  - 'lib'\n",
+                'project/web/_index.yml': "name: 'web'\n",
+                'project/web/cm.yml': 'kind: ConfigMap\napiVersion: v1\nmetadata:\n  name: ${APP_NAME}\n',
+            }
+            for name, content in files.items():
+                path = os.path.join(tmp_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(content)
+
+            prj_config = RootConfig.load(os.path.join(tmp_dir, 'project'))
+            prj_config.initialize_state(self._mode)
+            ParallelRenderer(prj_config, self._mode, jobs=2).render(prj_config.load_app_configs())
+            self._mode.close_out_writer()
+            docs = Yml.load_docs(self._tmp_file)
+            self.assertEqual(['web', 'lib-web'], [x['metadata']['name'] for x in docs])
+
     def _deploy(self, app: str, project: str = 'app_deploy_test'):
         prj_config = RootConfig.load(os.path.join(self._base_path, project))
         prj_config.initialize_state(self._mode)
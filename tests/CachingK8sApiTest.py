@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from octoploy.api.CachingK8sApi import CachingK8sApi
+from tests.TestUtils import DummyK8sApi
+
+
+class CachingK8sApiTest(TestCase):
+
+    def setUp(self) -> None:
+        self._dummy_api = DummyK8sApi()
+        self._dummy_api.respond(['get', 'ConfigMap/a', '-o', 'json'], '{"kind": "ConfigMap", "apiVersion": "v1"}')
+        self._api = CachingK8sApi(self._dummy_api)
+
+    def test_get(self):
+        obj = self._api.get('ConfigMap/a')
+        self.assertEqual('ConfigMap', obj.kind)
+        obj.data['kind'] = 'modified'
+
+        # Cached copies are not affected by the callers
+        self.assertEqual('ConfigMap', self._api.get('ConfigMap/a').kind)
+        self.assertEqual(1, len(self._dummy_api.commands))
+        self.assertEqual(1, self._api.hits)
+        self.assertEqual(1, self._api.misses)
+
+    def test_not_found(self):
+        self._dummy_api.not_found_by_default()
+        self.assertIsNone(self._api.get('ConfigMap/b'))
+        self.assertIsNone(self._api.get('ConfigMap/b'))
+        self.assertEqual(1, len(self._dummy_api.commands))
+
+    def test_invalidate(self):
+        self._api.get('ConfigMap/a')
+        self._api.get('ConfigMap/a', namespace='other')
+        self._api.delete('ConfigMap/a', namespace='other')
+        self.assertEqual(1, self._api.get_size())
+
+        self._api.apply('kind: ConfigMap')
+        self.assertEqual(0, self._api.get_size())
+
+    def test_record(self):
+        self._api.get('ConfigMap/a')
+        with self._api.record() as keys:
+            self._api.get('ConfigMap/a')
+            self._api.get('ConfigMap/b', namespace='other')
+        self._api.get('ConfigMap/c')
+        self.assertEqual({('ConfigMap/a', None), ('ConfigMap/b', 'other')}, keys)
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.ConfigWatcher import ConfigWatcher
+from tests.TestUtils import DummyK8sApi
+
+
+class ConfigWatcherTest(TestCase):
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.mkdtemp()
+        self._config_dir = os.path.join(self._tmp_dir, 'project')
+        shutil.copytree(os.path.join(os.path.dirname(__file__), 'app_deploy_test'), self._config_dir)
+        self._dummy_api = DummyK8sApi()
+        self._watcher = ConfigWatcher(self._load_project, ['app', 'var-append'], RunMode())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp_dir)
+
+    def _load_project(self) -> RootConfig:
+        root_config = RootConfig.load(self._config_dir)
+        root_config.use_api(self._dummy_api)
+        return root_config
+
+    def test_watch(self):
+        self._watcher.start()
+        root = self._watcher._root
+        self.assertFalse(self._watcher.check())
+
+        self._dummy_api.commands = []
+        with open(os.path.join(self._config_dir, 'var-append', 'config.yml'), 'a') as file:
+            file.write('\n  other: value\n')
+        with self.assertLogs(level='INFO') as logs:
+            self.assertTrue(self._watcher.check())
+
+        # Only the changed app got planned again, the project is kept in memory
+        output = '\n'.join(logs.output)
+        self.assertIn('Checking var-append', output)
+        self.assertNotIn('Checking ABC', output)
+        self.assertIs(root, self._watcher._root)
+        # The live objects of the changed app are fetched again, the ones of the other apps are still cached
+        self.assertIn(['get', 'ConfigMap/config', '-o', 'json'], [x.args for x in self._dummy_api.commands])
+        self._dummy_api.commands = []
+        api = self._watcher._api
+        api.get('Deployment/ABC', namespace='oc-project')
+        self.assertEqual([], self._dummy_api.commands)
+
+    def test_watch_index(self):
+        self._watcher.start()
+        root = self._watcher._root
+        with open(os.path.join(self._config_dir, 'var-append', '_index.yml'), 'a') as file:
+            file.write('\n# changed\n')
+        with self.assertLogs(level='INFO') as logs:
+            self.assertTrue(self._watcher.check())
+        self.assertIn('Checking var-append', '\n'.join(logs.output))
+        self.assertIs(root, self._watcher._root)
+
+        with open(os.path.join(self._config_dir, '_root.yml'), 'a') as file:
+            file.write('\n')
+        with self.assertLogs(level='INFO') as logs:
+            self.assertTrue(self._watcher.check())
+        # Everything might be affected by the root config
+        self.assertIn('Checking ABC', '\n'.join(logs.output))
+        self.assertIsNot(root, self._watcher._root)
+
+    def test_invalid_config(self):
+        self._watcher.start()
+        with open(os.path.join(self._config_dir, 'var-append', '_index.yml'), 'a') as file:
+            file.write('\n  invalid: [\n')
+
+        # Errors are logged, the watcher keeps running
+        with self.assertLogs(level='ERROR'):
+            self.assertTrue(self._watcher.check())
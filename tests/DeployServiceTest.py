@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from urllib.request import urlopen, Request
+
+from octoploy.config.Config import RootConfig
+from octoploy.server.DeployServer import DeployServer
+from octoploy.server.DeployService import DeployService
+from tests.TestUtils import DummyK8sApi
+
+
+class DeployServiceTest(TestCase):
+
+    def setUp(self) -> None:
+        self._dummy_api = DummyK8sApi()
+        self._service = DeployService(self._load_project)
+
+    def _load_project(self) -> RootConfig:
+        root_config = RootConfig.load(os.path.join(os.path.dirname(__file__), 'app_deploy_test'))
+        root_config.use_api(self._dummy_api)
+        return root_config
+
+    def test_warm_caches(self):
+        result = self._service.run('plan', ['app', 'var-append'])
+        self.assertEqual('ok', result['status'])
+        self.assertEqual(['ABC', 'var-append'], result['apps'])
+        self.assertIn('Checking var-append', result['log'])
+        gets = len(self._dummy_api.commands)
+
+        # The project and the objects are reused
+        self._service.run('plan', ['var-append'])
+        self.assertEqual(gets, len(self._dummy_api.commands))
+        metrics = self._service.get_metrics()
+        self.assertEqual(2, metrics['requests'])
+        self.assertEqual(1, metrics['project_loads'])
+        self.assertEqual(gets, metrics['objects']['misses'])
+
+        self._service.invalidate_config()
+        self._service.invalidate_objects()
+        self._service.run('plan', ['var-append'])
+        self.assertEqual(2, self._service.get_metrics()['project_loads'])
+        self.assertGreater(len(self._dummy_api.commands), gets)
+
+    def test_plan_changes(self):
+        state = [{'context': 'var-append', 'namespace': 'oc-project', 'fqn': 'ConfigMap/config', 'hash': 'old'}]
+        self._dummy_api.respond(['get', 'ConfigMap/octoploy-state', '-o', 'json'], json.dumps(
+            {'kind': 'ConfigMap', 'apiVersion': 'v1', 'data': {'state': json.dumps(state)}}))
+        self._dummy_api.respond(['get', 'ConfigMap/config', '-o', 'json'], json.dumps(
+            {'kind': 'ConfigMap', 'apiVersion': 'v1', 'metadata': {'name': 'config'}, 'data': {'a': 'old'}}))
+
+        result = self._service.run('plan', ['var-append'])
+        self.assertEqual('ok', result['status'])
+        self.assertEqual(1, len(result['changes']))
+        self.assertEqual('ConfigMap/config', result['changes'][0]['name'])
+        self.assertIn({'op': 'remove', 'path': 'data.a', 'old': 'old'}, result['changes'][0]['changes'])
+
+    def test_error(self):
+        result = self._service.run('plan', ['does-not-exist'])
+        self.assertEqual('error', result['status'])
+        self.assertEqual(1, self._service.get_metrics()['errors'])
+        with self.assertRaises(ValueError):
+            self._service.run('delete', [])
+
+    def test_http(self):
+        server = DeployServer(self._service, port=0)
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        try:
+            address = server.get_address()
+            request = Request(address + '/plan/var-append', data=json.dumps({'env': ['A=B']}).encode('utf-8'))
+            with urlopen(request) as response:
+                result = json.loads(response.read())
+            self.assertEqual(['var-append'], result['apps'])
+
+            with urlopen(Request(address + '/invalidate/objects', data=b'')) as response:
+                self.assertEqual(200, response.status)
+            with urlopen(address + '/metrics') as response:
+                self.assertEqual(0, json.loads(response.read())['objects']['cached'])
+        finally:
+            server.shutdown()
+            thread.join()
+
+    def test_http_while_busy(self):
+        server = DeployServer(self._service, port=0)
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        try:
+            address = server.get_address()
+            # Simulates a long running deployment
+            with self._service._lock:
+                with urlopen(address + '/health', timeout=5) as response:
+                    self.assertEqual(200, response.status)
+                with urlopen(address + '/metrics', timeout=5) as response:
+                    self.assertEqual(0, json.loads(response.read())['requests'])
+        finally:
+            server.shutdown()
+            thread.join()
+
+    def test_socket_path_not_a_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'octoploy.sock')
+            with open(path, 'w') as f:
+                f.write('data')
+            with self.assertRaises(FileExistsError):
+                DeployServer(self._service, socket_path=path)
+            self.assertTrue(os.path.isfile(path))
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from octoploy.deploy.DeploymentBundle import DeploymentBundle
+from octoploy.processing.DataPreProcessor import DataPreProcessor
+
+
+class DeploymentBundleTest(TestCase):
+
+    @staticmethod
+    def _create_deployment(container: str) -> dict:
+        return {'kind': 'Deployment', 'apiVersion': 'apps/v1', 'metadata': {'name': 'app'},
+                'spec': {'template': {'spec': {'containers': [{'name': container}]}}}}
+
+    def test_merge(self):
+        bundle = DeploymentBundle(DataPreProcessor())
+        bundle.add_object(self._create_deployment('a'), None)
+        bundle.add_object({'kind': 'ConfigMap', 'apiVersion': 'v1', 'metadata': {'name': 'app'}}, None)
+        bundle.add_object(self._create_deployment('b'), None)
+
+        self.assertEqual(2, len(bundle.objects))
+        containers = bundle.objects[0].data['spec']['template']['spec']['containers']
+        self.assertEqual(['a', 'b'], [x['name'] for x in containers])
+
+    def test_duplicates(self):
+        bundle = DeploymentBundle(DataPreProcessor())
+        for i in range(3):
+            bundle.add_object({'kind': 'ConfigMap', 'apiVersion': 'v1', 'metadata': {'name': 'cm'},
+                               'data': {'i': str(i)}}, None)
+        # Objects which can't be merged are kept
+        self.assertEqual(3, len(bundle.objects))
+
+        first = bundle.objects[0]
+        bundle.remove_objects([first])
+        self.assertEqual(2, len(bundle.objects))
+        self.assertNotIn(first, bundle.objects)
+
+        bundle.add_object(self._create_deployment('a'), None)
+        self.assertEqual(3, len(bundle.objects))
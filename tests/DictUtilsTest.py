@@ -36,3 +36,10 @@ class DictUtilsTest(TestCase):
         obj = {}
         DictUtils.set(obj, 'a', 2)
         self.assertEqual(2, DictUtils.get(obj, 'a'))
+
+    def test_copy_tree(self):
+        obj = {'a': [{'b': 'c'}], 'd': 1}
+        copy = DictUtils.copy_tree(obj)
+        self.assertEqual(obj, copy)
+        copy['a'][0]['b'] = 'other'
+        self.assertEqual('c', obj['a'][0]['b'])
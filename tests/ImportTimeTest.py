@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+class ImportTimeTest(TestCase):
+    """
+    Guards the startup time of the cli
+    """
+
+    MAX_IMPORT_SECONDS = 1.0
+
+    def _run(self, code: str) -> str:
+        return subprocess.check_output([sys.executable, '-c', code], text=True).strip()
+
+    def test_cli_imports_lazily(self):
+        loaded = self._run('import sys, octoploy.octoploy\n'
+                           'print(",".join(sorted(sys.modules)))').split(',')
+        for module in ['Crypto', 'yaml', 'octoploy.config.Config', 'octoploy.deploy.AppDeploy',
+                       'octoploy.backup.BackupGenerator', 'octoploy.converter.HelmToOcto',
+                       'octoploy.state.StateMover']:
+            self.assertNotIn(module, loaded)
+
+    def test_crypto_only_loaded_on_use(self):
+        loaded = self._run('import sys, octoploy.config.Config, octoploy.deploy.AppDeploy\n'
+                           'print(",".join(sorted(sys.modules)))').split(',')
+        self.assertNotIn('Crypto', loaded)
+
+    def test_import_time(self):
+        seconds = float(self._run('import time\n'
+                                  'start = time.perf_counter()\n'
+                                  'import octoploy.octoploy\n'
+                                  'print(time.perf_counter() - start)'))
+        self.assertLess(seconds, self.MAX_IMPORT_SECONDS)
@@ -1,3 +1,4 @@
+import json
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -70,11 +71,59 @@ class K8sObjectDiffTest(TestCase):
         for args in mock_print.call_args_list:
             stdout_lines += ColorFormatter.decolorize(str(args.args[0])) + '\n'
 
+        # Lists are aligned by their common items
         self.assertIn('+ spec.add.[2] = c', stdout_lines)
-        self.assertIn('~ spec.change.[1] = b -> c', stdout_lines)
-        self.assertIn('~ spec.change.[2] = c -> d', stdout_lines)
-        self.assertIn('~ spec.remove.[1] = b -> c', stdout_lines)
-        self.assertIn('- spec.remove.[2] = c', stdout_lines)
+        self.assertIn('- spec.change.[1] = b', stdout_lines)
+        self.assertIn('+ spec.change.[2] = d', stdout_lines)
+        self.assertIn('- spec.remove.[1] = b', stdout_lines)
+        self.assertNotIn('spec.remove.[2]', stdout_lines)
+
+    def test_identity_keys(self):
+        a = {'spec': {'env': [{'name': 'A', 'value': '1'}, {'name': 'B', 'value': '2'}]}}
+        b = {'spec': {'env': [{'name': 'NEW', 'value': '0'}, {'name': 'A', 'value': '1'},
+                              {'name': 'B', 'value': '3'}]}}
+
+        change_set = K8sObjectDiff(DummyK8sApi()).diff_data(a, b, name='ConfigMap/a')
+        self.assertEqual([
+            {'op': 'add', 'path': 'spec.env.[0].name', 'new': 'NEW'},
+            {'op': 'add', 'path': 'spec.env.[0].value', 'new': '0'},
+            {'op': 'change', 'path': 'spec.env.[2].value', 'old': '2', 'new': '3'},
+        ], change_set.to_dict()['changes'])
+
+        data = json.loads(change_set.to_json())
+        self.assertEqual('ConfigMap/a', data['name'])
+        self.assertEqual(['spec.env'], data['sections'])
+
+    @patch('builtins.print')
+    def test_changed_sections(self, mock_print):
+        api = DummyK8sApi()
+        a = BaseObj({
+            'kind': 'Deployment',
+            'apiVersion': 'apps/v1',
+            'spec': {
+                'replicas': 1,
+                'template': {'spec': {'containers': [{'name': 'a', 'image': 'a:1'}]}},
+            }
+        })
+        b = BaseObj({
+            'kind': 'Deployment',
+            'apiVersion': 'apps/v1',
+            'spec': {
+                'replicas': 1,
+                'template': {'spec': {'containers': [{'name': 'a', 'image': 'a:2'}]}},
+            }
+        })
+
+        K8sObjectDiff(api).print(a, b)
+
+        stdout_lines = []
+        for args in mock_print.call_args_list:
+            stdout_lines.append(ColorFormatter.decolorize(str(args.args[0])))
+
+        self.assertEqual([
+            '  changed sections: spec.template',
+            '~ spec.template.spec.containers.[0].image = a:1 -> a:2',
+        ], stdout_lines)
 
     def test_diff(self):
         api = DummyK8sApi()
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from octoploy.deploy.ObjectGraph import ObjectGraph
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.utils.Errors import ConfigError
+
+
+class ObjectGraphTest(TestCase):
+
+    @staticmethod
+    def _create(kind: str, name: str, depends_on: str = None, api_version: str = 'v1') -> BaseObj:
+        data = {'kind': kind, 'apiVersion': api_version, 'metadata': {'name': name}}
+        if depends_on is not None:
+            data['metadata']['annotations'] = {ObjectGraph.DEPENDS_ON_ANNOTATION: depends_on}
+        return BaseObj(data)
+
+    def _get_waves(self, objects):
+        return [[x.get_fqn() for x in wave] for wave in ObjectGraph(objects).get_waves()]
+
+    def test_kind_priorities(self):
+        objects = [
+            self._create('Deployment', 'app'),
+            self._create('Ingress', 'app'),
+            self._create('ConfigMap', 'a'),
+            self._create('Service', 'app'),
+            self._create('ConfigMap', 'b'),
+            self._create('ProviderConfig', 'default'),
+        ]
+        self.assertEqual([['ConfigMap/a', 'ConfigMap/b'],
+                          ['Service/app'],
+                          ['ProviderConfig/default'],
+                          ['Deployment/app'],
+                          ['Ingress/app']], self._get_waves(objects))
+
+    def test_depends_on(self):
+        objects = [
+            self._create('Deployment', 'app', depends_on='Deployment/db, Secret/external'),
+            self._create('Deployment', 'db'),
+            self._create('Deployment', 'other'),
+        ]
+        self.assertEqual([['Deployment/db', 'Deployment/other'],
+                          ['Deployment/app']], self._get_waves(objects))
+
+    def test_depends_on_later_kind(self):
+        # The kind priorities are only a default, explicit dependencies win
+        objects = [
+            self._create('Kafka', 'k', depends_on='Deployment.apps/operator', api_version='kafka.strimzi.io/v1beta2'),
+            self._create('Deployment', 'operator', api_version='apps/v1'),
+            self._create('Ingress', 'web', api_version='networking.k8s.io/v1'),
+            self._create('ConfigMap', 'config'),
+        ]
+        self.assertEqual([['ConfigMap/config'],
+                          ['Deployment.apps/operator'],
+                          ['Kafka.kafka.strimzi.io/k'],
+                          ['Ingress.networking.k8s.io/web']], self._get_waves(objects))
+
+    def test_depends_on_without_group(self):
+        objects = [
+            self._create('Deployment', 'app', depends_on='Deployment/db', api_version='apps/v1'),
+            self._create('Deployment', 'db', api_version='apps/v1'),
+        ]
+        self.assertEqual([['Deployment.apps/db'], ['Deployment.apps/app']], self._get_waves(objects))
+
+    def test_cycle(self):
+        objects = [
+            self._create('ConfigMap', 'a', depends_on='ConfigMap/b'),
+            self._create('ConfigMap', 'b', depends_on='Deployment/app'),
+            self._create('Deployment', 'app', depends_on='ConfigMap/a'),
+        ]
+        with self.assertRaises(ConfigError):
+            ObjectGraph(objects).get_waves()
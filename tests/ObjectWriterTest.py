@@ -0,0 +1,69 @@
+import datetime
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from octoploy.deploy.ObjectWriter import ObjectWriter
+from octoploy.k8s.BaseObj import BaseObj
+
+
+class ObjectWriterTest(TestCase):
+
+    @staticmethod
+    def _create(kind: str, name: str) -> BaseObj:
+        return BaseObj({'kind': kind, 'apiVersion': 'v1', 'metadata': {'name': name}})
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ObjectWriter()
+
+    def test_remove_stale_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = ObjectWriter.create(tmp_dir, 'object')
+            writer.write('app', [self._create('ConfigMap', 'a'), self._create('ConfigMap', 'b')])
+            writer.write('old-app', [self._create('ConfigMap', 'c')])
+            writer.close()
+            # Files added by the user are kept
+            with open(os.path.join(tmp_dir, 'app', 'custom.yml'), 'w') as f:
+                f.write('keep')
+
+            writer = ObjectWriter.create(tmp_dir, 'object')
+            writer.write('app', [self._create('ConfigMap', 'a')])
+            writer.close()
+            self.assertEqual(['.octoploy-output', 'app'], sorted(os.listdir(tmp_dir)))
+            self.assertEqual(['ConfigMap_a.yml', 'custom.yml'], sorted(os.listdir(os.path.join(tmp_dir, 'app'))))
+
+            writer = ObjectWriter.create(tmp_dir, 'app')
+            writer.write('app', [self._create('ConfigMap', 'a')])
+            writer.write('other', [self._create('ConfigMap', 'b')])
+            writer.close()
+            writer = ObjectWriter.create(tmp_dir, 'app')
+            writer.write('app', [self._create('ConfigMap', 'a')])
+            writer.close()
+            self.assertEqual(['.octoploy-output', 'app', 'app.yml'], sorted(os.listdir(tmp_dir)))
+            self.assertEqual(['custom.yml'], os.listdir(os.path.join(tmp_dir, 'app')))
+
+    def test_foreign_directory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'deployment.yml')
+            with open(path, 'w') as f:
+                f.write('kind: Deployment')
+
+            for layout in ('app', 'object'):
+                with self.assertRaises(FileExistsError):
+                    ObjectWriter.create(tmp_dir, layout)
+            with open(path) as f:
+                self.assertEqual('kind: Deployment', f.read())
+
+    def test_json_lines_dates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'out.jsonl')
+            k8s_object = self._create('ConfigMap', 'a')
+            k8s_object.data['data'] = {'date': datetime.date(2024, 1, 2)}
+            writer = ObjectWriter.create(path, 'jsonl')
+            writer.write('app', [k8s_object])
+            writer.close()
+            with open(path) as f:
+                data = json.loads(f.readline())
+            self.assertEqual('2024-01-02', data['data']['date'])
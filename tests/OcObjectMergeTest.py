@@ -156,3 +156,93 @@ spec:
 
         volumes = data['spec']['template']['spec']['volumes']
         self.assertEqual(2, len(volumes))
+
+    def test_keyed_lists(self):
+        existing = '''kind: Deployment
+apiVersion: v1
+metadata:
+  name: app
+spec:
+  template:
+    spec:
+      containers:
+        - name: app
+          env:
+            - name: A
+              value: "1"
+            - name: B
+              value: "2"
+          ports:
+            - containerPort: 8080
+          volumeMounts:
+            - name: data
+              mountPath: /data
+'''
+        new = '''kind: Deployment
+apiVersion: v1
+metadata:
+  name: app
+spec:
+  template:
+    spec:
+      containers:
+        - name: app
+          env:
+            - name: B
+              value: "3"
+            - name: C
+              value: "4"
+          ports:
+            - containerPort: 8080
+              name: http
+            - containerPort: 9090
+          volumeMounts:
+            - name: data
+              mountPath: /data
+'''
+        data = yaml.safe_load(existing)
+        K8sObjectMerge().merge(BaseObj(data), BaseObj(yaml.safe_load(new)))
+
+        container = data['spec']['template']['spec']['containers'][0]
+        self.assertEqual([{'name': 'A', 'value': '1'}, {'name': 'B', 'value': '3'}, {'name': 'C', 'value': '4'}],
+                         container['env'])
+        self.assertEqual([{'containerPort': 8080, 'name': 'http'}, {'containerPort': 9090}], container['ports'])
+        self.assertEqual(1, len(container['volumeMounts']))
+
+    def test_port_protocols(self):
+        existing = '''kind: Deployment
+apiVersion: v1
+metadata:
+  name: dns
+spec:
+  template:
+    spec:
+      containers:
+        - name: dns
+          ports:
+            - containerPort: 53
+'''
+        new = '''kind: Deployment
+apiVersion: v1
+metadata:
+  name: dns
+spec:
+  template:
+    spec:
+      containers:
+        - name: dns
+          ports:
+            - containerPort: 53
+              protocol: UDP
+              name: dns-udp
+            - containerPort: 53
+              protocol: TCP
+              name: dns-tcp
+'''
+        data = yaml.safe_load(existing)
+        K8sObjectMerge().merge(BaseObj(data), BaseObj(yaml.safe_load(new)))
+
+        # The protocol defaults to TCP, the UDP port is a separate item
+        container = data['spec']['template']['spec']['containers'][0]
+        self.assertEqual([{'containerPort': 53, 'name': 'dns-tcp', 'protocol': 'TCP'},
+                          {'containerPort': 53, 'protocol': 'UDP', 'name': 'dns-udp'}], container['ports'])
@@ -2,6 +2,7 @@ import json
 import os
 from typing import List
 from unittest import TestCase
+from unittest.mock import patch
 
 import yaml
 
@@ -9,6 +10,7 @@ import octoploy.octoploy
 from octoploy.config.Config import RunMode, RootConfig
 from octoploy.state.StateMover import StateMover
 from octoploy.state.StateTracking import StateTracking, ObjectState
+from octoploy.utils.Git import Git
 from tests import TestUtils
 from tests.TestUtils import DummyK8sApi
 
@@ -113,6 +115,18 @@ class StateTrackingTest(TestCase):
                 {'context': 'ABC', 'fqn': 'Deployment/ABC', 'hash': 'e2e4634c5cd31a1b58da917e8b181b28', 'namespace': 'oc-project'}
             ], state_update.stdin)
 
+    def test_delete_order(self):
+        """
+        Deletes the objects in reverse deploy order, the deployment is removed before its config map
+        """
+        self._dummy_api.respond(['get', 'ConfigMap/octoploy-state', '-o', 'json'], '{"kind": "", "apiVersion": ""}')
+        self._mode.delete = True
+
+        octoploy.octoploy._run_app_deploy('app_deploy_test', 'app', self._mode)
+
+        deletes = [x.args for x in self._dummy_api.commands if x.args[0] == 'delete']
+        self.assertEqual([['delete', 'Deployment/ABC'], ['delete', 'ConfigMap/test-config']], deletes)
+
     def test_duplicate_kinds(self):
         self._dummy_api.respond(['get', 'Deployment/ABC', '-o', 'json'], '', error=Exception('NotFound'))
         self._dummy_api.respond(['get', 'ConfigMap/octoploy-state', '-o', 'json'], '{"kind": "", "apiVersion": ""}')
@@ -134,6 +148,29 @@ class StateTrackingTest(TestCase):
                                 "namespace": "oc-project",
                                 }], state_update.stdin)
 
+    def test_concurrent_objects(self):
+        """
+        Deploys the objects of a wave concurrently, the state has to contain all of them
+        """
+        self._dummy_api.not_found_by_default()
+        self._dummy_api.respond(['get', 'ConfigMap/octoploy-state', '-o', 'json'], '{"kind": "", "apiVersion": ""}')
+        self._mode.object_jobs = 0
+
+        octoploy.octoploy._run_app_deploy('app_deploy_test_duplicate_kinds', 'app', self._mode)
+
+        state_update = self._dummy_api.commands[-1]
+        self.assertEqual(['apply', '-f', '-'], state_update.args)
+        self.assertStateEqual([{"context": "app",
+                                "hash": "aa859898df4ff9412857e720beeabfba",
+                                "fqn": "ProviderConfig.kubernetes.crossplane.io/default",
+                                "namespace": "oc-project",
+                                },
+                               {"context": "app",
+                                "hash": "8652aee0d35b000096f2a263c6e3eb77",
+                                "fqn": "ProviderConfig.grafana.crossplane.io/default",
+                                "namespace": "oc-project",
+                                }], state_update.stdin)
+
     def test_deploy_all_then_app(self):
         """
         Deploys an entire folder, then a single app and makes
@@ -171,6 +208,46 @@ class StateTrackingTest(TestCase):
         new_state = yaml.safe_load(state_update.stdin)
         self.assertEqual(current_state, new_state)
 
+    def test_concurrent_apps(self):
+        """
+        Deploys the apps of a wave concurrently, all of them share the state
+        """
+        self._dummy_api.not_found_by_default()
+        os.environ['OCTOPLOY_KEY'] = TestUtils.OCTOPLOY_KEY
+        octoploy.octoploy._run_apps_deploy('app_deploy_test', self._mode)
+        expected = yaml.safe_load(self._dummy_api.commands[-1].stdin)
+
+        self._dummy_api.commands = []
+        octoploy.octoploy._run_apps_deploy('app_deploy_test', self._mode, app_jobs=0)
+        state_update = self._dummy_api.commands[-1]
+        self.assertEqual(['apply', '-f', '-'], state_update.args)
+        self.assertStateEqual(yaml.safe_load(expected['data']['state']), state_update.stdin)
+
+    def test_deploy_changed_since(self):
+        """
+        Deploys an entire folder, then only the changed apps and makes
+        sure the objects of the skipped apps are neither removed from k8s nor from the state
+        """
+        self._dummy_api.not_found_by_default()
+
+        os.environ['OCTOPLOY_KEY'] = TestUtils.OCTOPLOY_KEY
+        octoploy.octoploy._run_apps_deploy('app_deploy_test', self._mode)
+        state_update = self._dummy_api.commands[-1]
+
+        current_state = yaml.safe_load(state_update.stdin)
+        self._dummy_api.respond(['get', 'ConfigMap/octoploy-state', '-o', 'json'], json.dumps(current_state))
+        self._dummy_api.respond(['get', 'ConfigMap/config', '-o', 'json'], '{"kind": "", "apiVersion": ""}')
+        self._dummy_api.commands = []
+        changed = {os.path.realpath(os.path.join(self._base_path, 'app_deploy_test', 'cm-types', 'config.yml'))}
+        with patch.object(Git, 'get_changed_files', return_value=changed):
+            octoploy.octoploy._run_apps_deploy('app_deploy_test', self._mode, 'HEAD')
+
+        self.assertEqual([], [x for x in self._dummy_api.commands if x.args[0] == 'delete'])
+        self.assertEqual(3, len(self._dummy_api.commands))
+        state_update = self._dummy_api.commands[-1]
+        new_state = yaml.safe_load(state_update.stdin)
+        self.assertEqual(current_state, new_state)
+
     def test_deploy_all_twice(self):
         """
         Deploys an entire folder twice and validates that the objects don't get removed again from k8s
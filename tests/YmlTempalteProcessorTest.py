@@ -162,3 +162,26 @@ name: hello
         proc.process(BaseObj(data))
         self.assertEqual('hello', data['root']['item'])
         self.assertEqual('value', data['root']['someKey'])
+
+    def test_replacements_cached(self):
+        with mock.patch('builtins.open', mock.mock_open(read_data='''
+name: hello
+vars:
+    MY_VAR: ${APP_NAME}-val
+''')):
+            app_config = AppConfig('', '')
+
+        proc = YmlTemplateProcessor(app_config)
+        with mock.patch.object(app_config, 'get_replacements', wraps=app_config.get_replacements) as get_replacements:
+            for _ in range(3):
+                data = {
+                    'kind': 'Test',
+                    'apiVersion': 'v1',
+                    'root': '${MY_VAR}',
+                    'missing': '${nonExistent}${nonExistent}'
+                }
+                with mock.patch.object(proc.log, 'warning') as warning:
+                    proc.process(BaseObj(data))
+                warning.assert_called_once_with("The following vars are not defined: ['nonExistent']")
+                self.assertEqual('hello-val', data['root'])
+            self.assertEqual(1, get_replacements.call_count)
@@ -0,0 +1,33 @@
+import os
+from unittest import TestCase
+
+from octoploy.config.AppDependencies import AppDependencies
+from octoploy.config.Config import RootConfig
+
+
+class AppDependenciesTest(TestCase):
+
+    def setUp(self) -> None:
+        self._path = os.path.realpath(os.path.join(os.path.dirname(__file__), os.pardir, 'app_deploy_test'))
+        self._root = RootConfig.load(self._path)
+        self._apps = self._root.load_app_configs()
+        self._deps = AppDependencies(self._root)
+
+    def _affected(self, *files: str):
+        changed = set(os.path.join(self._path, file) for file in files)
+        return sorted(x.get_name() for x in self._deps.get_affected(self._apps, changed))
+
+    def test_app_folder(self):
+        self.assertEqual(['cm-types'], self._affected('cm-types/config.yml'))
+        # Deleted files are detected as well
+        self.assertEqual(['cm-types'], self._affected('cm-types/removed.yml'))
+
+    def test_template(self):
+        self.assertEqual(['ABC'], self._affected('app-template/test.txt'))
+        self.assertEqual(['ABC', 'for-each-test'], self._affected('app-template-2/test.yml'))
+
+    def test_root(self):
+        self.assertEqual(len(self._apps), len(self._affected('_root.yml')))
+
+    def test_unrelated(self):
+        self.assertEqual([], self._affected('README.md', 'cm-types-other/file.yml'))
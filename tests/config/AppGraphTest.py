@@ -0,0 +1,54 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.config.AppGraph import AppGraph
+from octoploy.config.Config import RootConfig, RunMode
+from octoploy.deploy.AppScheduler import AppScheduler
+from octoploy.utils.Errors import ConfigError
+
+
+class AppGraphTest(TestCase):
+
+    def setUp(self) -> None:
+        path = os.path.join(os.path.dirname(__file__), os.pardir, 'app_deploy_test')
+        self._root = RootConfig.load(path)
+        self._apps = [self._root.load_app_config(x) for x in ['app', 'cm-types', 'var-append']]
+
+    def _depend(self, app: int, dependencies):
+        return patch.object(self._apps[app], 'get_dependencies', return_value=dependencies)
+
+    def _get_waves(self):
+        return [[AppGraph.get_dir_name(x) for x in wave] for wave in AppGraph(self._root, self._apps).get_waves()]
+
+    def test_waves(self):
+        with self._depend(0, ['var-append']), self._depend(1, ['app', 'secrets']):
+            self.assertEqual([['var-append'], ['app'], ['cm-types']], self._get_waves())
+        self.assertEqual([['app', 'cm-types', 'var-append']], self._get_waves())
+
+    def test_errors(self):
+        with self._depend(0, ['does-not-exist']):
+            with self.assertRaises(ConfigError):
+                self._get_waves()
+
+        with self._depend(0, ['var-append']), self._depend(2, ['app']):
+            with self.assertRaises(ConfigError):
+                self._get_waves()
+
+    def test_failed_dependency(self):
+        deployed = []
+
+        def deploy(app_config):
+            name = AppGraph.get_dir_name(app_config)
+            if name == 'var-append':
+                return ValueError('failed')
+            deployed.append(name)
+
+        mode = RunMode()
+        mode.dry_run = True
+        scheduler = AppScheduler(self._root, mode, jobs=0)
+        with self._depend(0, ['var-append']), patch.object(scheduler, '_deploy_app', side_effect=deploy):
+            with self.assertRaises(ValueError):
+                scheduler.deploy(self._apps)
+        # The app depending on the failed app got skipped, the other app is still deployed
+        self.assertEqual(['cm-types'], deployed)
@@ -0,0 +1,41 @@
+import os
+from unittest import TestCase
+
+from octoploy.config.Config import RootConfig
+from octoploy.config.LibraryRegistry import LibraryRegistry
+from octoploy.utils.Errors import ConfigError
+
+
+class LibraryRegistryTest(TestCase):
+
+    def setUp(self) -> None:
+        self._base_path = os.path.join(os.path.dirname(__file__), os.pardir)
+        LibraryRegistry._instance = None
+
+    def test_shared(self):
+        root = RootConfig.load(os.path.join(self._base_path, 'lib-usage'))
+        root2 = RootConfig.load(os.path.join(self._base_path, 'lib-usage'))
+        library = root._libraries[0].get_library()
+        self.assertIs(library, root2._libraries[0].get_library())
+        self.assertIsNot(root._libraries[0], root2._libraries[0])
+        self.assertTrue(library.is_library())
+
+        # Libraries never talk to the cluster
+        self.assertIsNone(library._k8s_api)
+        self.assertIsNone(library._state)
+
+    def test_flags_per_project(self):
+        # Both projects use the same library, but only one disables an app of it
+        with_flags = RootConfig.load(os.path.join(self._base_path, 'lib-usage-flags'))
+        without_flags = RootConfig.load(os.path.join(self._base_path, 'lib-usage'))
+        self.assertFalse(with_flags.load_app_config('var-loader-app').enabled())
+        self.assertTrue(without_flags.load_app_config('var-loader-app').enabled())
+        self.assertFalse(with_flags.load_app_config('var-loader-app').enabled())
+
+    def test_not_a_library(self):
+        with self.assertRaises(ConfigError):
+            LibraryRegistry.shared().get(os.path.join(self._base_path, 'app_deploy_test'), RootConfig.load)
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            LibraryRegistry.shared().get(os.path.join(self._base_path, 'missing'), RootConfig.load)
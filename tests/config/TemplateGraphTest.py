@@ -0,0 +1,38 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.config.Config import RootConfig
+from octoploy.config.TemplateGraph import TemplateGraph
+from octoploy.utils.Errors import ConfigError
+
+
+class TemplateGraphTest(TestCase):
+
+    def setUp(self) -> None:
+        path = os.path.join(os.path.dirname(__file__), os.pardir, 'app_deploy_test')
+        self._root = RootConfig.load(path)
+
+    def test_resolve(self):
+        graph = self._root.get_template_graph()
+        templates = graph.resolve(['app-template'])
+        self.assertEqual(['app-template'], [x.name for x in templates])
+        self.assertEqual(['app-template-2'], [x.name for x in templates[0].pre])
+
+        # Each template is only loaded once
+        self.assertIs(templates[0].pre[0], graph.resolve(['app-template-2'])[0])
+        self.assertIs(self._root.load_app_config('app-template'), templates[0].config)
+
+        order = graph.get_order(['app-template', 'app-template-2'])
+        self.assertEqual(['app-template-2', 'app-template'], [x.name for x in order])
+
+    def test_not_a_template(self):
+        with self.assertRaises(ValueError):
+            self._root.get_template_graph().resolve(['app'])
+
+    def test_cycle(self):
+        template = self._root.load_app_config('app-template-2')
+        with patch.object(template, 'get_post_template_refs', return_value=['app-template']):
+            with self.assertRaises(ConfigError) as ctx:
+                TemplateGraph(self._root).resolve(['app-template'])
+        self.assertIn('app-template -> app-template-2 -> app-template', str(ctx.exception))
@@ -0,0 +1,29 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.utils.YmlWriter import YmlWriter
+
+
+class BaseObjTest(TestCase):
+
+    def test_serialize_once(self):
+        obj = BaseObj({'kind': 'ConfigMap', 'apiVersion': 'v1', 'data': {'a': 'b'}})
+        with patch.object(YmlWriter, 'dump', wraps=YmlWriter.dump) as dump:
+            obj.get_hash()
+            obj.as_string()
+            obj.get_hash()
+            self.assertEqual(1, dump.call_count)
+
+    def test_invalidate(self):
+        obj = BaseObj({'kind': 'ConfigMap', 'apiVersion': 'v1', 'metadata': {}, 'data': {'a': 'b'}})
+        hash_val = obj.get_hash()
+
+        obj.data['data']['a'] = 'c'
+        obj.refresh()
+        self.assertNotEqual(hash_val, obj.get_hash())
+
+        hash_val = obj.get_hash()
+        obj.set_namespace('other')
+        self.assertNotEqual(hash_val, obj.get_hash())
+        self.assertIn('other', obj.as_string())
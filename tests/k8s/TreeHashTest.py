@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from octoploy.k8s.TreeHash import TreeHash
+
+
+class TreeHashTest(TestCase):
+
+    def test_equal(self):
+        tree_hash = TreeHash()
+        a = {'spec': {'b': [1, {'c': 'd'}], 'a': True}}
+        b = {'spec': {'a': True, 'b': [1, {'c': 'd'}]}}
+        self.assertTrue(tree_hash.equal(a, b))
+        self.assertFalse(tree_hash.equal(a, {'spec': {'a': True, 'b': [1, {'c': 'e'}]}}))
+        self.assertFalse(tree_hash.equal({'a': 1}, {'a': '1'}))
+        self.assertFalse(tree_hash.equal([1, 2], [2, 1]))
+
+    def test_changed_paths(self):
+        tree_hash = TreeHash()
+        a = {
+            'metadata': {'name': 'a'},
+            'spec': {'replicas': 1, 'template': {'spec': {'image': 'a'}}},
+            'data': {'x': '1'},
+        }
+        b = {
+            'metadata': {'name': 'a'},
+            'spec': {'replicas': 1, 'template': {'spec': {'image': 'b'}}},
+            'data': {'x': '1', 'y': '2'},
+        }
+        self.assertEqual(['data.y', 'spec.template'], tree_hash.changed_paths(a, b))
+        self.assertEqual(['data', 'spec'], tree_hash.changed_paths(a, b, depth=1))
+        self.assertEqual([], tree_hash.changed_paths(a, a))
@@ -0,0 +1,77 @@
+from unittest import TestCase, mock
+
+from octoploy.config.Config import AppConfig
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.processing.TemplatePlan import TemplatePlan
+from octoploy.processing.TemplateString import TemplateString
+from octoploy.processing.YmlTemplateProcessor import YmlTemplateProcessor
+from octoploy.utils.DictUtils import DictUtils
+
+
+def _create_processor(app_name: str) -> YmlTemplateProcessor:
+    with mock.patch('builtins.open', mock.mock_open(read_data=f'''
+name: {app_name}
+vars:
+    IMAGE: image
+    OBJ:
+        key: value
+''')):
+        return YmlTemplateProcessor(AppConfig('', ''))
+
+
+class TemplatePlanTest(TestCase):
+    doc = {
+        'kind': 'Deployment',
+        'apiVersion': 'v1',
+        'metadata': {'name': '${APP_NAME}'},
+        'spec': {
+            'escaped': '$$HOME',
+            'image': '${IMAGE}:latest',
+            'items': ['${OBJ}', 'static', '${MISSING}'],
+        }
+    }
+
+    def test_equal_to_processing(self):
+        plan = TemplatePlan.compile(self.doc)
+        self.assertEqual(('APP_NAME', 'IMAGE', 'OBJ', 'MISSING'), plan.var_names)
+        self.assertEqual('$HOME', plan.skeleton['spec']['escaped'])
+
+        processor = _create_processor('app')
+        expected = DictUtils.copy_tree(self.doc)
+        processor.process(BaseObj(expected))
+        self.assertEqual(expected, processor.render(plan))
+        self.assertEqual('${APP_NAME}', self.doc['metadata']['name'])
+
+    def test_memoized(self):
+        plan = TemplatePlan.compile(self.doc)
+        data = _create_processor('app').render(plan)
+        self.assertEqual('app', data['metadata']['name'])
+
+        with mock.patch.object(TemplateString, 'render') as render:
+            # Same values -> rendered from the memo
+            data2 = _create_processor('app').render(plan)
+            render.assert_not_called()
+        self.assertEqual(data, data2)
+        self.assertIsNot(data, data2)
+        self.assertEqual('other', _create_processor('other').render(plan)['metadata']['name'])
+
+        data['spec']['items'][0]['key'] = 'changed'
+        self.assertEqual('value', _create_processor('app').render(plan)['spec']['items'][0]['key'])
+
+    def test_missing_params(self):
+        plan = TemplatePlan.compile(self.doc)
+        missing = []
+        plan.render({}, missing)
+        self.assertEqual(['APP_NAME', 'IMAGE', 'OBJ', 'MISSING'], missing)
+
+        # Memoized renders report the missing vars as well
+        missing = []
+        plan.render({}, missing)
+        self.assertEqual(['APP_NAME', 'IMAGE', 'OBJ', 'MISSING'], missing)
+
+    def test_merge(self):
+        doc = {'kind': 'Test', 'apiVersion': 'v1', 'spec': {'_merge': '${OBJ}'}}
+        plan = TemplatePlan.compile(doc)
+        self.assertIsNone(plan.holes)
+        self.assertEqual({'key': 'value'}, _create_processor('app').render(plan)['spec'])
+        self.assertEqual('${OBJ}', doc['spec']['_merge'])
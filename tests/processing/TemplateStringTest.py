@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from octoploy.processing.TemplateString import TemplateString
+
+
+class TemplateStringTest(TestCase):
+
+    def test_compile(self):
+        template = TemplateString.compile('a$$b${VAR}c$d${')
+        self.assertEqual((
+            (TemplateString.LITERAL, 'a$b'),
+            (TemplateString.VAR, 'VAR'),
+            (TemplateString.LITERAL, 'c$d${'),
+        ), template.tokens)
+        self.assertIsNone(template.single_var)
+        self.assertEqual(('VAR',), template.var_names)
+
+        self.assertEqual('VAR', TemplateString.compile('${VAR}').single_var)
+        self.assertIs(TemplateString.compile('${VAR}'), TemplateString.compile('${VAR}'))
+
+    def test_render(self):
+        missing = []
+        replacements = {'A': 'x', 'OBJ': {'a': 1}}
+        self.assertEqual({'a': 1}, TemplateString.compile('${OBJ}').render(replacements, missing))
+        self.assertEqual('x-${B}', TemplateString.compile('${A}-${B}').render(replacements, missing))
+        self.assertEqual(['B'], missing)
+        self.assertRaises(ValueError, TemplateString.compile('a${OBJ}').render, replacements, missing)
@@ -0,0 +1,100 @@
+from typing import Dict, Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.k8s.BaseObj import BaseObj
+from octoploy.processing.TreeWalker import TreeProcessor, TreeWalker
+
+
+class RecordingProcessor(TreeProcessor):
+
+    def __init__(self, name: str, prefixes=None, replacements: Dict[str, any] = None):
+        self.name = name
+        self.value_prefixes = prefixes
+        self.replacements = replacements or {}
+        self.calls = []
+        self.checked = []
+
+    def wants_str(self, value: str, key: str) -> bool:
+        self.checked.append(value)
+        return super().wants_str(value, key)
+
+    def begin(self, k8s_object: BaseObj):
+        self.calls.append('begin')
+
+    def end(self, k8s_object: BaseObj):
+        self.calls.append('end')
+
+    def process_str(self, value: str, parent: Dict[str, any], key: str) -> Optional[any]:
+        self.calls.append(value)
+        if value in self.replacements:
+            return self.replacements[value]
+        return value + '-' + self.name
+
+
+class TreeWalkerTest(TestCase):
+
+    def test_chain_order(self):
+        first = RecordingProcessor('a')
+        second = RecordingProcessor('b')
+        obj = BaseObj({'apiVersion': 'v1', 'kind': 'Test', 'metadata': {'name': 'x'}, 'items': ['1', {'key': '2'}]})
+        TreeWalker([first, second]).process(obj)
+
+        self.assertEqual(['1-a-b', {'key': '2-a-b'}], obj.data['items'])
+        self.assertEqual('Test-a-b', obj.kind)
+        self.assertEqual(['begin', 'v1', 'Test', 'x', '1', '2', 'end'], first.calls)
+        self.assertEqual(['begin', 'v1-a', 'Test-a', 'x-a', '1-a', '2-a', 'end'], second.calls)
+
+    def test_prefixes(self):
+        processor = RecordingProcessor('a', prefixes=('enc:',))
+        data = {'a': 'plain', 'b': ['enc:1', {'c': 'enc:2'}]}
+        TreeWalker(processor).walk(data)
+
+        self.assertEqual({'a': 'plain', 'b': ['enc:1-a', {'c': 'enc:2-a'}]}, data)
+        self.assertEqual(['enc:1', 'enc:2'], processor.calls)
+
+    def test_prescan(self):
+        processor = RecordingProcessor('a', prefixes=('enc:',))
+        obj = BaseObj({'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': 'x'},
+                       'data': {'dashboard': 'plain', 'rules': ['a', 'b']},
+                       'spec': {'value': 'enc:1'}})
+        TreeWalker(processor).process(obj)
+        self.assertEqual('enc:1-a', obj.data['spec']['value'])
+        # Subtrees without markers are not visited
+        self.assertNotIn('plain', processor.checked)
+        self.assertNotIn('a', processor.checked)
+
+        processor = RecordingProcessor('a', prefixes=('enc:',))
+        obj = BaseObj({'apiVersion': 'v1', 'kind': 'ConfigMap', 'data': {'value': 'plain'}})
+        TreeWalker(processor).process(obj)
+        self.assertEqual([], processor.checked)
+
+    def test_prescan_once(self):
+        # Fully templated objects don't pay for the prescan more than once per subtree
+        processor = RecordingProcessor('a', prefixes=('$',))
+        data = {'kind': '$kind', 'metadata': {'name': '$name', 'labels': {'app': '$app'}},
+                'spec': {'items': [{'value': '$1'}, {'value': '$2'}]}}
+        with patch.object(TreeWalker, '_contains_markers', wraps=TreeWalker._contains_markers) as contains:
+            TreeWalker(processor).walk(data, ('$',))
+        self.assertEqual(2, contains.call_count)
+        self.assertEqual('$app-a', data['metadata']['labels']['app'])
+        self.assertEqual([{'value': '$1-a'}, {'value': '$2-a'}], data['spec']['items'])
+
+    def test_replaced_object(self):
+        first = RecordingProcessor('a', replacements={'obj': {'key': 'value'}})
+        second = RecordingProcessor('b')
+        data = {'a': 'obj'}
+        TreeWalker([first, second]).walk(data)
+
+        # The replacement is only processed by the following processors
+        self.assertEqual({'a': {'key': 'value-b'}}, data)
+        self.assertEqual(['obj'], first.calls)
+
+    def test_deep_tree(self):
+        data = {}
+        node = data
+        for i in range(5000):
+            node['child'] = {'value': str(i)}
+            node = node['child']
+        TreeWalker(RecordingProcessor('a')).walk(data)
+        self.assertEqual('4999-a', node['value'])
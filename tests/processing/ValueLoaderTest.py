@@ -1,8 +1,9 @@
 import os
 from unittest import TestCase
+from unittest.mock import patch
 
 from octoploy.config.BaseConfig import BaseConfig
-from octoploy.processing.ValueLoader import ValueLoaderFactory
+from octoploy.processing.ValueLoader import ValueLoaderFactory, FileLoader, CachedFileLoader, LazyLoad, LoaderScope
 
 
 class ValueLoaderTest(TestCase):
@@ -13,6 +14,22 @@ class ValueLoaderTest(TestCase):
         items = loader.load({})
         self.assertTrue(len(items) > 0)
 
+    def test_env_on_demand(self):
+        loader = ValueLoaderFactory().create(BaseConfig(None), 'env')
+        self.assertIsNone(loader.get_keys({}))
+        scope = LoaderScope({'ENV_': 'viaLoader'})
+        scope.add_prefix('ENV_', LazyLoad(loader, {}))
+
+        with patch.dict(os.environ, {'OCTOPLOY_TEST_VAR': 'value'}):
+            self.assertIn('ENV_OCTOPLOY_TEST_VAR', scope)
+            self.assertEqual('value', scope.get('ENV_OCTOPLOY_TEST_VAR').get())
+            # The environment is not copied into the scope
+            self.assertEqual(['ENV_'], list(scope.keys()))
+        self.assertNotIn('ENV_OCTOPLOY_TEST_VAR', scope)
+        self.assertIsNone(scope.get('ENV_OCTOPLOY_TEST_VAR'))
+        with self.assertRaises(KeyError):
+            _ = scope['ENV_OCTOPLOY_TEST_VAR']
+
     def test_file_abspath(self):
         factory = ValueLoaderFactory()
         loader = factory.create(BaseConfig(None), 'file')
@@ -38,3 +55,18 @@ class ValueLoaderTest(TestCase):
         loader = factory.create(BaseConfig(os.path.join(parent, 'tests', 'lib', '_root.yml')), 'file')
         items = loader.load({'file': 'var-loader-app/test.yaml.txt', 'conversion': 'yml'})
         self.assertIsNotNone(items.get('').get('object'))
+
+    def test_file_cached(self):
+        CachedFileLoader._cache.clear()
+        factory = ValueLoaderFactory()
+        parent = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        with patch.object(FileLoader, '_load_file', autospec=True, side_effect=FileLoader._load_file) as load_file:
+            for _ in range(3):
+                loader = factory.create(BaseConfig(os.path.join(parent, 'tests', 'lib', '_root.yml')), 'file')
+                items = loader.load({'file': 'var-loader-app/test.yaml.txt', 'conversion': 'yml'})
+                items.get('')['object'] = 'modified'
+
+            loader.load({'file': 'var-loader-app/test.yaml.txt', 'conversion': 'base64'})
+            self.assertEqual(2, load_file.call_count)
+        items = loader.load({'file': 'var-loader-app/test.yaml.txt', 'conversion': 'yml'})
+        self.assertIsInstance(items.get('').get('object'), dict)
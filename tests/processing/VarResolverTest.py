@@ -0,0 +1,81 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from octoploy.processing.ValueLoader import LazyLoad, LazyValue
+from octoploy.processing.VarResolver import VarResolver
+from octoploy.utils.Errors import ConfigError
+
+
+class VarResolverTest(TestCase):
+
+    def test_chain(self):
+        replacements = {'VAR0': 'end'}
+        for i in range(1, 2000):
+            replacements[f'VAR{i}'] = '${VAR' + str(i - 1) + '}'
+        replacements['OBJ'] = {'item': '${VAR1999}-${MISSING}'}
+        replacements['OBJ_REF'] = '${OBJ}'
+        missing = []
+        resolver = VarResolver(replacements, missing)
+        resolver.resolve()
+
+        self.assertEqual('end', resolver['VAR1999'])
+        self.assertEqual({'item': 'end-${MISSING}'}, resolver['OBJ_REF'])
+        self.assertEqual(['MISSING'], missing)
+        # The definitions stay untouched
+        self.assertEqual('${VAR1998}', replacements['VAR1999'])
+
+    def test_escaped(self):
+        resolver = VarResolver({'A': 'a$${B}', 'B': 'b'}, [])
+        resolver.resolve()
+        self.assertEqual('a${B}', resolver['A'])
+
+    def test_cycle(self):
+        replacements = {'A': '${B}', 'B': 'x${C}', 'C': {'item': '${B}'}, 'D': 'd'}
+        with self.assertRaises(ConfigError) as context:
+            VarResolver(replacements, []).resolve()
+        self.assertIn('B -> C -> B', str(context.exception))
+
+    def test_self_reference(self):
+        # A direct self reference is kept as it is, any other self reference is a cycle
+        resolver = VarResolver({'A': '${A}', 'B': 'b-${A}'}, [])
+        resolver.resolve()
+        self.assertEqual('${A}', resolver['A'])
+        self.assertEqual('b-${A}', resolver['B'])
+
+        with self.assertRaises(ConfigError):
+            VarResolver({'A': 'a-${A}'}, []).resolve()
+
+    def test_lazy(self):
+        loader = Mock()
+        loader.load.return_value = {'': '${NAME}-file', '_OTHER': 'other'}
+        load = LazyLoad(loader, {})
+        resolver = VarResolver({
+            'NAME': 'app',
+            'FILE': LazyValue(load, ''),
+            'FILE_OTHER': LazyValue(load, '_OTHER'),
+        }, [])
+        resolver.resolve()
+        loader.load.assert_not_called()
+
+        self.assertEqual('app-file', resolver.get('FILE'))
+        self.assertEqual('other', resolver.get('FILE_OTHER'))
+        loader.load.assert_called_once()
+
+    def test_lazy_missing(self):
+        # Missing variables of loader backed values are reported to every object using them
+        loader = Mock()
+        loader.load.return_value = {'': '${MISSING}-file'}
+        scope_missing = []
+        resolver = VarResolver({'FILE': LazyValue(LazyLoad(loader, {}), '')}, scope_missing)
+        resolver.resolve()
+
+        first = []
+        resolver.track_missing(first)
+        self.assertEqual('${MISSING}-file', resolver['FILE'])
+        second = []
+        resolver.track_missing(second)
+        self.assertEqual('${MISSING}-file', resolver['FILE'])
+
+        self.assertEqual(['MISSING'], first)
+        self.assertEqual(['MISSING'], second)
+        self.assertEqual([], scope_missing)
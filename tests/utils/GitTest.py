@@ -0,0 +1,46 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import TestCase
+
+from octoploy.utils.Git import Git
+
+
+class GitTest(TestCase):
+
+    def setUp(self) -> None:
+        self._tmp_dir = os.path.realpath(tempfile.mkdtemp())
+        self._git('init', '-q')
+        self._write('app/config.yml')
+        self._write('app/other.yml')
+        self._git('add', '-A')
+        self._git('-c', 'user.name=test', '-c', 'user.email=test@localhost', 'commit', '-q', '-m', 'init')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp_dir)
+
+    def _git(self, *args: str):
+        subprocess.run(['git'] + list(args), cwd=self._tmp_dir, check=True, capture_output=True)
+
+    def _write(self, name: str):
+        path = os.path.join(self._tmp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(name)
+
+    def test_changed_files(self):
+        os.makedirs(os.path.join(self._tmp_dir, 'moved'))
+        self._git('mv', 'app/config.yml', 'moved/config.yml')
+        self._write('app/other.ymlä')
+        self._write('new app/"quoted".yml')
+
+        files = Git(self._tmp_dir).get_changed_files('HEAD')
+        self.assertEqual({
+            # Both the old and the new path of a renamed file
+            os.path.join(self._tmp_dir, 'app', 'config.yml'),
+            os.path.join(self._tmp_dir, 'moved', 'config.yml'),
+            # Paths with special characters are not quoted
+            os.path.join(self._tmp_dir, 'app', 'other.ymlä'),
+            os.path.join(self._tmp_dir, 'new app', '"quoted".yml'),
+        }, files)
@@ -0,0 +1,73 @@
+import logging
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.utils.Log import Log
+
+
+class _Counter(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+class LogTest(TestCase):
+
+    def test_child_logger(self):
+        parent = Log('octoploy-log-test')
+        child = Log('octoploy-log-test.child')
+        # All messages are printed via the root logger of octoploy
+        self.assertEqual('octoploy.octoploy-log-test.child', child.log.name)
+        self.assertEqual(0, len(child.log.handlers))
+        self.assertEqual(0, len(parent.log.handlers))
+        self.assertLessEqual(len(logging.getLogger(Log.ROOT_NAME).handlers), 1)
+
+        counter = _Counter()
+        Log.add_handler(counter)
+        try:
+            child.log.info('hello')
+            late = Log('octoploy-log-test-late')
+            late.log.info('late')
+        finally:
+            Log.remove_handler(counter)
+        self.assertEqual(['hello', 'late'], [x.getMessage() for x in counter.records])
+
+        child.log.info('not captured')
+        self.assertEqual(2, len(counter.records))
+
+    def test_configured_logging(self):
+        # The capture works even if the root logger has its own handler
+        root_handler = _Counter()
+        logging.getLogger().addHandler(root_handler)
+        counter = _Counter()
+        try:
+            Log.add_handler(counter)
+            Log('octoploy-log-test-configured').log.info('hello')
+        finally:
+            Log.remove_handler(counter)
+            logging.getLogger().removeHandler(root_handler)
+        self.assertEqual(['hello'], [x.getMessage() for x in counter.records])
+
+    @patch('builtins.print')
+    def test_buffer(self, mock_print):
+        barrier = threading.Barrier(2)
+
+        def run(name: str):
+            with Log.buffer():
+                for i in range(3):
+                    Log.write(f'{name}{i}')
+                    barrier.wait()
+
+        threads = [threading.Thread(target=run, args=(x,)) for x in ('a', 'b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The output of every thread is printed at once
+        lines = ''.join(x.args[0][0] for x in mock_print.call_args_list)
+        self.assertIn(lines, ('aaabbb', 'bbbaaa'))
@@ -0,0 +1,44 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from octoploy.utils.ParseCache import ParseCache
+from octoploy.utils.Yml import Yml
+
+
+class ParseCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._file = os.path.join(self._dir.name, 'test.yml')
+        with open(self._file, 'w') as f:
+            f.write('kind: ConfigMap\n---\nkind: Secret\n')
+
+    def tearDown(self) -> None:
+        ParseCache.disable()
+        self._dir.cleanup()
+
+    def test_cached(self):
+        ParseCache.enable(self._dir.name)
+        expected = [{'kind': 'ConfigMap'}, {'kind': 'Secret'}]
+        self.assertEqual(expected, Yml.load_docs(self._file))
+
+        # Simulate a new run
+        ParseCache.enable(self._dir.name)
+        with patch.object(Yml, '_parse_docs') as parse:
+            docs = Yml.load_docs(self._file)
+            parse.assert_not_called()
+        self.assertEqual(expected, docs)
+
+        # Modified files must be parsed again
+        with open(self._file, 'w') as f:
+            f.write('kind: Other\n')
+        self.assertEqual([{'kind': 'Other'}], Yml.load_docs(self._file))
+
+    def test_eviction(self):
+        ParseCache.enable(self._dir.name, max_size=1)
+        Yml.load_docs(self._file)
+        cache_dir = os.path.join(self._dir.name, ParseCache.DIR_NAME)
+        entries = [x for x in os.listdir(cache_dir) if x.endswith(ParseCache.ENTRY_SUFFIX)]
+        self.assertEqual([], entries)